@@ -0,0 +1,73 @@
+from pathlib import Path
+from time import perf_counter
+import numpy as np
+from scipy.io import wavfile
+
+from lib.config.ConfigParser import ConfigParser
+from lib.processing.functions import construct_bandpass_filter
+from lib.processing.convolution import convolve, choose_convolution_method, CONVOLUTION_METHODS
+
+SAMPLES_PATH = Path("samples")
+REPEATS = 3
+
+def time_method(x: np.ndarray, g: np.ndarray, method: str, repeats: int = REPEATS) -> tuple[float, np.ndarray]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time the convolution of x and g with the given method.
+
+    Args:
+        x (np.ndarray): The signal.
+        g (np.ndarray): The filter.
+        method (str): The convolution method.
+        repeats (int, optional): How many times to repeat the measurement, the fastest time is returned. Defaults to REPEATS.
+
+    Returns:
+        tuple[float, np.ndarray]: The fastest time in seconds and the result of the convolution.
+    """
+    best = np.inf
+    for _ in range(repeats):
+        start = perf_counter()
+        y = convolve(x, g, method)
+        best = min(best, perf_counter() - start)
+    return best, y
+
+def benchmark_file(file: Path, config: ConfigParser):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Compare all convolution methods with the direct convolution on one recording, with the same bandpass filter as `Processor.preprocess`.
+
+    Args:
+        file (Path): The path to the wav file.
+        config (ConfigParser): The config object.
+    """
+    Fs, x = wavfile.read(file)
+    g = construct_bandpass_filter(config.LowpassFilter.LowFrequency, config.LowpassFilter.HighFrequency, Fs,
+                                  order=config.LowpassFilter.FilterOrder, size=config.LowpassFilter.Size)
+
+    t_direct, y_direct = time_method(x, g, "direct", repeats=1)
+    print(f"{file.name} ({len(x)} samples @ {Fs} Hz, {len(g)} taps, auto -> {choose_convolution_method(len(x), len(g))})")
+    print(f"  {'direct':14} {t_direct*1000:9.1f} ms")
+    for method in CONVOLUTION_METHODS:
+        if method == "direct":
+            continue
+        t, y = time_method(x, g, method)
+        error = np.max(np.abs(y - y_direct)) / np.max(np.abs(y_direct))
+        print(f"  {method:14} {t*1000:9.1f} ms  speedup: {t_direct/t:6.1f}x  max rel. error: {error:.1e}")
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Run the benchmark on all sample recordings.
+    """
+    config = ConfigParser()
+    for file in sorted(SAMPLES_PATH.glob("**/*.wav")):
+        benchmark_file(file, config)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from time import perf_counter
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+from lib.processing.functions import construct_lowpass_filter
+from lib.processing.convolution import convolve
+from lib.processing.dataprocessing import detect_peak_domains, get_peaks
+
+DURATIONS = [1, 5, 20, 60]
+# The original implementation is O(N·P), only run it on the short envelopes
+LOOP_MAX_DURATION = 5
+HEART_RATE = 75
+
+def detect_peak_domains_loop(peaks: np.ndarray, see: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The original sample by sample implementation of detect_peak_domains, as reference.
+    """
+    peak_start = None
+    peaks_ind = []
+    for i, s in enumerate(see):
+        if s >= threshold and peak_start is None:
+            peak_start = i
+        elif s <= threshold and peak_start is not None:
+            if np.any((peaks[:,0] >= peak_start) & (peaks[:,0] <= i)):
+                peaks_ind.append((peak_start, i))
+            peak_start = None
+    return np.array(peaks_ind).reshape(-1, 2)
+
+def synthetic_envelope(minutes: float, config: ConfigParser, rng: np.random.Generator) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Create a normalized envelope with an S1 and S2 like bump per heart beat and noise, at FsTarget.
+
+    Args:
+        minutes (float): The duration (min).
+        config (ConfigParser): The config object.
+        rng (np.random.Generator): The random generator.
+
+    Returns:
+        np.ndarray: The envelope.
+    """
+    Fs = config.Downsampling.FsTarget
+    beat = int(60 / HEART_RATE * Fs)
+    n_beats = int(minutes * HEART_RATE)
+    impulses = np.zeros(n_beats * beat)
+    jitter = rng.integers(-Fs // 100, Fs // 100, size=(n_beats, 2))
+    impulses[np.arange(n_beats) * beat + Fs // 10 + jitter[:,0]] = 1.0
+    impulses[np.arange(n_beats) * beat + Fs * 4 // 10 + jitter[:,1]] = 0.7
+    g = construct_lowpass_filter(config.Energy.CutoffFrequency, Fs, config.Energy.FilterOrder, config.Energy.Size)
+    see = convolve(impulses + 0.02 * rng.standard_normal(len(impulses)), g)
+    return see / np.std(see)
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time detect_peak_domains on envelopes of several minutes, with the peaks found like Processor.process.
+    """
+    config = ConfigParser()
+    rng = np.random.default_rng(0)
+    threshold = config.Segmentation.EnvelopeThreshold
+    for minutes in DURATIONS:
+        see = synthetic_envelope(minutes, config, rng)
+        x_peaks, properties = get_peaks(see, config.Segmentation.MinHeight, config.Segmentation.MinDist * config.Downsampling.FsTarget)
+        peaks = np.column_stack((x_peaks, properties["peak_heights"]))
+
+        start = perf_counter()
+        domains = detect_peak_domains(peaks, see, threshold)
+        t = perf_counter() - start
+        line = f"{minutes:3} min ({len(see)} samples, {len(peaks)} peaks): {t*1000:8.1f} ms"
+
+        if minutes <= LOOP_MAX_DURATION:
+            start = perf_counter()
+            expected = detect_peak_domains_loop(peaks, see, threshold)
+            t_loop = perf_counter() - start
+            line += f"  loop: {t_loop*1000:9.1f} ms  speedup: {t_loop/t:6.1f}x  equal: {np.array_equal(domains, expected)}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from lib.config.ConfigParser import ConfigParser
+from lib.processing.Executor import Executor
+
+SAMPLES_PATH = Path("samples/chapter_2")
+COPIES = 25
+
+def time_execute(folder: str, config: ConfigParser, parallel: bool, max_workers: int|None = None) -> float:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time the processing of all files in a folder, without writing the results.
+
+    Args:
+        folder (str): The folder with the wav files.
+        config (ConfigParser): The config object.
+        parallel (bool): Whether to use the process pool.
+        max_workers (int | None, optional): The amount of worker processes. Defaults to None.
+
+    Returns:
+        float: The time in seconds.
+    """
+    executor = Executor(folder, config)
+    start = perf_counter()
+    executor.execute(write_enabled=False, parallel=parallel, max_workers=max_workers)
+    return perf_counter() - start
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Compare the sequential and the parallel Executor on COPIES copies of the sample recordings, with a growing amount of workers.
+    """
+    config = ConfigParser()
+    with TemporaryDirectory() as folder:
+        files = sorted(SAMPLES_PATH.glob("*.wav"))
+        for i in range(COPIES):
+            for file in files:
+                shutil.copy(file, Path(folder) / f"{i}-{file.name}")
+        n_files = COPIES * len(files)
+
+        t_sequential = time_execute(folder, config, parallel=False)
+        print(f"{n_files} files, {os.cpu_count()} cores")
+        print(f"  {'sequential':12} {t_sequential:7.2f} s  {n_files/t_sequential:6.1f} files/s")
+        workers = 1
+        while workers <= os.cpu_count():
+            t = time_execute(folder, config, parallel=True, max_workers=workers)
+            print(f"  {f'{workers} workers':12} {t:7.2f} s  {n_files/t:6.1f} files/s  speedup: {t_sequential/t:4.1f}x")
+            workers *= 2
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from time import perf_counter
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model_3D import Model_3D, Point
+
+DURATIONS = [1, 10, 60]
+MIC_GRIDS = [(2, 3), (4, 4), (8, 8)]
+
+def generate_loop(model: Model_3D, signals: list[np.ndarray]) -> list[np.ndarray]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The original per microphone implementation of Model_3D.generate with whole sample delays, as reference.
+    """
+    modelled_signals = []
+    for mic_loc in model.microphone_locs:
+        new_mic_loc = np.tile(mic_loc,(len(model.source_locs),1))
+        dists_to_valves = np.linalg.norm((model.source_locs-new_mic_loc)/100, axis=1)
+        delays = dists_to_valves/model.V_Body
+        gains = 1/dists_to_valves
+        mic_signals = []
+        max_delay = max(delays)
+        for delay, gain, signal in zip(delays, gains, signals):
+            mic_signals.append(gain * np.pad(signal, [round(delay*model.Fs), round(max_delay*model.Fs)-round(delay*model.Fs)]))
+        modelled_signals.append(np.array(mic_signals).sum(axis=0))
+    return modelled_signals
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time Model_3D.generate for 4 sources on microphone grids of several sizes and signals of several durations.
+    """
+    config = ConfigParser()
+    Fs = config.HeartSoundModel.Fs
+    rng = np.random.default_rng(0)
+    source_locs = [Point(-1, 8, -15), Point(3, 12, -15), Point(6, 14, -15), Point(7, 9, -15)]
+    for rows, columns in MIC_GRIDS:
+        mic_locs = [Point(2.5 * i, 5 * j, 0) for i in range(rows) for j in range(columns)]
+        model = Model_3D(config, source_locs, mic_locs)
+        for seconds in DURATIONS:
+            signals = [rng.standard_normal(seconds * Fs) for _ in source_locs]
+
+            start = perf_counter()
+            model.generate(signals)
+            t = perf_counter() - start
+
+            start = perf_counter()
+            generate_loop(model, signals)
+            t_loop = perf_counter() - start
+            print(f"{len(mic_locs):2} mics, {seconds:2} s: {t*1000:8.1f} ms  loop (whole samples): {t_loop*1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
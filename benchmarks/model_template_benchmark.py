@@ -0,0 +1,53 @@
+from time import perf_counter
+import numpy as np
+from scipy.fft import fft, fftshift
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.model.generate import advanced_model
+
+REPEATS = 20
+
+def generate_model_and_freq_full(model: Model) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The original Model.generate_model_and_freq, which synthesizes, filters and transforms the whole model every call, as reference.
+    """
+    t_model, h_model = advanced_model(model.Fs, model.BPM, model.lf, model.hf, model.order, model.size, model.valves, model.n)
+    H = fftshift(fft(h_model))
+    H = H/np.max(np.abs(H))
+    freq = np.linspace(-model.Fs/2, model.Fs/2, len(H))
+    return t_model, h_model, freq, H
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time one update of the TUI plot after changing the frequency of one valve, like the command `M.freq <value>`.
+    """
+    model = Model(ConfigParser())
+    model.generate_model_and_freq()
+
+    t_full = t_template = 0.0
+    error = 0.0
+    for i in range(REPEATS):
+        model.valves[i % len(model.valves)].freq_main += 1
+
+        start = perf_counter()
+        _, h_ref, _, H_ref = generate_model_and_freq_full(model)
+        t_full += perf_counter() - start
+
+        start = perf_counter()
+        _, h, _, H = model.generate_model_and_freq()
+        t_template += perf_counter() - start
+        error = max(error, np.max(np.abs(h - h_ref)) / np.max(np.abs(h_ref)), np.max(np.abs(H - H_ref)))
+
+    print(f"{REPEATS} updates of one valve, {model.n} beats, {len(h)} samples:")
+    print(f"  full model: {t_full/REPEATS*1000:8.1f} ms per update")
+    print(f"  template:   {t_template/REPEATS*1000:8.1f} ms per update  speedup: {t_full/t_template:5.1f}x  max relative error: {error:.1e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from time import perf_counter
+import numpy as np
+
+from lib.localization.music import esprit, music_spectrum, root_music
+from lib.localization.steering import a_lin, far_field_steering, steering_cache, ula_positions
+
+M = 6
+D = 0.1
+V = 343
+F0 = 1687.5
+SOURCES = np.array([-20.0, 35.0])
+ANGLES = np.linspace(-90, 90, 3600)
+REPEATS = 10
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time the MUSIC angles of two sources, with the projector applied per angle, with one batched quadratic form
+    and with root-MUSIC and ESPRIT, which need no grid.
+    """
+    rng = np.random.default_rng(0)
+    S = rng.normal(size=(2, 200)) + 1j*rng.normal(size=(2, 200))
+    X = a_lin(SOURCES, M, D, V, F0) @ S + 0.1 * (rng.normal(size=(M, 200)) + 1j*rng.normal(size=(M, 200)))
+    Rx = X @ X.conj().T / 200
+
+    start = perf_counter()
+    _, eigenvectors = np.linalg.eigh(Rx)
+    Un = eigenvectors[:, :M - 2]
+    expected = np.array([1 / np.abs(a_lin(angle, M, D, V, F0).conj() @ Un @ Un.conj().T @ a_lin(angle, M, D, V, F0)) for angle in ANGLES])
+    t_loop = perf_counter() - start
+
+    steering_cache.clear()
+    start = perf_counter()
+    P = music_spectrum(Rx, far_field_steering(ula_positions(M, D), ANGLES, V, F0), 2)[:,0]
+    t_batched = perf_counter() - start
+
+    timings = {}
+    for estimator in (root_music, esprit):
+        start = perf_counter()
+        for _ in range(REPEATS):
+            angles = estimator(Rx, 2, D, V, F0)
+        timings[estimator.__name__] = ((perf_counter() - start) / REPEATS, angles)
+
+    print(f"MUSIC of {M} microphones, sources at {SOURCES} degrees:")
+    print(f"  per angle ({len(ANGLES)}):   {t_loop*1000:8.2f} ms")
+    print(f"  batched ({len(ANGLES)}):     {t_batched*1000:8.2f} ms  speedup: {t_loop/t_batched:6.1f}x  equal: {np.allclose(P, expected)}")
+    for name, (t, angles) in timings.items():
+        print(f"  {name + ':':19s}{t*1000:8.2f} ms  speedup: {t_loop/t:6.1f}x  angles: {np.round(angles, 2)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from time import perf_counter
+import numpy as np
+
+from lib.localization.mvdr import mvdr_grid
+from lib.localization.steering import a_z, ula_positions
+
+M = 6
+D = 0.1
+V = 343
+F0 = 1687.5
+LOOP_POINTS = 10**4
+GRID_POINTS = 10**6
+
+def grid(n: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Returns:
+        np.ndarray: About n points in a box in front of the array (m).
+    """
+    side = round(n ** (1/3))
+    x, y, z = np.meshgrid(np.linspace(-2, 2, side), np.linspace(0.5, 8, side), np.linspace(-1, 1, side), indexing="ij")
+    return np.stack([x.ravel(), y.ravel(), z.ravel()], axis=1)
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time the MVDR spectrum of a 3D grid, with an inverse and three products per point and with the factored engine.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(M, 200)) + 1j*rng.normal(size=(M, 200))
+    Rx = X @ X.conj().T / 200
+    mics = ula_positions(M, D)
+
+    points = grid(LOOP_POINTS)
+    start = perf_counter()
+    expected = np.array([1/np.matmul(np.matmul(a_z(p, mics, M, V, F0).conj().T, np.linalg.inv(Rx)), a_z(p, mics, M, V, F0)) for p in points])
+    t_loop = perf_counter() - start
+
+    start = perf_counter()
+    P = mvdr_grid(Rx, mics, points, V, F0)[:,0]
+    t_engine = perf_counter() - start
+
+    points = grid(GRID_POINTS)
+    start = perf_counter()
+    mvdr_grid(Rx, mics, points, V, F0)
+    t_large = perf_counter() - start
+
+    print(f"MVDR of {M} microphones:")
+    print(f"  {LOOP_POINTS} points: per point {t_loop*1000:8.1f} ms  engine {t_engine*1000:8.1f} ms  speedup: {t_loop/t_engine:6.1f}x"
+          f"  equal: {np.allclose(P, expected.real)}")
+    print(f"  {len(points)} points: engine {t_large*1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from time import perf_counter
+import numpy as np
+
+from lib.localization.beamformer import matched_spectrum
+from lib.localization.steering import far_field_steering, steering_cache, ula_positions
+
+M = 6
+D = 0.1
+V = 343
+ANGLES = np.linspace(-90, 90, 1000)
+FREQS = np.arange(1, 41) * 187.5
+
+def a_lin_loop(theta, M, d, v, f0):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The steering vector as it was built in the scripts, with a list comprehension over the microphones.
+    """
+    return np.array([np.exp(-1*mic*(d/v)*np.sin(theta*np.pi/180)*2*np.pi*f0*1j) for mic in range(M)])
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time the matched beamformer spectrum of many angles and bins, with a steering vector per angle and with the cached tensor.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(len(FREQS), M, 200)) + 1j*rng.normal(size=(len(FREQS), M, 200))
+    Rx = X @ X.conj().transpose(0, 2, 1) / 200
+
+    start = perf_counter()
+    expected = np.array([[np.real(a_lin_loop(theta, M, D, V, f0).conj() @ Rx[k] @ a_lin_loop(theta, M, D, V, f0))
+                          for k, f0 in enumerate(FREQS)] for theta in ANGLES])
+    t_loop = perf_counter() - start
+
+    steering_cache.clear()
+    start = perf_counter()
+    P = matched_spectrum(Rx, far_field_steering(ula_positions(M, D), ANGLES, V, FREQS))
+    t_first = perf_counter() - start
+
+    start = perf_counter()
+    P = matched_spectrum(Rx, far_field_steering(ula_positions(M, D), ANGLES, V, FREQS))
+    t_cached = perf_counter() - start
+
+    print(f"{len(ANGLES)} angles x {len(FREQS)} bins, {M} microphones:")
+    print(f"  per angle: {t_loop*1000:8.1f} ms")
+    print(f"  tensor:    {t_first*1000:8.1f} ms  speedup: {t_loop/t_first:6.1f}x")
+    print(f"  cached:    {t_cached*1000:8.1f} ms  speedup: {t_loop/t_cached:6.1f}x  equal: {np.allclose(P, expected)}")
+
+if __name__ == "__main__":
+    main()
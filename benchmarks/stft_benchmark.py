@@ -0,0 +1,47 @@
+from time import perf_counter
+import numpy as np
+from scipy.signal import ShortTimeFFT
+
+from lib.processing.stft import MultichannelSTFT
+
+FS = 48000
+CHANNELS = 6
+DURATION = 30
+BAND = (500, 4000)
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time the STFT of a 6 channel recording, per channel with ShortTimeFFT and np.stack as in the DoA scripts, and with MultichannelSTFT
+    into a preallocated buffer, for all bins and for a band.
+    """
+    x = np.random.default_rng(0).normal(size=(CHANNELS, FS * DURATION))
+    win = ("gaussian", 1e-2 * FS)
+    SFT = ShortTimeFFT.from_window(win, FS, nperseg=256, noverlap=0, scale_to="magnitude", phase_shift=None)
+
+    start = perf_counter()
+    expected = np.stack([SFT.stft(channel) for channel in x])
+    t_scipy = perf_counter() - start
+
+    stft = MultichannelSTFT(SFT)
+    out = stft.allocate(*x.shape)
+    start = perf_counter()
+    stft.stft(x, out=out)
+    t_all = perf_counter() - start
+    equal = np.allclose(out, expected, rtol=0, atol=1e-5 * np.max(np.abs(expected)))
+
+    stft_band = MultichannelSTFT(SFT, BAND)
+    out_band = stft_band.allocate(*x.shape)
+    start = perf_counter()
+    stft_band.stft(x, out=out_band)
+    t_band = perf_counter() - start
+
+    print(f"STFT of {CHANNELS} channels of {DURATION} s:")
+    print(f"  per channel:       {t_scipy*1000:8.1f} ms  {expected.nbytes/2**20:6.1f} MB")
+    print(f"  multichannel:      {t_all*1000:8.1f} ms  {out.nbytes/2**20:6.1f} MB  speedup: {t_scipy/t_all:6.1f}x  equal: {equal}")
+    print(f"  band of {len(stft_band.bins)} bins:   {t_band*1000:8.1f} ms  {out_band.nbytes/2**20:6.1f} MB  speedup: {t_scipy/t_band:6.1f}x")
+
+if __name__ == "__main__":
+    main()
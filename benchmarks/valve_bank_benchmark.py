@@ -0,0 +1,62 @@
+from copy import deepcopy
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from os.path import join
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.model.ValveBank import ValveBank
+from lib.model.generate import valve_responses
+
+VARIANTS = 2000
+R_RATIO = 0.05
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time randomizing, synthesizing and storing one beat of many randomized variants of the valves of Model,
+    as lists of ValveParams objects and as one ValveBank.
+    """
+    config = ConfigParser()
+    Fs = config.HeartSoundModel.Fs
+    initial = Model(config).valves
+
+    start = perf_counter()
+    variants_objects = []
+    valves = initial
+    for _ in range(VARIANTS):
+        valves = deepcopy(valves)
+        [valve.randomize(R_RATIO) for valve in valves]
+        variants_objects.append(valves)
+    t_randomize_objects = perf_counter() - start
+
+    start = perf_counter()
+    variants = ValveBank.from_valves(initial).random_walk(VARIANTS, R_RATIO, 0)
+    t_randomize_bank = perf_counter() - start
+
+    start = perf_counter()
+    expected = [valve_responses(row, Fs) for row in [ValveBank(row).to_valves() for row in variants.data]]
+    t_synthesize_objects = perf_counter() - start
+
+    start = perf_counter()
+    h = variants.synthesize_variants(Fs)
+    t_synthesize_bank = perf_counter() - start
+    equal = all(np.array_equal(h[i,:len(x)], x) for i, x in enumerate(expected))
+
+    with TemporaryDirectory() as folder:
+        start = perf_counter()
+        variants.save(join(folder, "variants.npy"))
+        loaded = ValveBank.load(join(folder, "variants.npy"))
+        t_store = perf_counter() - start
+        del loaded
+
+    print(f"{VARIANTS} variants of {variants.shape[1]} valves:")
+    print(f"  randomize:  objects {t_randomize_objects*1000:8.1f} ms  bank {t_randomize_bank*1000:8.1f} ms  speedup: {t_randomize_objects/t_randomize_bank:6.1f}x")
+    print(f"  synthesize: objects {t_synthesize_objects*1000:8.1f} ms  bank {t_synthesize_bank*1000:8.1f} ms  speedup: {t_synthesize_objects/t_synthesize_bank:6.1f}x  equal: {equal}")
+    print(f"  save and load the bank: {t_store*1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from copy import deepcopy
+from time import perf_counter
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.model.generate import advanced_model_valve_params, valve_responses
+
+R_RATIO = 0.05
+
+def valve_responses_impulse(valves: list, Fs: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The original per valve synthesis with scipy.signal.impulse, as reference.
+    """
+    h_out = [advanced_model_valve_params(valve, Fs, use_transfer=True)[1] for valve in valves]
+    h_len = max(len(h) for h in h_out)
+    return np.sum([np.pad(h, (0, h_len - len(h))) for h in h_out], axis=0)
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time the valve synthesis of every beat of a randomized model with NBeats beats.
+    """
+    config = ConfigParser()
+    model = Model(config)
+    Fs, n = config.HeartSoundModel.Fs, config.HeartSoundModel.NBeats
+    np.random.seed(0)
+    beats = []
+    valves = deepcopy(model.valves)
+    for _ in range(n):
+        [valve.randomize(R_RATIO) for valve in valves]
+        beats.append(deepcopy(valves))
+
+    start = perf_counter()
+    expected = [valve_responses_impulse(valves, Fs) for valves in beats]
+    t_impulse = perf_counter() - start
+
+    start = perf_counter()
+    result = [valve_responses(valves, Fs) for valves in beats]
+    t_closed = perf_counter() - start
+
+    error = max(np.max(np.abs(h - h_ref)) / np.max(np.abs(h_ref)) for h, h_ref in zip(result, expected))
+    print(f"{n} beats, {len(model.valves)} valves:")
+    print(f"  impulse:     {t_impulse*1000:9.1f} ms")
+    print(f"  closed form: {t_closed*1000:9.1f} ms  speedup: {t_impulse/t_closed:6.1f}x  max relative error: {error:.1e}")
+
+if __name__ == "__main__":
+    main()
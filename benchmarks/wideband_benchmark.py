@@ -0,0 +1,60 @@
+from time import perf_counter
+import numpy as np
+
+from lib.localization.steering import far_field_steering, steering_cache, ula_positions
+from lib.localization.wideband import band_bins, wideband_spectrum
+
+M = 6
+D = 0.1
+V = 343
+FRAMES = 1000
+BAND = (500, 4000)
+ANGLES = np.linspace(-90, 90, 1000)
+
+def a_lin_loop(theta, M, d, v, f0):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The steering vector as it was built in the scripts, with a list comprehension over the microphones.
+    """
+    return np.array([np.exp(-1*mic*(d/v)*np.sin(theta*np.pi/180)*2*np.pi*f0*1j) for mic in range(M)])
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Time the MVDR spectrum of every bin of a band of a 6 channel STFT, one bin at a time as in DoA_find and with the wideband stage.
+    """
+    rng = np.random.default_rng(0)
+    freqs = np.arange(129) * 187.5
+    bins = band_bins(freqs, BAND)
+    S = rng.normal(size=(M, len(freqs), FRAMES)) + 1j*rng.normal(size=(M, len(freqs), FRAMES))
+
+    start = perf_counter()
+    P_loop = []
+    for k in bins:
+        Rx = np.cov(S[:,k,:])
+        P_loop.append([1/np.real(a_lin_loop(theta, M, D, V, freqs[k]).conj().T @ np.linalg.inv(Rx) @ a_lin_loop(theta, M, D, V, freqs[k]))
+                       for theta in ANGLES])
+    t_loop = perf_counter() - start
+
+    steering_cache.clear()
+    start = perf_counter()
+    A = far_field_steering(ula_positions(M, D), ANGLES, V, freqs[bins])
+    P = wideband_spectrum(S[:,bins,:], A, method="mvdr")
+    t_first = perf_counter() - start
+
+    start = perf_counter()
+    A = far_field_steering(ula_positions(M, D), ANGLES, V, freqs[bins])
+    P = wideband_spectrum(S[:,bins,:], A, method="mvdr")
+    t_cached = perf_counter() - start
+
+    print(f"MVDR of {len(bins)} bins, {len(ANGLES)} angles, {FRAMES} frames:")
+    print(f"  per bin and angle: {t_loop*1000:8.1f} ms")
+    print(f"  wideband:          {t_first*1000:8.1f} ms  speedup: {t_loop/t_first:6.1f}x")
+    print(f"  cached steering:   {t_cached*1000:8.1f} ms  speedup: {t_loop/t_cached:6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,10 @@ class AttrSection:
         Raises:
             AttributeError: If the key does not exist in this section.
         """
+        # Internal attributes are never config keys. This also keeps pickle from recursing while
+        # _config does not exist yet, so the config can be sent to worker processes.
+        if name.startswith("_"):
+            raise AttributeError(name)
         if name in self._config[self._section]:
             return self._config[self._section][name]
         raise AttributeError(f"No such field '{name}' in section '{self._section}'")
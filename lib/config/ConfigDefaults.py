@@ -28,6 +28,7 @@ DEFAULT_CONFIG = {
         "MaxUncertainCountPerMin": 20,
         "MaxCompHeight": 1,
         "MaxCompIter": 100,
+        "DiagnosticsPath": "diagnostics",
     },
     "HeartSoundModel": {
         "Fs": 48000,
@@ -35,10 +36,22 @@ DEFAULT_CONFIG = {
         "NBeats": 200,
     },
     "Generation": {
-        "SoundsPath": "generated/hearbeat model"
+        "SoundsPath": "generated/hearbeat model",
+        "DatasetPath": "generated/dataset"
     },
     "Multichannel": {
         "V_body": 60
+    },
+    "Realtime": {
+        "BlockDuration": 0.01,
+        "LatencyBudget": 0.005,
+        "BufferDuration": 2
+    },
+    "Cache": {
+        "KernelCacheSize": 32,
+        "KernelCachePath": "none",
+        "SignalCachePath": "none",
+        "SignalCacheSize": 2048
     }
 }
 
@@ -46,5 +59,8 @@ DEFAULT_COMMENTS = {
     "LowpassFilter": ["# Properties of the lowpass filter"],
     "Downsampling": ["# Parameters for downsampling"],
     "Energy": ["# Properties of the lowpass filter for building the Shannon energy envelope"],
-    "Multichannel": ["# m/s, speed of sound through body"]
+    "Multichannel": ["# m/s, speed of sound through body"],
+    "Realtime": ["# Seconds, duration of a block, the maximum processing time per block and the audio kept in the ring buffer"],
+    "Cache": ["# Filter kernels kept in memory, and the folder to also save them in (none to only keep them in memory)",
+              "# Folder and size cap (MB) of the cached intermediate signals (none to disable)"]
 }
\ No newline at end of file
@@ -51,6 +51,24 @@ def randomize(val: float, ratio: float) -> float:
     """
     return val * (1 + ratio * random() * np.sign(random() - 0.5))
 
+def make_rng(rng: np.random.Generator|int|None = None) -> np.random.Generator:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Make a random generator.
+
+    Args:
+        rng (np.random.Generator | int | None, optional): A generator, which is returned as is, or a seed. If None, the seed is
+            drawn from the global numpy generator, so np.random.seed still makes the results reproducible. Defaults to None.
+
+    Returns:
+        np.random.Generator: The random generator.
+    """
+    if rng is None:
+        rng = np.random.randint(2**32, dtype=np.uint64)
+    return np.random.default_rng(rng)
+
 def white_noise(duration: float, Fs: int):
     """
     @author: Gerrald
@@ -0,0 +1,21 @@
+import numpy as np
+
+def matched_spectrum(Rx: np.ndarray, A: np.ndarray) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The output power of the matched (delay and sum) beamformer, a^H Rx a, for every candidate and frequency in one einsum.
+
+    Args:
+        Rx (np.ndarray): The covariance matrix with shape (M, M), or one per frequency with shape (frequencies, M, M).
+        A (np.ndarray): The steering tensor with shape (M, candidates, frequencies), see lib.localization.steering.
+
+    Returns:
+        np.ndarray: The real output power, with shape (candidates, frequencies).
+    """
+    Rx = np.asarray(Rx)
+    if Rx.ndim == 2:
+        Rx = Rx[None,:,:]
+    RA = np.einsum("fmn,naf->maf", Rx, A, optimize=True)
+    return np.real(np.einsum("maf,maf->af", A.conj(), RA, optimize=True))
@@ -0,0 +1,142 @@
+import numpy as np
+
+def noise_subspace(Rx: np.ndarray, n_sources: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        Rx (np.ndarray): The covariance matrix with shape (M, M), or one per frequency with shape (frequencies, M, M).
+        n_sources (int): The amount of sources Q.
+
+    Raises:
+        ValueError: If there are not more microphones than sources.
+
+    Returns:
+        np.ndarray: The eigenvectors of the M - Q smallest eigenvalues of every matrix, with shape (frequencies, M, M - Q).
+    """
+    Rx = np.asarray(Rx)
+    if Rx.ndim == 2:
+        Rx = Rx[None,:,:]
+    M = Rx.shape[-1]
+    if not 0 <= n_sources < M:
+        raise ValueError(f"MUSIC needs fewer sources than microphones, got {n_sources} sources for {M} microphones")
+    # eigh sorts the eigenvalues in ascending order
+    _, eigenvectors = np.linalg.eigh(Rx)
+    return eigenvectors[:,:,:M - n_sources]
+
+def subspace_spectrum(Un: np.ndarray, A: np.ndarray) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The MUSIC pseudo-spectrum 1/(a^H Un Un^H a) of a given noise subspace. a^H Un Un^H a is ||Un^H a||^2, so it is one batched
+    product for all candidates, and the projector Un Un^H is never applied per candidate.
+
+    Args:
+        Un (np.ndarray): The noise subspace with shape (M, M - Q), or one per frequency with shape (frequencies, M, M - Q).
+        A (np.ndarray): The steering tensor with shape (M, candidates, frequencies), see lib.localization.steering.
+
+    Returns:
+        np.ndarray: The real pseudo-spectrum, with shape (candidates, frequencies).
+    """
+    Un = np.asarray(Un)
+    if Un.ndim == 2:
+        Un = Un[None,:,:]
+    Y = np.einsum("fmq,maf->qaf", Un.conj(), A, optimize=True)
+    return 1 / np.maximum(np.sum(Y.real**2 + Y.imag**2, axis=0), np.finfo(np.float64).tiny)
+
+def music_spectrum(Rx: np.ndarray, A: np.ndarray, n_sources: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The MUSIC pseudo-spectrum of all candidates and frequencies, with the noise subspace computed once per frequency.
+
+    Args:
+        Rx (np.ndarray): The covariance matrix with shape (M, M), or one per frequency with shape (frequencies, M, M).
+        A (np.ndarray): The steering tensor with shape (M, candidates, frequencies), see lib.localization.steering.
+        n_sources (int): The amount of sources Q.
+
+    Returns:
+        np.ndarray: The real pseudo-spectrum, with shape (candidates, frequencies).
+    """
+    return subspace_spectrum(noise_subspace(Rx, n_sources), A)
+
+def root_music(Rx: np.ndarray, n_sources: int, d: float, v: float, f0: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The angles of arrival of a uniform linear array without a grid. On the array response a(z) = [1, z, ..., z^(M-1)] with
+    |z| = 1, a^H Un Un^H a is a polynomial in z whose coefficients are the sums of the diagonals of Un Un^H. The sources are
+    the Q roots inside the unit circle that are closest to it.
+
+    Args:
+        Rx (np.ndarray): The covariance matrix, with shape (M, M).
+        n_sources (int): The amount of sources Q.
+        d (float): distance between microphones (m)
+        v (float): speed of sound (m/s)
+        f0 (float): frequency of wave (Hz)
+
+    Returns:
+        np.ndarray: The Q angles of arrival (degrees), sorted, see lib.localization.steering.a_lin.
+    """
+    Un = noise_subspace(Rx, n_sources)[0]
+    C = Un @ Un.conj().T
+    M = len(C)
+    # The coefficient of z^k is the sum of the k-th diagonal, from z^(M-1) down to z^-(M-1)
+    coefficients = np.array([np.trace(C, offset=k) for k in range(M - 1, -M, -1)])
+    roots = np.roots(coefficients)
+    # The roots come in pairs z and 1/conj(z), keep the ones inside the unit circle
+    roots = roots[np.abs(roots) < 1]
+    roots = roots[np.argsort(1 - np.abs(roots))[:n_sources]]
+    return ula_angles(roots, d, v, f0)
+
+def esprit(Rx: np.ndarray, n_sources: int, d: float, v: float, f0: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The angles of arrival of a uniform linear array without a grid. The signal subspace of the first M - 1 microphones
+    and the one of the last M - 1 microphones differ by a rotation, whose eigenvalues are the phase steps z of the sources.
+
+    Args:
+        Rx (np.ndarray): The covariance matrix, with shape (M, M).
+        n_sources (int): The amount of sources Q.
+        d (float): distance between microphones (m)
+        v (float): speed of sound (m/s)
+        f0 (float): frequency of wave (Hz)
+
+    Raises:
+        ValueError: If there are not more microphones than sources.
+
+    Returns:
+        np.ndarray: The Q angles of arrival (degrees), sorted, see lib.localization.steering.a_lin.
+    """
+    Rx = np.asarray(Rx)
+    M = len(Rx)
+    if not 0 < n_sources < M:
+        raise ValueError(f"ESPRIT needs fewer sources than microphones, got {n_sources} sources for {M} microphones")
+    _, eigenvectors = np.linalg.eigh(Rx)
+    Us = eigenvectors[:,M - n_sources:]
+    # Us[1:] = Us[:-1] Phi in the least squares sense
+    Phi = np.linalg.lstsq(Us[:-1], Us[1:], rcond=None)[0]
+    return ula_angles(np.linalg.eigvals(Phi), d, v, f0)
+
+def ula_angles(z: np.ndarray, d: float, v: float, f0: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        z (np.ndarray): The phase steps between neighbouring microphones, exp(-2j*pi*f0*d*sin(theta)/v).
+        d (float): distance between microphones (m)
+        v (float): speed of sound (m/s)
+        f0 (float): frequency of wave (Hz)
+
+    Returns:
+        np.ndarray: The angles of arrival (degrees), sorted.
+    """
+    sin_theta = -np.angle(z) * v / (2*np.pi * f0 * d)
+    return np.sort(np.rad2deg(np.arcsin(np.clip(sin_theta, -1, 1))))
@@ -0,0 +1,164 @@
+import numpy as np
+
+from lib.localization.steering import near_field_steering
+
+# Diagonal loading of covariance matrices that are not positive definite, relative to their mean eigenvalue
+MIN_LOADING = 1e-9
+MAX_LOADING = 1.0
+
+def load_diagonal(Rx: np.ndarray, loading: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        Rx (np.ndarray): The covariance matrices, with shape (..., M, M).
+        loading (float): The loading relative to the mean eigenvalue, trace(Rx)/M.
+
+    Returns:
+        np.ndarray: Rx + loading * trace(Rx)/M * I.
+    """
+    M = Rx.shape[-1]
+    scale = np.maximum(np.real(np.trace(Rx, axis1=-2, axis2=-1)) / M, np.finfo(np.float64).tiny)
+    return Rx + (loading * scale)[...,None,None] * np.eye(M)
+
+def whitening(Rx: np.ndarray, loading: float = 0.0) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Factor the covariance matrices once: with the Cholesky factor Rx = L L^H, the quadratic form a^H Rx^-1 a is ||L^-1 a||^2,
+    so no candidate needs a solve or an inverse of Rx. A matrix that is not positive definite (e.g. fewer frames than microphones)
+    is loaded with MIN_LOADING, ten times more until it can be factored.
+
+    Args:
+        Rx (np.ndarray): The covariance matrix with shape (M, M), or one per frequency with shape (frequencies, M, M).
+        loading (float, optional): The diagonal loading of every matrix, see load_diagonal. Defaults to 0.0.
+
+    Raises:
+        ValueError: If a matrix can not be factored with MAX_LOADING.
+
+    Returns:
+        np.ndarray: L^-1 of every matrix, with shape (frequencies, M, M).
+    """
+    Rx = np.asarray(Rx, dtype=np.complex128)
+    if Rx.ndim == 2:
+        Rx = Rx[None,:,:]
+    try:
+        L = np.linalg.cholesky(load_diagonal(Rx, loading) if loading > 0 else Rx)
+    except np.linalg.LinAlgError:
+        L = np.empty_like(Rx)
+        for f in range(len(Rx)):
+            L[f] = _loaded_cholesky(Rx[f], loading)
+    return np.linalg.inv(L)
+
+def _loaded_cholesky(Rx: np.ndarray, loading: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        Rx (np.ndarray): One covariance matrix.
+        loading (float): The requested diagonal loading.
+
+    Raises:
+        ValueError: If the matrix can not be factored with MAX_LOADING.
+
+    Returns:
+        np.ndarray: The Cholesky factor of the matrix with the least loading that works.
+    """
+    if loading > 0:
+        try:
+            return np.linalg.cholesky(load_diagonal(Rx, loading))
+        except np.linalg.LinAlgError:
+            pass
+    loading = max(loading * 10, MIN_LOADING)
+    while loading <= MAX_LOADING:
+        try:
+            return np.linalg.cholesky(load_diagonal(Rx, loading))
+        except np.linalg.LinAlgError:
+            loading *= 10
+    raise ValueError("The covariance matrix can not be factored, it is not Hermitian or contains NaN")
+
+def mvdr_spectrum(Rx: np.ndarray, A: np.ndarray, loading: float = 0.0, chunk_size: int = 2**16) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The MVDR (Capon) spectrum 1/(a^H Rx^-1 a) of all candidates and frequencies, with one factorization per frequency
+    and one batched einsum per chunk of candidates.
+
+    Args:
+        Rx (np.ndarray): The covariance matrix with shape (M, M), or one per frequency with shape (frequencies, M, M).
+        A (np.ndarray): The steering tensor with shape (M, candidates, frequencies), see lib.localization.steering.
+        loading (float, optional): The diagonal loading, see whitening. Defaults to 0.0.
+        chunk_size (int, optional): The amount of candidates per einsum, to bound the temporary arrays. Defaults to 2**16.
+
+    Returns:
+        np.ndarray: The real spectrum, with shape (candidates, frequencies).
+    """
+    W = whitening(Rx, loading)
+    P = np.empty(A.shape[1:])
+    for start in range(0, A.shape[1], chunk_size):
+        P[start:start + chunk_size] = _capon(W, A[:,start:start + chunk_size])
+    return P
+
+def mvdr_grid(Rx: np.ndarray, mic_positions: np.ndarray, points: np.ndarray, v: float, freqs: np.ndarray,
+              loading: float = 0.0, chunk_size: int = 2**16) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The MVDR spectrum of a 3D grid of candidate source points. The steering vectors are built per chunk and not cached,
+    so grids of millions of points only need the memory of one chunk.
+
+    Args:
+        Rx (np.ndarray): The covariance matrix with shape (M, M), or one per frequency with shape (frequencies, M, M).
+        mic_positions (np.ndarray): The positions of the microphones (m), with shape (M, 3).
+        points (np.ndarray): The candidate source positions (m), with shape (points, 3).
+        v (float): speed of sound (m/s)
+        freqs (np.ndarray): The frequency of every covariance matrix (Hz).
+        loading (float, optional): The diagonal loading, see whitening. Defaults to 0.0.
+        chunk_size (int, optional): The amount of points per chunk. Defaults to 2**16.
+
+    Returns:
+        np.ndarray: The real spectrum, with shape (points, frequencies).
+    """
+    W = whitening(Rx, loading)
+    points = np.asarray(points, dtype=np.float64)
+    P = np.empty((len(points), len(np.atleast_1d(freqs))))
+    for start in range(0, len(points), chunk_size):
+        P[start:start + chunk_size] = _capon(W, near_field_steering(mic_positions, points[start:start + chunk_size], v, freqs, cache=False))
+    return P
+
+def _capon(W: np.ndarray, A: np.ndarray) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        W (np.ndarray): The whitening matrices, see whitening.
+        A (np.ndarray): The steering tensor with shape (M, candidates, frequencies).
+
+    Returns:
+        np.ndarray: 1/||W a||^2 of every candidate and frequency.
+    """
+    Y = np.einsum("fmn,naf->maf", W, A, optimize=True)
+    return 1 / np.sum(Y.real**2 + Y.imag**2, axis=0)
+
+def mvdr_weights(Rx: np.ndarray, a: np.ndarray, loading: float = 0.0) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        Rx (np.ndarray): The covariance matrix, with shape (M, M).
+        a (np.ndarray): The steering vector of the look direction, with shape (M,).
+        loading (float, optional): The diagonal loading, see whitening. Defaults to 0.0.
+
+    Returns:
+        np.ndarray: The MVDR beamformer Rx^-1 a / (a^H Rx^-1 a), with shape (M,).
+    """
+    W = whitening(Rx, loading)[0]
+    y = W @ a
+    return (W.conj().T @ y) / np.vdot(y, y).real
@@ -0,0 +1,244 @@
+from collections import OrderedDict
+from hashlib import sha1
+import numpy as np
+
+class SteeringCache:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Least recently used cache for steering tensors, keyed on the geometry, the speed of sound, the frequency grid and the
+    scan grid (angles or points).
+
+    A spectrum scans the same grid for every recording, every frame and every bin, so the tensor is built once with one
+    broadcast expression instead of one small array per microphone and candidate. The tensors are returned read-only,
+    because every beamformer, MVDR and MUSIC scan shares them. The size is capped in bytes, since a 3D grid can be large.
+    """
+    def __init__(self, max_size: int = 64, max_bytes: int = 2**28):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            max_size (int, optional): The maximum amount of tensors. Defaults to 64.
+            max_bytes (int, optional): The maximum total size of the tensors (bytes). Defaults to 2**28.
+        """
+        self.tensors = OrderedDict()
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        return len(self.tensors)
+
+    @property
+    def size(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            int: The total size of the cached tensors (bytes).
+        """
+        return sum(tensor.nbytes for tensor in self.tensors.values())
+
+    def key(self, kind: str, *arrays) -> tuple:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            kind (str): The model of the tensor, e.g. "far" or "near".
+            arrays: The parameters, arrays are hashed with their shape.
+
+        Returns:
+            tuple: The key of the tensor.
+        """
+        parts = [kind]
+        for array in arrays:
+            array = np.ascontiguousarray(array, dtype=np.float64)
+            parts.append((array.shape, sha1(array.tobytes()).hexdigest()))
+        return tuple(parts)
+
+    def get(self, key: tuple, build) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            key (tuple): The key, see `key`.
+            build (Callable[[], np.ndarray]): Builds the tensor.
+
+        Returns:
+            np.ndarray: The read-only tensor.
+        """
+        tensor = self.tensors.get(key)
+        if tensor is not None:
+            self.tensors.move_to_end(key)
+            self.hits += 1
+            return tensor
+
+        self.misses += 1
+        tensor = build()
+        tensor.flags.writeable = False
+        if tensor.nbytes <= self.max_bytes:
+            self.tensors[key] = tensor
+            self._evict()
+        return tensor
+
+    def clear(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Drop all tensors and reset the counters.
+        """
+        self.tensors.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            dict[str, int]: The amount of hits, misses and tensors, and the size of the cache (bytes).
+        """
+        return {"hits": self.hits, "misses": self.misses, "tensors": len(self.tensors), "size": self.size}
+
+    def _evict(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        total = self.size
+        while total > self.max_bytes or len(self.tensors) > max(self.max_size, 0):
+            _, tensor = self.tensors.popitem(last=False)
+            total -= tensor.nbytes
+
+steering_cache = SteeringCache()
+
+def ula_positions(M: int, d: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        M (int): number of microphones
+        d (float): distance between microphones (m)
+
+    Returns:
+        np.ndarray: The positions of a uniform linear array along the x axis, starting at the origin, with shape (M, 3).
+    """
+    positions = np.zeros((M, 3))
+    positions[:,0] = np.arange(M) * d
+    return positions
+
+def far_field_delays(mic_positions: np.ndarray, angles: np.ndarray, v: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The delays of a plane wave from the angles in the xy plane, with 0 degrees along the y axis and 90 degrees along the x axis.
+
+    Args:
+        mic_positions (np.ndarray): The positions of the microphones (m), with shape (M, 3).
+        angles (np.ndarray): The angles of arrival (degrees).
+        v (float): speed of sound (m/s)
+
+    Returns:
+        np.ndarray: The delay of every microphone relative to the origin (s), with shape (M, angles).
+    """
+    theta = np.deg2rad(np.atleast_1d(np.asarray(angles, dtype=np.float64)))
+    mic_positions = np.asarray(mic_positions, dtype=np.float64)
+    return (np.outer(mic_positions[:,0], np.sin(theta)) + np.outer(mic_positions[:,1], np.cos(theta))) / v
+
+def far_field_steering(mic_positions: np.ndarray, angles: np.ndarray, v: float, freqs: np.ndarray) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        mic_positions (np.ndarray): The positions of the microphones (m), with shape (M, 3).
+        angles (np.ndarray): The angles of arrival (degrees), see far_field_delays.
+        v (float): speed of sound (m/s)
+        freqs (np.ndarray): The frequencies (Hz).
+
+    Returns:
+        np.ndarray: The read-only steering tensor exp(-2j*pi*f*tau), with shape (M, angles, frequencies).
+    """
+    freqs = np.atleast_1d(np.asarray(freqs, dtype=np.float64))
+    key = steering_cache.key("far", mic_positions, angles, [v], freqs)
+    return steering_cache.get(key, lambda: np.exp(-2j*np.pi * far_field_delays(mic_positions, angles, v)[:,:,None] * freqs))
+
+def near_field_steering(mic_positions: np.ndarray, points: np.ndarray, v: float, freqs: np.ndarray, cache: bool = True) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The response of a spherical wave from candidate source points, with the 1/r attenuation.
+
+    Args:
+        mic_positions (np.ndarray): The positions of the microphones (m), with shape (M, 3).
+        points (np.ndarray): The candidate source positions (m), with shape (points, 3).
+        v (float): speed of sound (m/s)
+        freqs (np.ndarray): The frequencies (Hz).
+        cache (bool, optional): Whether to use the cache, e.g. not for the chunks of a large grid that is scanned once. Defaults to True.
+
+    Returns:
+        np.ndarray: The steering tensor exp(-2j*pi*f*r/v)/r, with shape (M, points, frequencies). Read-only when it is cached.
+    """
+    freqs = np.atleast_1d(np.asarray(freqs, dtype=np.float64))
+
+    def build() -> np.ndarray:
+        r = np.linalg.norm(np.asarray(points, dtype=np.float64)[None,:,:] - np.asarray(mic_positions, dtype=np.float64)[:,None,:], axis=2)
+        return np.exp(-2j*np.pi * (r / v)[:,:,None] * freqs) / r[:,:,None]
+
+    if not cache:
+        return build()
+    return steering_cache.get(steering_cache.key("near", mic_positions, points, [v], freqs), build)
+
+def a_lin(theta, M, d, v, f0):
+    """
+    @author: Gerrald
+    @date: 10-12-2025
+
+    Returns the *array response* or *steering vector* for a Uniform Linear Microphone Array
+
+    Args:
+        theta (float): angle of arrival, or an array of angles
+        M (int): number of microphones
+        d (float): distance between microphones (m)
+        v (float): speed of sound (m/s)
+        f0 (float): frequency of wave (Hz)
+
+    Returns:
+        np.ndarray: The array response, with shape (M,) for one angle or (M, angles) for an array of angles
+    """
+    A = far_field_steering(ula_positions(M, d), theta, v, f0)[:,:,0]
+    return A[:,0] if np.ndim(theta) == 0 else A
+
+def a_z(s_position, mic_positions, M, v, f0):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Returns the steering vector of a source at s_position, see near_field_steering
+
+    Args:
+        s_position (np.ndarray): The position of the source (m).
+        mic_positions (np.ndarray): The positions of the M microphones (m).
+        M (int): number of microphones
+        v (float): speed of sound (m/s)
+        f0 (float): frequency of wave (Hz)
+
+    Returns:
+        np.ndarray: The array response, with shape (M,)
+    """
+    # One point per call, caching it would only evict the tensors of the scans
+    return near_field_steering(mic_positions, np.reshape(s_position, (1, 3)), v, f0, cache=False)[:,0,0]
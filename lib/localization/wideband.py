@@ -0,0 +1,149 @@
+import numpy as np
+from scipy.signal import find_peaks
+
+from lib.localization.beamformer import matched_spectrum
+from lib.localization.music import music_spectrum
+from lib.localization.mvdr import mvdr_spectrum
+
+METHODS = ("matched", "mvdr", "music")
+COMBINATIONS = ("incoherent", "coherent")
+
+def band_bins(freqs: np.ndarray, band: tuple[float, float]) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        freqs (np.ndarray): The frequency of every bin (Hz).
+        band (tuple[float, float]): The lowest and highest frequency (Hz).
+
+    Raises:
+        ValueError: If no bin is in the band.
+
+    Returns:
+        np.ndarray: The indices of the bins in the band, without the DC bin.
+    """
+    freqs = np.asarray(freqs)
+    bins = np.flatnonzero((freqs >= band[0]) & (freqs <= band[1]) & (freqs > 0))
+    if len(bins) == 0:
+        raise ValueError(f"No bins between {band[0]} and {band[1]} Hz")
+    return bins
+
+def covariances(S: np.ndarray) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The sample covariance of every bin in one einsum over the stacked STFT.
+
+    Args:
+        S (np.ndarray): The STFT of every channel, with shape (M, bins, frames).
+
+    Returns:
+        np.ndarray: X X^H / frames of every bin, with shape (bins, M, M).
+    """
+    return np.einsum("mft,nft->fmn", S, S.conj(), optimize=True) / S.shape[-1]
+
+def spectra(Rx: np.ndarray, A: np.ndarray, method: str = "mvdr", n_sources: int|None = None, loading: float = 0.0) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        Rx (np.ndarray): The covariance of every bin, with shape (bins, M, M).
+        A (np.ndarray): The steering tensor at the frequencies of the bins, with shape (M, candidates, bins).
+        method (str, optional): "matched", "mvdr" or "music". Defaults to "mvdr".
+        n_sources (int | None, optional): The amount of sources, needed for "music". Defaults to None.
+        loading (float, optional): The diagonal loading of "mvdr", see lib.localization.mvdr.whitening. Defaults to 0.0.
+
+    Raises:
+        ValueError: If the method is unknown, or "music" has no amount of sources.
+
+    Returns:
+        np.ndarray: The spectrum of every candidate and bin, with shape (candidates, bins).
+    """
+    if method == "matched":
+        return matched_spectrum(Rx, A)
+    if method == "mvdr":
+        return mvdr_spectrum(Rx, A, loading)
+    if method == "music":
+        if n_sources is None:
+            raise ValueError("MUSIC needs the amount of sources")
+        return music_spectrum(Rx, A, n_sources)
+    raise ValueError(f"Unknown method {method}, expected one of {METHODS}")
+
+def focusing_matrices(A: np.ndarray, focus: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The unitary focusing matrices T of the rotational signal subspace method: T_f maps the steering vectors of bin f onto the ones
+    of the focus bin, T_f A_f ~ A_focus, over all candidates at once. Unitary matrices keep white noise white.
+
+    Args:
+        A (np.ndarray): The steering tensor of the candidates, with shape (M, candidates, bins).
+        focus (int): The index of the focus bin.
+
+    Returns:
+        np.ndarray: T of every bin, with shape (bins, M, M).
+    """
+    # The orthogonal Procrustes solution: with A_f A_focus^H = U S V^H, T_f = V U^H
+    C = np.einsum("maf,na->fmn", A, A[:,:,focus].conj(), optimize=True)
+    U, _, Vh = np.linalg.svd(C)
+    return np.conj(np.swapaxes(U @ Vh, -1, -2))
+
+def wideband_spectrum(S: np.ndarray, A: np.ndarray, method: str = "mvdr", combine: str = "incoherent", n_sources: int|None = None,
+                      loading: float = 0.0, focus: int|None = None) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The spectrum of all bins of a band, instead of one chosen bin.
+
+    Incoherent: the spectrum of every bin, normalized to its maximum so no bin dominates, averaged over the bins.
+    Coherent: the covariances are focused onto one bin (see focusing_matrices) and summed, then one spectrum is computed,
+    which also works when the sources are correlated or there are few frames.
+
+    Args:
+        S (np.ndarray): The STFT of every channel in the band, with shape (M, bins, frames), e.g. from MultichannelSTFT.
+        A (np.ndarray): The steering tensor at the frequencies of the bins, with shape (M, candidates, bins).
+        method (str, optional): "matched", "mvdr" or "music". Defaults to "mvdr".
+        combine (str, optional): "incoherent" or "coherent". Defaults to "incoherent".
+        n_sources (int | None, optional): The amount of sources, needed for "music". Defaults to None.
+        loading (float, optional): The diagonal loading of "mvdr". Defaults to 0.0.
+        focus (int | None, optional): The index of the focus bin of "coherent". If None, the middle bin. Defaults to None.
+
+    Raises:
+        ValueError: If the combination is unknown or the shapes do not match.
+
+    Returns:
+        np.ndarray: The spectrum of every candidate, with shape (candidates,).
+    """
+    if S.shape[:2] != (A.shape[0], A.shape[2]):
+        raise ValueError(f"The STFT has shape {S.shape} and the steering tensor {A.shape}, expected (M, bins, frames) and (M, candidates, bins)")
+    Rx = covariances(S)
+
+    if combine == "incoherent":
+        P = spectra(Rx, A, method, n_sources, loading)
+        return np.mean(P / np.max(P, axis=0, keepdims=True), axis=1)
+    if combine == "coherent":
+        focus = A.shape[2] // 2 if focus is None else focus
+        T = focusing_matrices(A, focus)
+        R = np.mean(T @ Rx @ np.conj(np.swapaxes(T, -1, -2)), axis=0)
+        return spectra(R[None,:,:], A[:,:,focus:focus + 1], method, n_sources, loading)[:,0]
+    raise ValueError(f"Unknown combination {combine}, expected one of {COMBINATIONS}")
+
+def strongest_peaks(P: np.ndarray, n: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        P (np.ndarray): A spectrum over a grid of candidates.
+        n (int): The amount of peaks, e.g. the amount of sources.
+
+    Returns:
+        np.ndarray: The indices of the n highest local maxima, from high to low.
+    """
+    peaks, _ = find_peaks(P)
+    return peaks[np.argsort(P[peaks])[::-1][:n]]
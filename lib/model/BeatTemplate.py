@@ -0,0 +1,224 @@
+import numpy as np
+from scipy.fft import rfft
+from typing import Tuple
+
+from lib.model.ValveParams import ValveParams
+from lib.model.generate import synthesize_valves, VALVE_PARAMETERS
+from lib.processing.functions import construct_bandpass_filter, apply_filter
+
+def fold(h: np.ndarray, size: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Wrap a signal around a period of size samples, so its DFT of length size is the spectrum of its periodic repetition.
+
+    Args:
+        h (np.ndarray): The signal.
+        size (int): The period (samples).
+
+    Returns:
+        np.ndarray: The sum of all size long parts of h, padded with zeros.
+    """
+    if len(h) <= size:
+        return np.pad(h, (0, size - len(h)))
+    return np.pad(h, (0, -len(h) % size)).reshape(-1, size).sum(axis=0)
+
+class BeatTemplate:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Cache of the filtered sound of every valve of one beat, so a model without randomization only re-synthesizes the valves that changed.
+
+    Filtering is linear, so the filtered beat is the sum of the filtered valves. The beats of a model are the same beat
+    every `length` samples, so the spectrum of n beats is the spectrum of one beat times sum_i exp(-2j*pi*f*i*length),
+    which is computed from the cached spectra of the valves without synthesizing or transforming the repeated signal.
+    When the beats do not overlap, the signal is n * length samples long and this sum is zero except at every n-th bin,
+    where it is n. Then only the DFT of length `length` of every valve is needed.
+    """
+    def __init__(self, Fs: int, lf: float, hf: float, order: int, size: int):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            Fs (int): The sampling frequency of the (virtual) microphone in Hz.
+            lf (float): The lower frequency of the bandpass filter in Hz.
+            hf (float): The upper frequency of the bandpass filter in Hz.
+            order (int): The order of the bandpass filter.
+            size (int): The length of the bandpass filter.
+        """
+        self.Fs = Fs
+        self.lf = lf
+        self.hf = hf
+        self.order = order
+        self.size = size
+        # Per valve index: (parameters, filtered sound) and (parameters, FFT length, rfft of the filtered sound)
+        self.sounds = {}
+        self.spectra = {}
+        self.repetitions = None
+        self.hits = 0
+        self.misses = 0
+
+    def valve_key(self, valve: ValveParams) -> tuple:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            valve (ValveParams): The valve.
+
+        Returns:
+            tuple: Everything the filtered sound of the valve depends on.
+        """
+        return (self.Fs, self.lf, self.hf, self.order, self.size) + tuple(float(getattr(valve, name)) for name in VALVE_PARAMETERS)
+
+    def filter(self) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            np.ndarray: The bandpass filter, from the kernel cache.
+        """
+        return construct_bandpass_filter(self.lf, self.hf, self.Fs, self.order, self.size)
+
+    def valve(self, index: int, valve: ValveParams) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            index (int): The index of the valve in the model.
+            valve (ValveParams): The valve.
+
+        Returns:
+            np.ndarray: The filtered sound of the valve, from the start of the beat.
+        """
+        key = self.valve_key(valve)
+        cached = self.sounds.get(index)
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        params = {name: np.array([getattr(valve, name)], dtype=np.float64) for name in VALVE_PARAMETERS}
+        h = synthesize_valves(params, np.zeros(1, dtype=np.int64), self.Fs)
+        if len(h) > 0:
+            h = apply_filter(h, self.filter())
+        self.sounds[index] = (key, h)
+        return h
+
+    def beat(self, valves: list[ValveParams], BPM: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The same as advanced_model_single_beat, from the cached valves.
+
+        Args:
+            valves (list[ValveParams]): A list of the valve parameters.
+            BPM (int): The BPM of the simulated heart.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: t_model, h_model
+        """
+        self._drop_removed(len(valves))
+        sounds = [self.valve(i, valve) for i, valve in enumerate(valves)]
+        h_filtered = np.zeros(max(len(h) for h in sounds))
+        for h in sounds:
+            h_filtered[:len(h)] += h
+        len_g = len(self.filter())
+        if len(h_filtered) - len_g + 1 > int(60/BPM*self.Fs) - self.size:
+            print("WARNING: one beat is longer than expected, check for overlap")
+        t_filtered = np.linspace(-len_g/self.Fs/2, (len(h_filtered) + len_g)/self.Fs/2, len(h_filtered))
+        return t_filtered, h_filtered
+
+    def spectrum(self, valves: list[ValveParams], n: int, length: int, N: int) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The FFT of n beats of these valves, repeated every length samples, like fft(repeat(n, beat, t, Fs, length)[1], N).
+
+        Args:
+            valves (list[ValveParams]): A list of the valve parameters.
+            n (int): The amount of beats.
+            length (int): The amount of samples between the starts of the beats.
+            N (int): The length of the FFT, at least as long as the repeated signal.
+
+        Returns:
+            np.ndarray: The complex spectrum, with the frequencies in the same order as fft.
+        """
+        self._drop_removed(len(valves))
+        periodic = N == n * length
+        size = length if periodic else N
+        R_beat = np.zeros(size//2 + 1, dtype=np.complex128)
+        for i, valve in enumerate(valves):
+            h = self.valve(i, valve)
+            cached = self.spectra.get(i)
+            if cached is None or cached[0] != self.sounds[i][0] or cached[1] != size:
+                cached = self.spectra[i] = (self.sounds[i][0], size, rfft(fold(h, size)))
+            R_beat += cached[2]
+
+        if periodic:
+            R = np.zeros(N//2 + 1, dtype=np.complex128)
+            R[::n] = n * R_beat
+        else:
+            R = R_beat * self._repetitions(n, length, N)
+        # The spectrum of a real signal is conjugate symmetric
+        return np.concatenate((R, np.conj(R[1:(N + 1)//2][::-1])))
+
+    def clear(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Drop all cached sounds and spectra and reset the counters.
+        """
+        self.sounds.clear()
+        self.spectra.clear()
+        self.repetitions = None
+        self.hits = self.misses = 0
+
+    def _repetitions(self, n: int, length: int, N: int) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The spectrum of n unit impulses every length samples, sum_i exp(-2j*pi*k*i*length/N), as a geometric series.
+        The phases are reduced modulo N with integers first, so they stay exact for long signals.
+
+        Args:
+            n (int): The amount of beats.
+            length (int): The amount of samples between the starts of the beats.
+            N (int): The length of the FFT.
+
+        Returns:
+            np.ndarray: The factor of every bin of the rfft.
+        """
+        if self.repetitions is not None and self.repetitions[0] == (n, length, N):
+            return self.repetitions[1]
+
+        k = np.arange(N//2 + 1, dtype=np.int64)
+        step = (k * length) % N
+        numerator = 1 - np.exp(-2j*np.pi * ((step * n) % N) / N)
+        denominator = 1 - np.exp(-2j*np.pi * step / N)
+        # Where the step is a whole period all n terms are 1
+        D = np.full(len(k), n, dtype=np.complex128)
+        np.divide(numerator, denominator, out=D, where=step != 0)
+        self.repetitions = ((n, length, N), D)
+        return D
+
+    def _drop_removed(self, n_valves: int):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            n_valves (int): The current amount of valves, the cache of valves after it is dropped.
+        """
+        for cache in (self.sounds, self.spectra):
+            for index in [index for index in cache if index >= n_valves]:
+                del cache[index]
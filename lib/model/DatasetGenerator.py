@@ -0,0 +1,236 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+from itertools import product
+from os.path import join
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+import json
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.model.Model_3D import Model_3D, Point
+from lib.model.ValveParams import ValveParams
+from lib.model.generate import advanced_model_sources, VALVE_PARAMETERS
+from lib.os.pathUtils import ensure_path_exists
+from lib.os.wavUtils import write_wav
+
+MANIFEST_NAME = "manifest.json"
+
+def generate_sample(sample: dict, valves: list[ValveParams], config: ConfigParser, folder: str) -> dict:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Generate and write one recording of the dataset, in a worker process.
+
+    Every valve is a separate source at its position, all valves share the same randomized beats.
+    The noise is added per microphone, after the propagation.
+
+    Args:
+        sample (dict): The parameters of the sample, see DatasetGenerator.samples.
+        valves (list[ValveParams]): The valve parameters before randomization, in the order of the source positions.
+        config (ConfigParser): The config object.
+        folder (str): The folder of the dataset.
+
+    Returns:
+        dict: The manifest record of the sample: its parameters, the file and the ground truth.
+    """
+    rng = np.random.default_rng(sample["seed"])
+    model = Model(config)
+    valves = deepcopy(valves)
+    record = dict(sample)
+    record["valves"] = [{"name": valve.name, **{name: getattr(valve, name) for name in VALVE_PARAMETERS}} for valve in valves]
+
+    _, sources, beat_starts = advanced_model_sources(model.Fs, sample["bpm"], model.lf, model.hf, model.order, model.size, valves, sample["n_beats"],
+                                                     r_ratio=sample["r_ratio"], bpm_ratio=sample["bpm_ratio"], rng=rng)
+    model_3d = Model_3D(config, [Point(*position) for position in sample["source_positions"]],
+                        [Point(*position) for position in sample["microphone_positions"]])
+    h = model_3d.generate(sources)
+    h += rng.uniform(-sample["noise"], sample["noise"], h.shape)
+
+    # int16 with one scale for all channels, so the gains between the microphones are kept
+    scale = float(np.max(np.abs(h)))
+    file_name = f"sample_{sample['index']:06d}.wav"
+    write_wav(join(folder, file_name), model.Fs, np.round(h.T / scale * (2**15 - 1)).astype(np.int16),
+              {**model_3d.metadata(), "scale": scale})
+
+    delays, gains = model_3d.propagation()
+    record.update({
+        "file": file_name,
+        "Fs": model.Fs,
+        "samples": h.shape[1],
+        "scale": scale,
+        "beat_starts": beat_starts.tolist(),
+        "delays": delays.tolist(),
+        "gains": gains.tolist(),
+    })
+    return record
+
+class DatasetGenerator:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Generates a labelled dataset of multichannel heart sound recordings, to benchmark localization.
+
+    Every combination of the swept source positions, microphone geometries, BPMs, randomization ratios and noise levels
+    is generated `repetitions` times with its own seed. The recordings are written as int16 multichannel wav files with the geometry
+    as metadata (see lib.os.wavUtils), and all parameters and the ground truth (beat starts, delays and gains per microphone and source)
+    are written to one manifest.
+    """
+    def __init__(self, config: ConfigParser, source_positions: dict[str, list[Point]], geometries: dict[str, list[Point]],
+                 bpms: list[int]|None = None, r_ratios: list[float] = [0.0], bpm_ratios: list[float] = [0.0], noise_levels: list[float] = [0.0],
+                 n_beats: int|None = None, repetitions: int = 1, valves: list[ValveParams]|None = None, seed: int = 0, log: bool = True):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            config (ConfigParser): The config object.
+            source_positions (dict[str, list[Point]]): Named layouts of the valves, with one position (cm) per valve.
+            geometries (dict[str, list[Point]]): Named microphone arrays (cm).
+            bpms (list[int] | None, optional): The BPMs. If None, the BPM of the config. Defaults to None.
+            r_ratios (list[float], optional): How much to randomize each valve parameter. Defaults to [0.0].
+            bpm_ratios (list[float], optional): How much to randomize the BPM. Defaults to [0.0].
+            noise_levels (list[float], optional): The amplitudes of the uniform noise at the microphones. Defaults to [0.0].
+            n_beats (int | None, optional): The amount of beats per recording. If None, NBeats of the config. Defaults to None.
+            repetitions (int, optional): The amount of recordings per combination. Defaults to 1.
+            valves (list[ValveParams] | None, optional): The valves. If None, the valves of Model. Defaults to None.
+            seed (int, optional): The seed of the whole dataset. Defaults to 0.
+            log (bool, optional): Whether to log the progress in the console. Defaults to True.
+
+        Raises:
+            ValueError: If a layout does not have one position per valve.
+        """
+        self.config = config
+        self.valves = valves if valves is not None else Model(config).valves_init
+        for name, positions in source_positions.items():
+            if len(positions) != len(self.valves):
+                raise ValueError(f"Source layout {name} has {len(positions)} positions for {len(self.valves)} valves")
+
+        self.source_positions = source_positions
+        self.geometries = geometries
+        self.bpms = bpms if bpms is not None else [config.HeartSoundModel.BPM]
+        self.r_ratios = r_ratios
+        self.bpm_ratios = bpm_ratios
+        self.noise_levels = noise_levels
+        self.n_beats = n_beats if n_beats is not None else config.HeartSoundModel.NBeats
+        self.repetitions = repetitions
+        self.seed = seed
+        self.log_enabled = log
+        self.failures = {}
+
+    def samples(self) -> list[dict]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            list[dict]: The parameters of every sample. The seeds are spawned from the dataset seed by index,
+                so a sample is the same no matter which worker generates it.
+        """
+        combinations = list(product(self.source_positions.items(), self.geometries.items(), self.bpms, self.r_ratios,
+                                    self.bpm_ratios, self.noise_levels, range(self.repetitions)))
+        seeds = np.random.SeedSequence(self.seed).spawn(len(combinations))
+        samples = []
+        for index, ((sources, source_positions), (geometry, mic_positions), bpm, r_ratio, bpm_ratio, noise, repetition) in enumerate(combinations):
+            samples.append({
+                "index": index,
+                "seed": int(seeds[index].generate_state(1)[0]),
+                "sources": sources,
+                "source_positions": [list(point.toTuple()) for point in source_positions],
+                "geometry": geometry,
+                "microphone_positions": [list(point.toTuple()) for point in mic_positions],
+                "bpm": bpm,
+                "r_ratio": r_ratio,
+                "bpm_ratio": bpm_ratio,
+                "noise": noise,
+                "repetition": repetition,
+                "n_beats": self.n_beats,
+            })
+        return samples
+
+    def generate(self, folder: str|Path|None = None, parallel: bool = True, max_workers: int|None = None) -> Path:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Generate all samples and write the manifest.
+
+        Args:
+            folder (str | Path | None, optional): The folder of the dataset. If None, DatasetPath of the config. Defaults to None.
+            parallel (bool, optional): Whether to generate the samples in a process pool. Defaults to True.
+            max_workers (int | None, optional): The amount of worker processes. If None, the amount of cores is used. Defaults to None.
+
+        Returns:
+            Path: The path to the manifest.
+        """
+        folder = Path(folder if folder is not None else self.config.Generation.DatasetPath)
+        ensure_path_exists(folder, is_parent=True)
+        samples = self.samples()
+        records = {}
+        start = perf_counter()
+
+        if parallel:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {pool.submit(generate_sample, sample, self.valves, self.config, str(folder)): sample for sample in samples}
+                for future in as_completed(futures):
+                    self._collect(futures[future], future.result, records, len(samples))
+        else:
+            for sample in samples:
+                self._collect(sample, lambda: generate_sample(sample, self.valves, self.config, str(folder)), records, len(samples))
+
+        manifest = {
+            "seed": self.seed,
+            "duration": perf_counter() - start,
+            "samples": [records[index] for index in sorted(records)],
+            "failures": {str(index): failure for index, failure in sorted(self.failures.items())},
+        }
+        manifest_path = folder / MANIFEST_NAME
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=1)
+        return manifest_path
+
+    def _collect(self, sample: dict, result: Callable[[], dict], records: dict, total: int):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Store the record of a sample, or its failure.
+
+        Args:
+            sample (dict): The parameters of the sample.
+            result (Callable[[], dict]): Returns the record, e.g. Future.result of the worker.
+            records (dict): The records per index.
+            total (int): The amount of samples.
+        """
+        try:
+            records[sample["index"]] = result()
+            self.log(f"Generated {len(records)}/{total}")
+        except Exception as e:
+            self.log(f"Sample {sample['index']} failed, Error: {e}")
+            self.failures[sample["index"]] = f"{type(e).__name__}: {e}"
+
+    def log(self, msg):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        if self.log_enabled:
+            print(msg)
+
+def load_manifest(folder: str|Path) -> dict:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        folder (str | Path): The folder of the dataset.
+
+    Returns:
+        dict: The manifest, see DatasetGenerator.generate.
+    """
+    with open(Path(folder) / MANIFEST_NAME) as f:
+        return json.load(f)
@@ -8,7 +8,10 @@ from scipy.io.wavfile import write
 from os.path import join
 
 from lib.config.ConfigParser import ConfigParser
+from lib.model.BeatTemplate import BeatTemplate
+from lib.model.ValveBank import ValveBank
 from lib.model.generate import *
+from lib.processing.kernels import configure_kernel_cache
 from lib.os.pathUtils import *
 
 class Model:
@@ -38,6 +41,7 @@ class Model:
         self.size = config.LowpassFilter.Size
         
         self.sounds_path = config.Generation.SoundsPath
+        configure_kernel_cache(config)
         
         self.randomize_enabled = randomize_enabled
         
@@ -60,6 +64,7 @@ class Model:
         self.simulate_S1 = simulate_S1
         self.simulate_S2 = simulate_S2
         self.valves = deepcopy(self.valves_init)
+        self.template = BeatTemplate(self.Fs, self.lf, self.hf, self.order, self.size)
         
     def reset(self) -> None:
         """
@@ -109,20 +114,28 @@ class Model:
         
         write(wav_path, self.Fs, h_model)
     
-    def generate_model(self, use_transfer: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    def generate_model(self, use_transfer: bool = True, rng: np.random.Generator|int|None = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         @author: Gerrald
         @date: 10-12-2025
 
         Generates the model time and amplitude axis.
         
+        Without randomization, the beat is assembled from the cached sounds of the valves (see BeatTemplate),
+        so only the valves that changed since the last call are synthesized again.
+        
         Args:
             use_transfer(bool, optional): Whether to use the transfer function or the real function. Defaults to True.
+            rng (np.random.Generator | int | None, optional): The random generator or a seed for it, used when randomization is enabled. If None, it is seeded from the global numpy generator. Defaults to None.
         
         Returns:
             Tuple[np.ndarray, np.ndarray]: t_model (the time axis), h_model (the amplitude axis).
         
         """
+        if not self.randomize_enabled:
+            t_filtered, h_filtered = self.template.beat(self.valves, self.BPM)
+            return repeat(self.n, h_filtered, t_filtered, self.Fs, int(60/self.BPM*self.Fs))
+        
         t_model, h_model = advanced_model(
             self.Fs,
             self.BPM,
@@ -134,7 +147,8 @@ class Model:
             self.n, 
             randomize_enabled=self.randomize_enabled,
             noise=0.01,
-            use_transfer=use_transfer
+            use_transfer=use_transfer,
+            rng=rng
         )
         
         return t_model, h_model
@@ -145,6 +159,8 @@ class Model:
         @date: 10-12-2025
 
         Generates the model time, amplitude and frequency axis.
+        
+        Without randomization, the spectrum is computed from the cached spectra of the valves instead of an FFT of the whole model.
 
         Returns:
             Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: t_model (the time axis), h_model (the amplitude axis), freq (the frequency axis), H (the frequency amplitude spectrum)
@@ -152,11 +168,14 @@ class Model:
         """
         t_model, h_model = self.generate_model()
         
-        H = fftshift(fft(h_model))
+        if self.randomize_enabled:
+            H = fftshift(fft(h_model))
+        else:
+            H = fftshift(self.template.spectrum(self.valves, self.n, int(60/self.BPM*self.Fs), len(h_model)))
         H = H/np.max(np.abs(H))
         freq = np.linspace(-self.Fs/2, self.Fs/2, len(H))
         
-        return t_model, h_model, np.array(freq), np.array(H)
+        return t_model, h_model, freq, H
     
     def import_csv(self, file_path: str|Path) -> None:
         """
@@ -276,11 +295,9 @@ class Model:
             str: The generated csv string.
         
         """
-        contents = [["Model:"], ["BPM", "n"], [str(self.BPM), str(self.n)], [self.valves[0].properties()]]
-        for valve in self.valves:
-            contents.append(valve.values_str())
+        contents = [["Model:"], ["BPM", "n"], [str(self.BPM), str(self.n)]]
         
-        return "\n".join([",".join(c) for c in contents])
+        return "\n".join([",".join(c) for c in contents] + [ValveBank.from_valves(self.valves).to_csv()])
     
     def export_csv(self, file_path: str|Path) -> None:
         """
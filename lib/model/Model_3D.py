@@ -1,5 +1,6 @@
 import numpy as np
-from scipy.io.wavfile import write
+from math import ceil
+from scipy.fft import rfft, irfft, next_fast_len
 from pathlib import Path
 from os.path import join
 from datetime import datetime
@@ -7,6 +8,15 @@ from datetime import datetime
 from lib.config.ConfigParser import ConfigParser
 from lib.model.generate import *
 from lib.os.pathUtils import ensure_path_exists
+from lib.os.wavUtils import write_wav
+
+# Zeros after the longest delay in the FFT, so the ringing of fractional delays at the end of a signal does not wrap around to the start
+FFT_GUARD = 1024
+# The phase factor of bin k = row * PHASE_COLUMNS + column is the product of a factor per row and a factor per column,
+# so only rows + columns complex exponentials are needed per microphone and source instead of one per bin
+PHASE_COLUMNS = 1024
+# Amount of rows that are summed at once, small enough to stay in the cache of the processor
+PHASE_ROWS = 32
 
 class Point:
     def __init__(self, x, y, z):
@@ -33,44 +43,129 @@ class Model_3D:
         self.Fs = config.HeartSoundModel.Fs
         self.V_Body = config.Multichannel.V_body
         self.sounds_path = config.Generation.SoundsPath
+        self.signals = None
         
-    def generate(self, signals: list[np.ndarray[np.float64]] | np.ndarray[np.float64]):
-        if isinstance(signals, np.ndarray):
+    def propagation(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        
+        The delay and gain from every source to every microphone.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The delays (s) and gains, both with shape (microphones, sources).
+        """
+        # factor hundred to convert from cm to m
+        dists_to_valves = np.linalg.norm((self.microphone_locs[:,None,:] - self.source_locs[None,:,:]) / 100, axis=2)
+        return dists_to_valves / self.V_Body, 1 / dists_to_valves
+        
+    def generate(self, signals: list[np.ndarray[np.float64]] | np.ndarray[np.float64], fractional: bool = True) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        
+        Propagate the source signals to every microphone.
+        
+        Every source signal is transformed once, every microphone gets the sum of the source spectra multiplied
+        by gain * exp(-2j*pi*f*delay), so the delays do not have to be whole samples.
+
+        Args:
+            signals (list[np.ndarray[np.float64]] | np.ndarray[np.float64]): The signal of every source, or one signal for a single source.
+                Shorter signals are padded with zeros.
+            fractional (bool, optional): Whether to delay by the exact delays. If False, the delays are rounded to whole samples. Defaults to True.
+
+        Returns:
+            np.ndarray: The microphone signals with shape (microphones, samples). All have the length of the longest source signal
+                plus the longest delay.
+        """
+        if isinstance(signals, np.ndarray) and signals.ndim == 1:
             signals = [signals]
-            
-        modelled_signals = []
-
-        for mic_loc in self.microphone_locs:
-            new_mic_loc = np.tile(mic_loc,(len(self.source_locs),1)) # repeat the mic loc, to comply with the dimensions of np.linalg.norm
-            
-            # factor hundred to convert from cm to m
-            dists_to_valves = np.linalg.norm((self.source_locs-new_mic_loc)/100, axis=1)
-            
-            # calc delays and gains using distances to the valves
-            delays = dists_to_valves/self.V_Body
-            gains = 1/dists_to_valves
-            
-            mic_signals = []
-            max_delay = max(delays)
-            for delay, gain, signal in zip(delays, gains, signals):
-                mic_signals.append(gain * np.pad(signal, [round(delay*self.Fs), round(max_delay*self.Fs)-round(delay*self.Fs)]))
-                
-            modelled_signals.append(np.array(mic_signals).sum(axis=0))
+        if len(signals) != len(self.source_locs):
+            raise ValueError(f"Got {len(signals)} signals for {len(self.source_locs)} sources")
+        
+        delays, gains = self.propagation()
+        delays = delays * self.Fs
+        if not fractional:
+            delays = np.round(delays)
+        
+        n_signal = max(len(signal) for signal in signals)
+        n_out = n_signal + ceil(np.max(delays))
+        n_fft = next_fast_len(n_out + FFT_GUARD, real=True)
+        n_bins = n_fft // 2 + 1
+        n_rows = ceil(n_bins / PHASE_COLUMNS)
+        spectra = np.zeros((len(signals), n_rows * PHASE_COLUMNS), dtype=np.complex128)
+        for i, signal in enumerate(signals):
+            spectra[i,:n_bins] = rfft(signal, n_fft, workers=-1)
+        spectra = spectra.reshape(len(signals), n_rows, PHASE_COLUMNS)
+        
+        # gain * exp(-2j*pi*k*delay/n_fft) split in a factor per row (with the gain) and per column, see PHASE_COLUMNS
+        row_phases = gains[:,:,None] * np.exp(-2j * np.pi * delays[:,:,None] * (np.arange(n_rows) * PHASE_COLUMNS / n_fft))
+        column_phases = np.exp(-2j * np.pi * delays[:,:,None] * (np.arange(PHASE_COLUMNS) / n_fft))
         
-        self.signals = modelled_signals
-        return modelled_signals
+        self.signals = np.empty((len(self.microphone_locs), n_out))
+        mic_spectrum = np.empty((n_rows, PHASE_COLUMNS), dtype=np.complex128)
+        shifted = np.empty((PHASE_ROWS, PHASE_COLUMNS), dtype=np.complex128)
+        for m in range(len(self.microphone_locs)):
+            for start in range(0, n_rows, PHASE_ROWS):
+                rows = slice(start, start + PHASE_ROWS)
+                block = mic_spectrum[rows]
+                block[:] = 0
+                for s in range(len(signals)):
+                    out = shifted[:len(block)]
+                    np.multiply(spectra[s,rows], column_phases[m,s], out=out)
+                    out *= row_phases[m,s,rows,None]
+                    block += out
+            self.signals[m] = irfft(mic_spectrum.ravel()[:n_bins], n_fft, workers=-1)[:n_out]
+        return self.signals
     
-    def save(self, sub_folder: str|Path):
+    def metadata(self) -> dict:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            dict: The geometry of the model, which is saved with the signals.
+        """
+        return {
+            "Fs": self.Fs,
+            "V_body": self.V_Body,
+            "units": "cm",
+            "microphone_positions": self.microphone_locs.tolist(),
+            "source_positions": self.source_locs.tolist(),
+        }
+
+    def save(self, sub_folder: str|Path, multichannel: bool = True) -> list[str]:
         """
         @author: Gerrald
         @date: 12-12-2025
-        """ 
+
+        Save the generated signals.
+
+        Args:
+            sub_folder (str | Path): The folder in the 3d-model folder of SoundsPath.
+            multichannel (bool, optional): Whether to write one multichannel wav file with the geometry as metadata (see lib.os.wavUtils),
+                instead of one mono wav file per microphone. Defaults to True.
+
+        Raises:
+            RuntimeError: If the signals are not generated yet.
+
+        Returns:
+            list[str]: The paths of the written files.
+        """
+        if self.signals is None:
+            raise RuntimeError("Generate the signals before saving them")
+
         base_folder = join(self.sounds_path, "3d-model", sub_folder)
         ensure_path_exists(base_folder, is_parent=True)
-        
-        if self.signals is None:
-            self.generate()
-            
+        name = f"generated_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+
+        if multichannel:
+            path = join(base_folder, f"{name}.wav")
+            write_wav(path, self.Fs, self.signals.T, self.metadata())
+            return [path]
+
+        paths = []
         for i, signal in enumerate(self.signals):
-            path = join(base_folder, f"generated_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_channel_{i}.wav")
-            write(path, self.Fs, signal)
\ No newline at end of file
+            paths.append(join(base_folder, f"{name}_channel_{i}.wav"))
+            write_wav(paths[-1], self.Fs, signal)
+        return paths
\ No newline at end of file
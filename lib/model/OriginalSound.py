@@ -7,6 +7,7 @@ import numpy as np
 
 from lib.processing.Processor import Processor
 from lib.os.pathUtils import *
+from lib.os.wavUtils import MappedWav
 from lib.config.ConfigParser import ConfigParser
 
 class OriginalSound:
@@ -35,6 +36,7 @@ class OriginalSound:
         self.config = config
         self.shift = self.shift_init = -2.28
         self.file_path = file_path
+        self.wav = MappedWav(file_path)
         
         self.original_length = None
         self.original_Fs = None
@@ -63,6 +65,8 @@ class OriginalSound:
         """
         if self.processor is None or self.processor.y_normalized is None or self.processor.Fs_target is None:
             self.processor = Processor(self.file_path.resolve(), self.config, write_result_processed=False, write_result_raw=False)
+            # Reuse the mapped file instead of reading it again
+            self.processor.load(self.wav)
             self.processor.preprocess()
         
         self.original_length = len(self.processor.y_normalized)
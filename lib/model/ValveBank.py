@@ -0,0 +1,254 @@
+from pathlib import Path
+import csv
+import io
+import numpy as np
+
+from lib.model.ValveParams import ValveParams
+from lib.model.generate import synthesize_valves, VALVE_PARAMETERS
+from lib.general.generalUtils import make_rng
+
+# One record per valve, the fields have the units of the attributes of ValveParams (s, Hz)
+VALVE_DTYPE = np.dtype([("name", "U16")] + [(name, np.float64) for name in VALVE_PARAMETERS])
+
+class ValveBank:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Many valves, or many randomized variants of the same valves, in one numpy record array.
+
+    The last axis of the array is the valve, e.g. shape (valves,) for one model or (variants, valves) for variants of it.
+    Every parameter is a column (see `params`) that is used directly for randomization and synthesis,
+    so thousands of variants do not need an attribute access per valve. The binary format is the .npy file of the
+    array, which is loaded memory mapped.
+    """
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            data (np.ndarray): The records, with dtype VALVE_DTYPE. It is not copied.
+
+        Raises:
+            ValueError: If the dtype is not VALVE_DTYPE.
+        """
+        if data.dtype != VALVE_DTYPE:
+            raise ValueError(f"Expected a record array with dtype {VALVE_DTYPE}, got {data.dtype}")
+        self.data = data
+
+    @classmethod
+    def from_valves(cls, valves: list[ValveParams]) -> "ValveBank":
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            valves (list[ValveParams]): The valves.
+
+        Returns:
+            ValveBank: A bank with shape (valves,).
+        """
+        return cls(np.array([(valve.name or "",) + tuple(valve.num_values()) for valve in valves], dtype=VALVE_DTYPE))
+
+    def __len__(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        return len(self.data)
+
+    def __getitem__(self, index) -> "ValveBank":
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            ValveBank: The selected records, a view when numpy returns one.
+        """
+        return ValveBank(np.atleast_1d(self.data[index]))
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        return self.data.shape
+
+    @property
+    def names(self) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        return self.data["name"]
+
+    def params(self) -> dict[str, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            dict[str, np.ndarray]: Views on the values of every name in VALVE_PARAMETERS, the input of synthesize_valves.
+        """
+        return {name: self.data[name] for name in VALVE_PARAMETERS}
+
+    def to_valves(self) -> list[ValveParams]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            list[ValveParams]: The valves of a bank with shape (valves,).
+        """
+        valves = []
+        for record in self.data.reshape(-1).tolist():
+            valve = ValveParams(*[0.0] * len(VALVE_PARAMETERS), name=record[0] or None)
+            # Set the attributes directly, converting the times from ms to s would change the last bits
+            for name, value in zip(VALVE_PARAMETERS, record[1:]):
+                setattr(valve, name, value)
+            valves.append(valve)
+        return valves
+
+    def randomize(self, ratio: float, rng: np.random.Generator|int|None = None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Randomize every parameter of every valve, like ValveParams.randomize, in place.
+
+        Args:
+            ratio (float): How much to randomize the parameters as ratio of the parameter.
+            rng (np.random.Generator | int | None, optional): The random generator or a seed for it. If None, it is seeded from the global numpy generator. Defaults to None.
+        """
+        rng = make_rng(rng)
+        for name in VALVE_PARAMETERS:
+            self.data[name] *= 1 + ratio * rng.uniform(-1, 1, self.shape)
+
+    def random_walk(self, n: int, r_ratio: float, rng: np.random.Generator|int|None = None) -> "ValveBank":
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The parameters of n beats, like calling ValveParams.randomize before every beat. The random numbers are drawn
+        in the same order as randomized_valve_params, so the same generator gives the same parameters.
+
+        Args:
+            n (int): The amount of beats.
+            r_ratio (float): How much to randomize each valve parameter.
+            rng (np.random.Generator | int | None, optional): The random generator or a seed for it. If None, it is seeded from the global numpy generator. Defaults to None.
+
+        Returns:
+            ValveBank: A bank with shape (n, valves) for a bank with shape (valves,).
+        """
+        rng = make_rng(rng)
+        data = np.empty((n,) + self.shape, dtype=VALVE_DTYPE)
+        data["name"] = self.names
+        for name in VALVE_PARAMETERS:
+            data[name] = self.data[name] * np.cumprod(1 + r_ratio * rng.uniform(-1, 1, size=data.shape), axis=0)
+        return ValveBank(data)
+
+    def synthesize(self, Fs: int, offsets: np.ndarray|None = None) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            Fs (int): The sampling frequency of the (virtual) microphone in Hz.
+            offsets (np.ndarray | None, optional): The sample at which each valve starts, with the shape of the bank. Defaults to None.
+
+        Returns:
+            np.ndarray: The sum of the sounds of all valves, see synthesize_valves.
+        """
+        if offsets is None:
+            offsets = np.zeros(self.shape, dtype=np.int64)
+        return synthesize_valves(self.params(), offsets, Fs)
+
+    def synthesize_variants(self, Fs: int, rows_per_block: int = 16) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Synthesize every row of the bank as a separate beat. A block of rows is synthesized in one call of synthesize_valves,
+        with every row at its own offset in the output.
+
+        Args:
+            Fs (int): The sampling frequency of the (virtual) microphone in Hz.
+            rows_per_block (int, optional): The amount of rows per call, small enough for the temporary arrays to stay in the cache. Defaults to 16.
+
+        Returns:
+            np.ndarray: The sum of the valves of every row, with shape (rows, samples). Row i is the same as valve_responses of row i, padded with zeros.
+        """
+        data = self.data.reshape(-1, self.shape[-1])
+        # Upper bound of the end of every valve, so the rows do not overlap
+        stride = int(np.max(np.floor(Fs * data["delay"]) + Fs * np.maximum(data["duration_total"], data["duration_onset"]))) + 1
+        h = np.zeros((len(data), stride))
+        flat = h.reshape(-1)
+        for start in range(0, len(data), rows_per_block):
+            block = data[start:start + rows_per_block]
+            offsets = np.repeat(np.arange(len(block), dtype=np.int64) * stride, block.shape[1])
+            h_block = synthesize_valves(ValveBank(block).params(), offsets, Fs)
+            flat[start * stride:start * stride + len(h_block)] = h_block
+        return h
+
+    def to_csv(self) -> str:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            str: The header and one row per valve, in the format of the valves in Model.generate_csv.
+        """
+        rows = [",".join(VALVE_DTYPE.names)]
+        for record in self.data.reshape(-1).tolist():
+            rows.append(",".join(map(str, record)))
+        return "\n".join(rows)
+
+    @classmethod
+    def from_csv(cls, contents: str) -> "ValveBank":
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            contents (str): The csv written by to_csv.
+
+        Raises:
+            ValueError: If the header is not the one of to_csv.
+
+        Returns:
+            ValveBank: A bank with shape (valves,).
+        """
+        reader = csv.reader(io.StringIO(contents))
+        header = next(reader)
+        if tuple(header) != VALVE_DTYPE.names:
+            raise ValueError(f"Expected the header {','.join(VALVE_DTYPE.names)}, got {','.join(header)}")
+        return cls(np.array([(row[0],) + tuple(map(float, row[1:])) for row in reader if row], dtype=VALVE_DTYPE))
+
+    def save(self, file_path: str|Path):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            file_path (str | Path): The .npy file.
+        """
+        np.save(file_path, self.data)
+
+    @classmethod
+    def load(cls, file_path: str|Path, mmap: bool = True) -> "ValveBank":
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            file_path (str | Path): The .npy file written by save.
+            mmap (bool, optional): Whether to memory map the file read-only instead of reading it. Defaults to True.
+
+        Returns:
+            ValveBank: The bank.
+        """
+        return cls(np.load(file_path, mmap_mode="r" if mmap else None))
@@ -0,0 +1,448 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from pathlib import Path
+from time import perf_counter
+import numpy as np
+from scipy.fft import rfft
+from scipy.optimize import differential_evolution
+from scipy.signal import fftconvolve, get_window, welch
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.model.OriginalSound import OriginalSound
+from lib.model.ValveBank import ValveBank
+from lib.model.generate import VALVE_PARAMETERS
+from lib.os.pathUtils import ensure_path_exists
+
+# Misfit of candidates that overlap the recording for less than one beat
+NO_OVERLAP_LOSS = 10.0
+# Bins of the spectrum of the beat per bin of the spectrum of the recording, and main lobes of the window that are kept
+ZERO_PADDING = 8
+KERNEL_WIDTH = 4
+
+class FitResult:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The parameters found by ModelFitter.fit.
+    """
+    def __init__(self, parameters: dict[str, float], loss: float, initial_loss: float, evaluations: int, iterations: int, duration: float):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            parameters (dict[str, float]): The fitted value of every free parameter, see ModelFitter.
+            loss (float): The misfit of the fitted parameters.
+            initial_loss (float): The misfit of the parameters the fit started from.
+            evaluations (int): The amount of evaluated candidates.
+            iterations (int): The amount of generations.
+            duration (float): The duration of the fit (s).
+        """
+        self.parameters = parameters
+        self.loss = loss
+        self.initial_loss = initial_loss
+        self.evaluations = evaluations
+        self.iterations = iterations
+        self.duration = duration
+
+    def apply(self, model: Model, original_sound: OriginalSound):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Set the fitted parameters. The valves are changed in place, so references to them (e.g. in the TUI) stay valid.
+
+        Args:
+            model (Model): The model that was fitted.
+            original_sound (OriginalSound): The recording it was fitted to.
+        """
+        for key, value in self.parameters.items():
+            if key == "BPM":
+                model.BPM = int(round(value))
+            elif key == "shift":
+                original_sound.shift = float(value)
+            else:
+                name, parameter = key.split(".")
+                setattr(next(valve for valve in model.valves if valve.name == name), parameter, float(value))
+
+    def summary(self) -> str:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            str: A readable summary of the fit.
+        """
+        return (f"Fit: loss {self.initial_loss:.4f} -> {self.loss:.4f} in {self.duration:.1f}s "
+                f"({self.iterations} iterations, {self.evaluations} evaluations)")
+
+class ModelFitter:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Fits the valve parameters, the BPM and the shift of a Model to a recording with differential evolution.
+
+    The misfit is the relative squared error of the envelopes in time (where the model overlaps the recording, like the
+    overlay of the TUI) plus the relative squared error of the normalized magnitude spectra of one beat and of the recording.
+    The recording is averaged over windows (Welch), which smooths the lines of the repeated beat with the power spectrum of the
+    window, so the power spectrum of the beat is smoothed with the same kernel before they are compared.
+    A generation of candidates is evaluated at once: all beats are synthesized with one ValveBank, filtered with one
+    batched FFT convolution and sampled on the time axis of the recording without building the repeated model.
+
+    The free parameters are named "BPM", "shift" and "<valve>.<parameter>", e.g. "M.freq_main". Every parameter is searched
+    in a range around its current value, so the fit can be warm started from a csv exported by the TUI.
+    """
+    def __init__(self, model: Model, original_sound: OriginalSound, parameters: list[str]|None = None, ratio: float = 0.5,
+                 bpm_ratio: float = 0.1, shift_range: float|None = None, time_weight: float = 1.0, freq_weight: float = 1.0,
+                 envelope_window: float = 0.05, resolution: float = 2.0):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            model (Model): The model, its current parameters are the start of the fit.
+            original_sound (OriginalSound): The recording, its current shift is the start of the fit.
+            parameters (list[str] | None, optional): The free parameters: "BPM", "shift", a valve parameter for all valves (e.g. "freq_main")
+                or "<valve>.<parameter>". If None, the BPM, the shift and all non-zero valve parameters. Defaults to None.
+            ratio (float, optional): The search range of the valve parameters, relative to their value. Defaults to 0.5.
+            bpm_ratio (float, optional): The search range of the BPM, relative to its value. Defaults to 0.1.
+            shift_range (float | None, optional): The search range of the shift (s). If None, half a beat. Defaults to None.
+            time_weight (float, optional): The weight of the misfit of the envelopes. Defaults to 1.0.
+            freq_weight (float, optional): The weight of the misfit of the spectra. Defaults to 1.0.
+            envelope_window (float, optional): The length of the moving average of the envelopes (s). Defaults to 0.05.
+            resolution (float, optional): The frequency resolution of the spectra (Hz). Defaults to 2.0.
+
+        Raises:
+            ValueError: If a parameter does not exist.
+        """
+        self.Fs = model.Fs
+        self.n = model.n
+        self.g = np.asarray(model.template.filter())
+        self.bank = ValveBank.from_valves(model.valves)
+        self.BPM = model.BPM
+        self.shift = original_sound.shift
+        self.time_weight = time_weight
+        self.freq_weight = freq_weight
+
+        y, _, _ = original_sound.get_sound_init()
+        self.Fs_original = original_sound.original_Fs
+        if self.Fs % self.Fs_original != 0:
+            raise ValueError(f"The sample rate of the model ({self.Fs}) is not a multiple of the one of the recording ({self.Fs_original})")
+        # The filtered beat has no content above the band of the filter, so it is compared at the rate of the recording
+        self.decimation = self.Fs // self.Fs_original
+
+        # The free parameters as (key, valve index or None, name), with their start value and bounds
+        self.keys = []
+        self.free = []
+        x0, bounds = [], []
+        shift_range = shift_range if shift_range is not None else 30/self.BPM
+        for key in self._parameter_keys(parameters):
+            if key == "BPM":
+                self.free.append((None, "BPM"))
+                x0.append(self.BPM)
+                bounds.append((round(self.BPM * (1 - bpm_ratio)), round(self.BPM * (1 + bpm_ratio))))
+            elif key == "shift":
+                self.free.append((None, "shift"))
+                x0.append(self.shift)
+                bounds.append((self.shift - shift_range, self.shift + shift_range))
+            else:
+                name, parameter = key.split(".")
+                index = list(self.bank.names).index(name)
+                value = float(self.bank.data[parameter][index])
+                self.free.append((index, parameter))
+                x0.append(value)
+                bounds.append(tuple(sorted((value * (1 - ratio), value * (1 + ratio)))))
+            self.keys.append(key)
+        self.x0 = np.array(x0, dtype=np.float64)
+        self.bounds = bounds
+        self.integrality = np.array([key == "BPM" for key in self.keys])
+
+        # Only the part of the recording that any candidate can overlap
+        ranges = dict(zip(self.keys, bounds))
+        shift_min, shift_max = ranges.get("shift", (self.shift, self.shift))
+        bpm_min = ranges.get("BPM", (self.BPM, self.BPM))[0]
+        start = max(0, int(np.floor(-shift_max * self.Fs_original)))
+        stop = min(len(y), int(np.ceil((self.n * 60/bpm_min - shift_min) * self.Fs_original)) + 1)
+        self.window = max(1, round(envelope_window * self.Fs_original))
+        # The envelopes are smooth, so they are compared every quarter window
+        self.step = max(1, self.window // 4)
+        self.times = np.arange(start, stop, self.step) / self.Fs_original
+        self.envelope = self._moving_average(np.abs(np.asarray(y[start:stop], dtype=np.float64))[None,:])[0,::self.step]
+
+        # Magnitude spectrum of the recording, averaged over windows of 1/resolution seconds
+        self.n_fft = round(self.Fs_original / resolution)
+        _, P = welch(y, self.Fs_original, window="hann", nperseg=self.n_fft)
+        self.spectrum = np.sqrt(P) / np.max(np.sqrt(P))
+        # Power spectrum of the window on the zero padded grid, only its main lobe and first side lobes
+        K = np.abs(np.fft.fft(get_window("hann", self.n_fft), self.n_fft * ZERO_PADDING))**2
+        half = KERNEL_WIDTH * ZERO_PADDING
+        self.kernel = np.concatenate((K[-half:], K[:half + 1]))
+        self.kernel /= np.sum(self.kernel)
+
+    def _parameter_keys(self, parameters: list[str]|None) -> list[str]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            parameters (list[str] | None): The free parameters, see __init__.
+
+        Raises:
+            ValueError: If a parameter does not exist.
+
+        Returns:
+            list[str]: The keys "BPM", "shift" and "<valve>.<parameter>" of the free parameters.
+        """
+        names = [str(name) for name in self.bank.names]
+        if parameters is None:
+            parameters = ["BPM", "shift"] + [f"{name}.{parameter}" for name in names for parameter in VALVE_PARAMETERS
+                                             if self.bank.data[parameter][names.index(name)] != 0]
+        keys = []
+        for parameter in parameters:
+            if parameter in ("BPM", "shift"):
+                keys.append(parameter)
+            elif parameter in VALVE_PARAMETERS:
+                keys.extend(f"{name}.{parameter}" for name in names)
+            elif "." in parameter and parameter.split(".")[0] in names and parameter.split(".")[1] in VALVE_PARAMETERS:
+                keys.append(parameter)
+            else:
+                raise ValueError(f"Unknown parameter {parameter}, expected BPM, shift, one of {VALVE_PARAMETERS} or <valve>.<parameter> with a valve in {names}")
+        return keys
+
+    def evaluate(self, X: np.ndarray) -> np.ndarray|float:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The misfit of a batch of candidates.
+
+        Args:
+            X (np.ndarray): The values of the free parameters, with shape (parameters,) or (parameters, candidates).
+
+        Returns:
+            np.ndarray | float: The misfit of every candidate.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        single = X.ndim == 1
+        X = X.reshape(len(self.free), -1)
+        S = X.shape[1]
+
+        data = np.repeat(self.bank.data[None,:], S, axis=0)
+        BPM = np.full(S, float(self.BPM))
+        shift = np.full(S, float(self.shift))
+        for (index, name), values in zip(self.free, X):
+            if name == "BPM":
+                BPM = np.round(values)
+            elif name == "shift":
+                shift = values
+            else:
+                data[name][:,index] = values
+
+        h = fftconvolve(ValveBank(data).synthesize_variants(self.Fs), self.g[None,:], axes=1)[:,::self.decimation]
+        loss = self.time_weight * self._time_misfit(h, BPM, shift) + self.freq_weight * self._freq_misfit(h)
+        return float(loss[0]) if single else loss
+
+    def loss(self, x: np.ndarray|None = None) -> float:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            x (np.ndarray | None, optional): The values of the free parameters. If None, the start values. Defaults to None.
+
+        Returns:
+            float: The misfit.
+        """
+        return self.evaluate(self.x0 if x is None else x)
+
+    def fit(self, max_time: float|None = None, maxiter: int = 200, popsize: int = 8, seed: int|None = None, workers: int = 1,
+            log: bool = True) -> FitResult:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Search the parameters with the lowest misfit. The start values are part of the first generation, so the result is never worse.
+
+        Args:
+            max_time (float | None, optional): Stop after the generation that exceeds this duration (s). If None, only maxiter limits the fit. Defaults to None.
+            maxiter (int, optional): The maximum amount of generations. Defaults to 200.
+            popsize (int, optional): The amount of candidates per generation, per free parameter. Defaults to 8.
+            seed (int | None, optional): The seed of the search, for reproducible fits. Defaults to None.
+            workers (int, optional): The amount of processes to evaluate a generation in, -1 for all cores. Defaults to 1.
+            log (bool, optional): Whether to log the progress in the console. Defaults to True.
+
+        Returns:
+            FitResult: The fitted parameters, apply them with FitResult.apply.
+        """
+        start = perf_counter()
+        initial_loss = self.loss()
+        workers = cpu_count() if workers == -1 else workers
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) if workers > 1 else None
+        # nfev of the result counts the generations when vectorized, so the candidates are counted here
+        evaluations = 0
+
+        def objective(X: np.ndarray) -> np.ndarray:
+            nonlocal evaluations
+            evaluations += 1 if X.ndim == 1 else X.shape[1]
+            if pool is None or X.ndim == 1:
+                return self.evaluate(X)
+            return np.concatenate(list(pool.map(_evaluate_in_worker, np.array_split(X, workers, axis=1))))
+
+        def callback(intermediate_result) -> bool:
+            if log:
+                print(f"Fit: loss {intermediate_result.fun:.4f} after {perf_counter() - start:.1f}s")
+            return max_time is not None and perf_counter() - start > max_time
+
+        try:
+            result = differential_evolution(objective, self.bounds, x0=self.x0, integrality=self.integrality, maxiter=maxiter,
+                                            popsize=popsize, seed=seed, vectorized=True, updating="deferred", polish=False,
+                                            callback=callback, init="sobol" if len(self.x0) > 1 else "latinhypercube")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        # The start values are only kept when nothing was better
+        x, loss = (result.x, float(result.fun)) if result.fun <= initial_loss else (self.x0, initial_loss)
+        fit_result = FitResult(dict(zip(self.keys, map(float, x))), loss, initial_loss, evaluations, result.nit, perf_counter() - start)
+        if log:
+            print(fit_result.summary())
+        return fit_result
+
+    def _time_misfit(self, h: np.ndarray, BPM: np.ndarray, shift: np.ndarray) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            h (np.ndarray): The filtered beat of every candidate at the rate of the recording, with shape (candidates, samples).
+            BPM (np.ndarray): The BPM of every candidate.
+            shift (np.ndarray): The shift of every candidate (s).
+
+        Returns:
+            np.ndarray: The relative squared error of the envelopes, where the n beats of the model overlap the recording.
+        """
+        W = h.shape[1]
+        envelope = self._moving_average(np.abs(h))
+        L = (60/BPM*self.Fs).astype(np.int64)[:,None]
+        # The sample of the model at the time of every compared sample of the recording, see Plot
+        k = np.round((shift[:,None] + self.times[None,:]) * self.Fs).astype(np.int64)
+        beat, within = np.divmod(k, L)
+        overlap = (k >= 0) & (beat < self.n)
+
+        # Sum the envelopes of the beats that are still sounding, the model repeats the beat every L samples
+        y = np.zeros(k.shape)
+        for m in range(int(np.ceil(W * self.decimation / np.min(L)))):
+            index = (within + m * L) // self.decimation
+            valid = overlap & (beat >= m) & (index < W)
+            y += np.where(valid, np.take_along_axis(envelope, np.minimum(index, W - 1), axis=1), 0)
+
+        error = np.sum(overlap * (y - self.envelope)**2, axis=1)
+        reference = np.sum(overlap * self.envelope**2, axis=1)
+        enough = np.sum(overlap, axis=1) * self.step * self.decimation >= L[:,0]
+        return np.where(enough, error / np.maximum(reference, 1e-12), NO_OVERLAP_LOSS)
+
+    def _freq_misfit(self, h: np.ndarray) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            h (np.ndarray): The filtered beat of every candidate at the rate of the recording, with shape (candidates, samples).
+
+        Returns:
+            np.ndarray: The relative squared error of the normalized magnitude spectra of the beat and the recording.
+        """
+        # Zero pad to a multiple of n_fft, so every m-th bin is a frequency of the spectrum of the recording
+        if h.shape[1] > self.n_fft * ZERO_PADDING:
+            raise ValueError(f"One beat ({h.shape[1]} samples) is longer than the window of the spectrum ({self.n_fft * ZERO_PADDING} samples), lower the resolution")
+        P = np.abs(rfft(h, self.n_fft * ZERO_PADDING, axis=1))**2
+        # The power spectrum is symmetric around 0 and the Nyquist frequency
+        half = len(self.kernel) // 2
+        P = fftconvolve(np.pad(P, ((0, 0), (half, half)), mode="reflect"), self.kernel[None,:], mode="valid", axes=1)
+        H = np.sqrt(np.maximum(P[:,::ZERO_PADDING], 0))
+        H /= np.maximum(np.max(H, axis=1, keepdims=True), 1e-300)
+        return np.sum((H - self.spectrum)**2, axis=1) / np.sum(self.spectrum**2)
+
+    def _moving_average(self, x: np.ndarray) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            x (np.ndarray): The signals, with shape (signals, samples).
+
+        Returns:
+            np.ndarray: The centered moving average over the envelope window of every signal.
+        """
+        c = np.cumsum(np.pad(x, ((0, 0), (self.window//2 + 1, self.window - self.window//2 - 1)), mode="edge"), axis=1)
+        return (c[:,self.window:] - c[:,:-self.window]) / self.window
+
+_worker_fitter: ModelFitter|None = None
+
+def _init_worker(fitter: ModelFitter):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Keep the fitter in the worker process, so only the candidates have to be sent per generation.
+
+    Args:
+        fitter (ModelFitter): The fitter.
+    """
+    global _worker_fitter
+    _worker_fitter = fitter
+
+def _evaluate_in_worker(X: np.ndarray) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        X (np.ndarray): A part of the candidates of a generation, see ModelFitter.evaluate.
+
+    Returns:
+        np.ndarray: The misfit of every candidate.
+    """
+    return _worker_fitter.evaluate(X)
+
+def fit_recording(file_path: str|Path, config: ConfigParser, warm_start: str|Path|None = None, output: str|Path|None = None,
+                  parameters: list[str]|None = None, max_time: float|None = None, maxiter: int = 200, seed: int|None = None,
+                  workers: int = 1, log: bool = True) -> FitResult:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Fit the model to a recording without the TUI.
+
+    Args:
+        file_path (str | Path): The path to the recording.
+        config (ConfigParser): The config object.
+        warm_start (str | Path | None, optional): A csv exported by the TUI (export_csv) to start from. If None, the default model. Defaults to None.
+        output (str | Path | None, optional): Where to write the fitted parameters as a csv that the TUI can import. Defaults to None.
+        parameters (list[str] | None, optional): The free parameters, see ModelFitter. Defaults to None.
+        max_time (float | None, optional): The maximum duration of the fit (s). Defaults to None.
+        maxiter (int, optional): The maximum amount of generations. Defaults to 200.
+        seed (int | None, optional): The seed of the search. Defaults to None.
+        workers (int, optional): The amount of processes, -1 for all cores. Defaults to 1.
+        log (bool, optional): Whether to log the progress in the console. Defaults to True.
+
+    Returns:
+        FitResult: The fitted parameters.
+    """
+    model = Model(config)
+    original_sound = OriginalSound(file_path, config)
+    if warm_start is not None:
+        model.import_csv(warm_start)
+        original_sound.import_csv(warm_start)
+
+    result = ModelFitter(model, original_sound, parameters).fit(max_time=max_time, maxiter=maxiter, seed=seed, workers=workers, log=log)
+    result.apply(model, original_sound)
+
+    if output is not None:
+        ensure_path_exists(output)
+        with open(output, "w") as f:
+            f.write(original_sound.generate_csv() + "\n" + model.generate_csv())
+    return result
@@ -16,6 +16,7 @@ def generateStandardCommands(plot: Plot) -> CommandProcessor:
     cp.register_command("order", plot.print_order, helpmsg="Print the standard order of the valves")
     cp.register_command("play", plot.play_audio, args=["duration"], helpmsg="Play the sound for <duration> seconds")
     cp.register_command("stop_audio", plot.stop_audio, helpmsg="Stop the playing sound")
+    cp.register_command("fit", plot.fit, args=["seconds"], helpmsg="Fit the BPM, shift and valves to the real data for at most <seconds> seconds")
     # cp.register_command("add", plot.add_valve, args=["name"], helpmsg="Add another valve noise to the model")
     
     # Add refresh handlers for graph
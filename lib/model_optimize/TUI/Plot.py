@@ -8,6 +8,7 @@ from math import ceil
 from lib.config.ConfigParser import ConfigParser
 from lib.model.Model import Model
 from lib.model.OriginalSound import OriginalSound
+from lib.model_optimize.ModelFitter import ModelFitter
 from lib.os.pathUtils import *
 from lib.model.generate import *
 
@@ -159,6 +160,30 @@ class Plot:
         self.update_model(refresh_view=False)
         self.update_original()
         
+    def fit(self, seconds: str = ""):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Fit the BPM, the shift and the valve parameters to the recording, starting from the current values.
+
+        Args:
+            seconds (str, optional): The maximum duration of the fit in seconds. If empty, the fit runs until it converges. Defaults to "".
+        """
+        max_time = None
+        if len(seconds) > 0:
+            try:
+                max_time = float(seconds)
+            except (ValueError, TypeError):
+                print("Seconds should be a float")
+                return
+        
+        result = ModelFitter(self.model, self.original_sound).fit(max_time=max_time, log=self.log_enabled)
+        result.apply(self.model, self.original_sound)
+        
+        self.update_model(refresh_view=False)
+        self.update_original()
+        
     def print(self):
         """
         @author: Gerrald
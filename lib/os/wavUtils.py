@@ -0,0 +1,245 @@
+from pathlib import Path
+from typing import Iterator
+from scipy.io import wavfile
+import json
+import struct
+import numpy as np
+
+def write_wav(file_path: str|Path, Fs: int, data: np.ndarray, metadata: dict|None = None):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Write all channels to one interleaved wav file in one write, with optional metadata.
+
+    The metadata is stored as JSON in the comment (ICMT) of a LIST/INFO chunk after the samples.
+    Readers that do not know the chunk skip it, so the file can still be memory mapped, see MappedWav.
+
+    Args:
+        file_path (str | Path): The path to the wav file.
+        Fs (int): The sample rate.
+        data (np.ndarray): The samples, with shape (samples,) or (samples, channels).
+        metadata (dict | None, optional): JSON serializable metadata, e.g. the positions of the microphones. Defaults to None.
+    """
+    with open(file_path, "wb") as f:
+        wavfile.write(f, Fs, data)
+        if metadata is None:
+            return
+        comment = json.dumps(metadata).encode("ascii") + b"\0"
+        # Chunks are word aligned
+        comment += b"\0" * (len(comment) % 2)
+        info = b"INFO" + b"ICMT" + struct.pack("<I", len(comment)) + comment
+        # wavfile.write leaves the file at the start of the header
+        f.seek(0, 2)
+        f.write(b"LIST" + struct.pack("<I", len(info)) + info)
+        # Correct the size of the RIFF chunk in the header
+        size = f.tell()
+        f.seek(4)
+        f.write(struct.pack("<I", size - 8))
+
+def read_wav_metadata(file_path: str|Path) -> dict|None:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Read the metadata written by write_wav. Only the chunk headers are read, the samples are skipped.
+
+    Args:
+        file_path (str | Path): The path to the wav file.
+
+    Returns:
+        dict | None: The metadata, or None if the file has none.
+    """
+    with open(file_path, "rb") as f:
+        if f.read(12)[:4] != b"RIFF":
+            return None
+        while len(header := f.read(8)) == 8:
+            chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+            if chunk_id != b"LIST":
+                f.seek(size + size % 2, 1)
+                continue
+            chunk = f.read(size)
+            if chunk[:4] != b"INFO":
+                continue
+            position = 4
+            while position + 8 <= len(chunk):
+                sub_id, sub_size = chunk[position:position + 4], struct.unpack("<I", chunk[position + 4:position + 8])[0]
+                if sub_id == b"ICMT":
+                    try:
+                        return json.loads(chunk[position + 8:position + 8 + sub_size].rstrip(b"\0"))
+                    except ValueError:
+                        # A comment written by another program
+                        return None
+                position += 8 + sub_size + sub_size % 2
+    return None
+
+class MappedWav:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Memory mapped wav file.
+
+    The samples are not read into memory, only the parts that are used are loaded by the operating system.
+    Channels are returned as views on the file and the conversion to float is done per block,
+    so recordings that do not fit in memory can still be processed.
+    """
+    def __init__(self, file_path: str|Path):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Map a wav file. Formats that can not be memory mapped (e.g. 24 bit) are read into memory instead.
+
+        Args:
+            file_path (str | Path): The path to the wav file.
+
+        Raises:
+            IOError: If the file does not exist.
+        """
+        self.file_path = Path(file_path)
+        if not self.file_path.exists():
+            raise IOError(f"{file_path} not found")
+
+        try:
+            self.Fs, self.data = wavfile.read(self.file_path, mmap=True)
+            self.mapped = True
+        except ValueError:
+            self.Fs, self.data = wavfile.read(self.file_path)
+            self.mapped = False
+        self._metadata = None
+
+    @property
+    def metadata(self) -> dict|None:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            dict | None: The metadata written by write_wav, or None if the file has none.
+        """
+        if self._metadata is None:
+            self._metadata = read_wav_metadata(self.file_path)
+        return self._metadata
+
+    def __len__(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        return len(self.data)
+
+    @property
+    def channels(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            int: The amount of channels.
+        """
+        return 1 if self.data.ndim == 1 else self.data.shape[1]
+
+    @property
+    def duration(self) -> float:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            float: The duration of the recording (s).
+        """
+        return len(self) / self.Fs
+
+    @property
+    def full_scale(self) -> float:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The value that corresponds to an amplitude of 1, as used by soundfile.
+
+        Returns:
+            float: The full scale of the sample type.
+        """
+        if np.issubdtype(self.data.dtype, np.integer):
+            return float(2**(8 * self.data.dtype.itemsize - 1))
+        return 1.0
+
+    def channel(self, channel: int) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            channel (int): The index of the channel.
+
+        Returns:
+            np.ndarray: A view on the raw samples of the channel, nothing is copied.
+        """
+        if self.data.ndim == 1:
+            if channel != 0:
+                raise IndexError(f"{self.file_path} has only one channel")
+            return self.data
+        return self.data[:,channel]
+
+    def channel_views(self) -> list[np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            list[np.ndarray]: Views on the raw samples of every channel.
+        """
+        return [self.channel(i) for i in range(self.channels)]
+
+    def to_float(self, x: np.ndarray) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Convert raw samples of this file to floats between -1 and 1, like soundfile.read.
+
+        Args:
+            x (np.ndarray): The raw samples.
+
+        Returns:
+            np.ndarray: The samples as float64.
+        """
+        if self.data.dtype == np.uint8:
+            # 8 bit wav files are unsigned
+            return (np.asarray(x, dtype=np.float64) - 128) / 128
+        return np.asarray(x, dtype=np.float64) / self.full_scale
+
+    def read_float(self, start: int = 0, stop: int|None = None, channel: int|None = None) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            start (int, optional): The first sample. Defaults to 0.
+            stop (int | None, optional): The sample after the last sample. If None, read till the end. Defaults to None.
+            channel (int | None, optional): The channel. If None, all channels are returned. Defaults to None.
+
+        Returns:
+            np.ndarray: The samples between start and stop as floats between -1 and 1.
+        """
+        data = self.data if channel is None else self.channel(channel)
+        return self.to_float(data[start:stop])
+
+    def float_blocks(self, block_size: int, channel: int|None = None) -> Iterator[np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Iterate over the recording, converting one block at a time to float.
+
+        Args:
+            block_size (int): The amount of samples per block.
+            channel (int | None, optional): The channel. If None, all channels are returned. Defaults to None.
+
+        Yields:
+            np.ndarray: The next block as floats between -1 and 1.
+        """
+        for start in range(0, len(self), block_size):
+            yield self.read_float(start, start + block_size, channel)
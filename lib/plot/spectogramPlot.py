@@ -1,8 +1,8 @@
 import numpy as np
 from matplotlib.image import AxesImage
 from matplotlib import axes
-from scipy.signal import ShortTimeFFT, spectrogram
-from scipy.signal.windows import gaussian
+
+from lib.processing.stft import MultichannelSTFT
 
 def spectogramPlot(x: list|np.ndarray, Fs: int, plot: axes.Axes, title:str=None):
     """
@@ -21,14 +21,11 @@ def spectogramPlot(x: list|np.ndarray, Fs: int, plot: axes.Axes, title:str=None)
 
     N = len(x)
     win = ('gaussian', 1e-2 * Fs) # Gaussian with 0.01 s standard dev.
-    SFT = ShortTimeFFT.from_window(win, Fs, nperseg=256, noverlap=125,
-        fft_mode='centered', scale_to='psd', phase_shift=None)
-    Sx2 = SFT.spectrogram(x)
-    t_lo, t_hi = SFT.extent(N)[:2] # time range of plot
-    t = np.linspace(t_lo, t_hi, len(x))
-    f = np.linspace(-Fs/2, Fs/2, len(Sx2))
+    # Only the positive frequencies are shown, so the one-sided STFT is enough
+    SFT = MultichannelSTFT.from_window(win, Fs, nperseg=256, noverlap=125,
+        scale_to='psd', phase_shift=None)
+    Sx2 = SFT.spectrogram(np.asarray(x))
 
-    
     Sx_dB = 10 * np.log10(np.fmax(Sx2, 1e-4))
     plot.imshow(Sx_dB, origin='lower', aspect='auto', extent=SFT.extent(N))
     plot.set_ylim(0, Fs/2)
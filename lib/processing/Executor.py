@@ -1,9 +1,129 @@
 from pathlib import Path
-import numpy as np
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from tempfile import TemporaryDirectory
+import numpy as np
 
 from lib.config.ConfigParser import ConfigParser
 from lib.processing.Processor import Processor
+from lib.processing.dataprocessing import threshold_domains, domains_with_peaks, SegmentBuffers
+
+# The segments of every file written by a worker process are cut into the same buffers
+segment_buffers = SegmentBuffers()
+
+class ProcessorResult:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The compact result of a Processor run, without the full rate intermediate signals, so that it can be returned cheaply by a worker process.
+
+    Besides the peaks, all domains of the envelope above the threshold are kept, so the file can be segmented again with other peaks.
+    If the segments will be written, the normalized signal is saved to a file and only its path and the filters are kept,
+    so the file does not have to be filtered again.
+    """
+    def __init__(self, processor: Processor, signal_folder: str|None = None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            processor (Processor): A processor that has run.
+            signal_folder (str | None, optional): The folder to save the signals that are needed to cut and write the segments in.
+                If None, the signals are not saved. Defaults to None.
+        """
+        self.file_path = processor.file_path
+        self.peaks = processor.peaks
+        self.s1_peaks = processor.s1_peaks
+        self.s2_peaks = processor.s2_peaks
+        self.uncertain = processor.uncertain
+        self.y_line = processor.y_line
+        self.actual_segmentation_min_height = processor.actual_segmentation_min_height
+        self.threshold_failure = processor.threshold_failure
+        self.attention_segments = {}
+
+        self.y_normalized_path = None
+        self.see_normalized_path = None
+        self.g = None
+        self.see_filter = None
+        self.M = None
+        self.up = None
+        if signal_folder is not None:
+            file_name = Path(processor.file_path).stem
+            self.y_normalized_path = str(Path(signal_folder) / f"{file_name}-y_normalized.npy")
+            np.save(self.y_normalized_path, processor.y_normalized)
+            # The envelope is only needed for the diagnostic of a failed threshold search
+            if processor.threshold_failure is not None:
+                self.see_normalized_path = str(Path(signal_folder) / f"{file_name}-see_normalized.npy")
+                np.save(self.see_normalized_path, processor.see_normalized)
+            self.g = processor.g
+            self.see_filter = processor.see_filter
+            self.M = processor.M
+            self.up = processor.up
+
+        self.domains = threshold_domains(processor.see_normalized, processor.segmentation_threshold)
+        self.segment()
+
+    def segment(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Select the domains of the S1 and S2 peaks, like Processor.segment.
+        """
+        self.s1_peaks = self.s1_peaks[self.s1_peaks[:,0].argsort()]
+        self.s2_peaks = self.s2_peaks[self.s2_peaks[:,0].argsort()]
+        self.ind_s1 = domains_with_peaks(self.domains, self.s1_peaks[:,0])
+        self.ind_s2 = domains_with_peaks(self.domains, self.s2_peaks[:,0])
+
+def process_file(file: Path, config: ConfigParser, signal_folder: str|None = None) -> ProcessorResult:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Run the Processor on one file, in a worker process.
+
+    Args:
+        file (Path): The path to the wav file.
+        config (ConfigParser): The config object.
+        signal_folder (str | None, optional): The folder to save the signals to write the segments with in, see ProcessorResult. Defaults to None.
+
+    Returns:
+        ProcessorResult: The compact result.
+    """
+    processor = Processor(None, config, log=False)
+    processor.open_file(file)
+    processor.run(write_enabled=False)
+    return ProcessorResult(processor, signal_folder)
+
+def write_file(file: Path, config: ConfigParser, result: ProcessorResult):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Write the segments of the domains in a result of one file, in a worker process.
+    The raw signal and the saved processed signal are memory mapped, the filters are taken from the result.
+
+    Args:
+        file (Path): The path to the wav file.
+        config (ConfigParser): The config object.
+        result (ProcessorResult): The result of the file with the signals saved, and the domains to write.
+    """
+    processor = Processor(None, config, log=False)
+    processor.open_file(file)
+    processor.load()
+    processor.y_normalized = np.load(result.y_normalized_path, mmap_mode="r")
+    if result.see_normalized_path is not None:
+        processor.see_normalized = np.load(result.see_normalized_path, mmap_mode="r")
+    processor.g = result.g
+    processor.see_filter = result.see_filter
+    processor.M = result.M
+    processor.up = result.up
+    processor.ind_s1 = result.ind_s1
+    processor.ind_s2 = result.ind_s2
+    processor.threshold_failure = result.threshold_failure
+    processor.cut_segments(segment_buffers)
+    processor.write()
 
 class Executor:
     """
@@ -29,12 +149,32 @@ class Executor:
         self.config = config
         self.log_enabled = log
         self.results = {}
+        self.failures = {}
         
-    def execute(self, write_enabled: bool = True):
+    def execute(self, write_enabled: bool = True, parallel: bool = False, max_workers: int|None = None):
         """
         @author: Gerrald
-        @date: 17-12-2025
+        @date: 18-10-2026
+
+        Process all files, segment them with the peaks of a file without uncertains and write the results.
+
+        Args:
+            write_enabled (bool, optional): Whether to write the segmentation results. Defaults to True.
+            parallel (bool, optional): Whether to process the files in a process pool. The results are then ProcessorResults instead of Processors. Defaults to False.
+            max_workers (int | None, optional): The amount of worker processes. If None, the amount of cores is used. Defaults to None.
         """
+        if parallel:
+            # The workers hand the signals to write the segments with to each other through files
+            signal_folder = TemporaryDirectory(prefix="executor-", ignore_cleanup_errors=True) if write_enabled else None
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                    self.process_parallel(pool, None if signal_folder is None else signal_folder.name)
+                    self.segment_all(write_enabled, pool)
+            finally:
+                if signal_folder is not None:
+                    signal_folder.cleanup()
+            return
+        
         for file in self.files:
             self.log(f"Processing {file.stem}")
             processor = Processor(None, self.config, log=self.log_enabled)
@@ -45,7 +185,45 @@ class Executor:
                 self.results[file] = [len(processor.s1_peaks), len(processor.s2_peaks), len(processor.uncertain), processor]
             except Exception as e:
                 self.log(f"{file} failed, Error: {e}")
-                
+                self.failures[file] = f"{type(e).__name__}: {e}"
+        
+        self.segment_all(write_enabled)
+        
+    def process_parallel(self, pool: ProcessPoolExecutor, signal_folder: str|None = None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Process all files in the pool. The results are stored in the order of the files, the failures per file.
+
+        Args:
+            pool (ProcessPoolExecutor): The pool to run in.
+            signal_folder (str | None, optional): The folder the workers save the signals to write the segments with in. If None, they are not saved. Defaults to None.
+        """
+        futures = {pool.submit(process_file, file, self.config, signal_folder): file for file in self.files}
+        results = {}
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                result = future.result()
+                results[file] = [len(result.s1_peaks), len(result.s2_peaks), len(result.uncertain), result]
+                self.log(f"Processed {file.stem}")
+            except Exception as e:
+                self.log(f"{file} failed, Error: {e}")
+                self.failures[file] = f"{type(e).__name__}: {e}"
+        self.results = {file: results[file] for file in self.files if file in results}
+        
+    def segment_all(self, write_enabled: bool, pool: ProcessPoolExecutor|None = None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Segment all files again with the peaks of the file without uncertains and write them.
+
+        Args:
+            write_enabled (bool): Whether to write the segmentation results.
+            pool (ProcessPoolExecutor | None, optional): The pool to write in. If None, the processors in the results write themselves. Defaults to None.
+        """
         uncertain_zero = [
             [file, value[0], value[1]]
             for file, value in self.results.items()
@@ -66,8 +244,9 @@ class Executor:
         used_peaks_s1 = p.s1_peaks
         used_peaks_s2 = p.s2_peaks
         
+        writes = {}
         for file, value in self.results.items():
-            processor: Processor = value[3]
+            processor: Processor|ProcessorResult = value[3]
             
             processor.segment()
             
@@ -89,8 +268,18 @@ class Executor:
             processor.attention_segments["s1_removed"] = s1_before.difference(s1_after)
             processor.attention_segments["s2_removed"] = s2_before.difference(s2_after)
             
-            if write_enabled:
+            if write_enabled and pool is not None:
+                writes[pool.submit(write_file, file, self.config, processor)] = file
+            elif write_enabled:
                 processor.write()
+        
+        for future in as_completed(writes):
+            try:
+                future.result()
+            except Exception as e:
+                file = writes[future]
+                self.log(f"Writing {file} failed, Error: {e}")
+                self.failures[file] = f"{type(e).__name__}: {e}"
             
         self.log("Finished!")
         
@@ -101,7 +290,9 @@ class Executor:
         """
         print(f"Finished with the following results:")
         for file, r in self.results.items():
-            print(f"{file.stem}: s1: {r[0]};  s2: {r[1]}; u: {r[2]}; tot: {sum(r)}")
+            print(f"{file.stem}: s1: {r[0]};  s2: {r[1]}; u: {r[2]}; tot: {sum(r[:3])}")
+        for file, error in self.failures.items():
+            print(f"{file.stem}: failed, {error}")
     def log(self, msg):
         """
         @author: Gerrald
@@ -1,11 +1,14 @@
-from scipy.io import wavfile
 from pathlib import Path
 from scipy.io.wavfile import write
 from os.path import join, basename, splitext
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from lib.processing.functions import *
 from lib.processing.dataprocessing import *
+from lib.processing.resampling import bandpass_downsample
+from lib.processing.kernels import configure_kernel_cache
+from lib.processing.signalcache import signal_cache, configure_signal_cache
 from lib.os.pathUtils import ensure_path_exists
+from lib.os.wavUtils import MappedWav
 from lib.config.ConfigParser import ConfigParser
 
 class Classification(Enum):
@@ -28,7 +31,7 @@ class Processor:
     This class allows to easily reuse code across the whole codebase and optionally save results for plotting them.
     
     """
-    def __init__(self, file_path: str, config: ConfigParser, subfolder: str = "", log: bool=True, write_result_processed: bool = True, write_result_raw: bool = True, postprocessing: bool = True):
+    def __init__(self, file_path: str, config: ConfigParser, subfolder: str = "", log: bool=True, write_result_processed: bool = True, write_result_raw: bool = True, postprocessing: bool = True, polyphase: bool = False):
         """
         @author: Gerrald
         @date: 10-12-2025
@@ -40,6 +43,8 @@ class Processor:
             config (ConfigParser): The config object.
             save_results (bool, optional): Whether to save the substeps. Defaults to False.
             log (bool, optional): Whether to log its process in the console. Defaults to True.
+            polyphase (bool, optional): Whether to filter and downsample in one polyphase step, which only computes the kept samples
+                and also supports sampling frequencies that are not a multiple of FsTarget. Defaults to False.
         
         """
         if file_path is not None and not Path(file_path).exists():
@@ -69,17 +74,23 @@ class Processor:
         self.max_uncertain_count_per_min = config.Segmentation.MaxUncertainCountPerMin
         self.max_comp_height = config.Segmentation.MaxCompHeight
         self.max_comp_iter = config.Segmentation.MaxCompIter
+        self.diagnostics_path = config.Segmentation.DiagnosticsPath
+        configure_kernel_cache(config)
+        configure_signal_cache(config)
         
         self.write_result_processed = write_result_processed
         self.write_result_raw = write_result_raw
         self.log_enabled = log
         self.postprocessing = postprocessing
+        self.polyphase = polyphase
         # Initialize fields that values can be saved to
+        self.wav = None
         self.Fs_original = None
         self.x = None
         self.g = None
         self.y = None
         self.M = None
+        self.up = None
         self.y_downsampled = None
         self.y_normalized = None
         self.y_energy = None
@@ -97,6 +108,7 @@ class Processor:
         self.ind_s1 = None
         self.ind_s2 = None
         self.actual_segmentation_min_height = None
+        self.threshold_failure = None
         self.segmented_s1 = None
         self.segmented_s2 = None
         self.segmented_s1_raw = None
@@ -132,15 +144,23 @@ class Processor:
         self.log(f"Results:\n  - S1 count: {len(self.s1_peaks)}\n  - S2 count: {len(self.s2_peaks)}\n  - Uncertain: {len(self.uncertain)}")
         
             
-    def load(self):
+    def load(self, wav: MappedWav|None = None):
         """
         @author: Gerrald
-        @date: 10-12-2025
+        @date: 18-10-2026
+
+        Memory map the wav file, x is a view on the file.
+
+        Args:
+            wav (MappedWav | None, optional): An already mapped file to use. If None, file_path is mapped. Defaults to None.
         """
-        if self.file_path is None:
-            raise RuntimeError("Filepath is None")
-        self.log("Reading file...")
-        self.Fs_original, self.x = wavfile.read(self.file_path)
+        if wav is None:
+            if self.file_path is None:
+                raise RuntimeError("Filepath is None")
+            self.log("Mapping file...")
+            wav = MappedWav(self.file_path)
+        self.wav = wav
+        self.Fs_original, self.x = wav.Fs, wav.data
 
     def preprocess(self):
         """
@@ -150,14 +170,23 @@ class Processor:
         if self.x is None or self.Fs_original is None:
             self.load()
         
-        self.log("Constructing bandpass filter...")
-        self.g = construct_bandpass_filter(self.lp_low_freq, self.lp_high_freq, self.Fs_original, order=self.lp_filter_order, size=self.lp_filter_size)
-        
-        self.log("Filtering input signal...")
-        self.y = apply_filter(self.x, self.g)
-        
-        self.log("Downsampling signal...")
-        self.y_downsampled, self.M = downsample(self.y, self.Fs_original, self.Fs_target)
+        if self.polyphase:
+            self.log("Filtering and downsampling signal...")
+            self.y_downsampled, self.g, self.up, down = bandpass_downsample(self.x, self.lp_low_freq, self.lp_high_freq, self.Fs_original, self.Fs_target, 
+                                                                            order=self.lp_filter_order, size=self.lp_filter_size)
+            # The full rate filtered signal is never computed
+            self.y = None
+            self.M = down if self.up == 1 else down / self.up
+        else:
+            self.log("Constructing bandpass filter...")
+            self.g = construct_bandpass_filter(self.lp_low_freq, self.lp_high_freq, self.Fs_original, order=self.lp_filter_order, size=self.lp_filter_size)
+            
+            self.log("Filtering input signal...")
+            self.y = self.filter_cached("filtered", self.x, self.g, self.filter_params())
+            
+            self.log("Downsampling signal...")
+            self.y_downsampled, self.M = downsample(self.y, self.Fs_original, self.Fs_target)
+            self.up = 1
         
         self.log("Normalizing signal...")
         self.y_normalized = normalize(self.y_downsampled)
@@ -176,13 +205,69 @@ class Processor:
         self.see_filter = construct_lowpass_filter(self.energy_cutoff_freq, self.Fs_target, self.energy_filter_order, self.energy_filter_size)
         
         self.log("Creating Shannon Energy Envelope...")
-        self.see = apply_filter(self.y_energy, self.see_filter)
+        self.see = self.filter_cached("envelope", self.y_energy, self.see_filter, self.filter_params() + self.envelope_params())
         
         self.log("Normalizing Shannon Energy Envelope...")
         self.see_normalized = normalize(self.see, mode="stdev")
         
         self.log("Getting peaks of Shannon Energy Envelope...")
-        self.peaks, _ = get_peaks(self.see_normalized, self.segmentation_min_height, self.segmentation_min_dist)
+        self.peaks = self.find_peaks(self.segmentation_min_height)
+        
+    def filter_params(self) -> tuple:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            tuple: The parameters that determine the downsampled signal, for the keys of the signal cache.
+        """
+        return (self.lp_low_freq, self.lp_high_freq, self.lp_filter_order, self.lp_filter_size, self.Fs_target, self.polyphase)
+
+    def envelope_params(self) -> tuple:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            tuple: The parameters that determine the envelope from the downsampled signal, for the keys of the signal cache.
+        """
+        return (self.energy_cutoff_freq, self.energy_filter_order, self.energy_filter_size)
+
+    def filter_cached(self, stage: str, x: np.ndarray, g: np.ndarray, params: tuple) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns apply_filter(x, g), from the signal cache if this stage was computed before for the same file and parameters.
+
+        Args:
+            stage (str): The name of the stage.
+            x (np.ndarray): The signal.
+            g (np.ndarray): The filter.
+            params (tuple): The parameters of this stage and the stages before it, see `filter_params` and `envelope_params`.
+
+        Returns:
+            np.ndarray: The filtered signal, read-only if it came from the cache.
+        """
+        if self.file_path is None:
+            return apply_filter(x, g)
+        return signal_cache.get(signal_cache.key(self.file_path, stage, params), lambda: apply_filter(x, g))
+
+    def find_peaks(self, min_height: float) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns the peaks of the normalized Shannon energy envelope.
+
+        Args:
+            min_height (float): The minimum height of a peak.
+
+        Returns:
+            np.ndarray: The indices of the peaks.
+        """
+        peaks, _ = get_peaks(self.see_normalized, min_height, self.segmentation_min_dist)
+        return peaks
         
     def classify(self):
         """
@@ -199,31 +284,12 @@ class Processor:
             # Calculating some stats so that we can adjust the global threshold
             max_uncertain_count = self.max_uncertain_count_per_min * len(self.see_normalized) / self.Fs_target / 60
             min_height = self.segmentation_min_height
-            increase = (self.max_comp_height - self.segmentation_min_height) / self.max_comp_iter
-            
-            if len(self.uncertain) > max_uncertain_count: self.log("Adjusting global threshold")
             
             # While we have too much uncertains (max count of uncertains per minute set in config), 
-            # slowly increase the global peak threshold till we meet a value that is beneath these.
-            while len(self.uncertain) > max_uncertain_count:
-                min_height += increase
-                
-                self.peaks, _ = get_peaks(self.see_normalized, min_height, self.segmentation_min_dist)
-                self.s1_peaks, self.s2_peaks, self.uncertain = self.classify_peaks(self.peaks)
-                
-                if min_height > self.max_comp_height:
-                    t = np.linspace(0, len(self.see_normalized)/self.Fs_target, len(self.see_normalized))
-                    plt.hlines(self.segmentation_min_height, xmin=0, xmax=len(self.see_normalized)/self.Fs_target, label="min")
-                    plt.hlines(self.max_comp_height, xmin=0, xmax=len(self.see_normalized)/self.Fs_target, label="max")
-                    plt.plot(t, self.see_normalized, color="orange", label="signal")
-                    plt.title(f"Did not succeed with {Path(self.file_path).parent.stem + "/" + Path(self.file_path).stem}")
-                    plt.legend()
-                    plt.show()
-                    # raise RuntimeError(f"Did not succeed to achieve max {max_uncertain_count} uncertains - achieved {len(self.uncertain)}")
-                    self.peaks, _ = get_peaks(self.see_normalized, self.segmentation_min_height, self.segmentation_min_dist)
-                    self.s1_peaks, self.s2_peaks, self.uncertain = self.classify_peaks(self.peaks)
-                    print(f"Continuing with {len(self.uncertain)} uncertains")
-                    break
+            # increase the global peak threshold till we meet a value that is beneath these.
+            if len(self.uncertain) > max_uncertain_count:
+                self.log("Adjusting global threshold")
+                min_height = self.search_min_height(max_uncertain_count)
             self.log(f"Achieved {len(self.uncertain)} uncertains")
             self.actual_segmentation_min_height = min_height
             # Do a last effort to locally increase/decrease the threshold to be more resistant against noise.
@@ -234,6 +300,86 @@ class Processor:
             self.actual_segmentation_min_height = 0
         
 
+    def search_min_height(self, max_uncertain_count: float) -> float:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Search the lowest global peak threshold on the MaxCompIter steps between MinHeight and MaxCompHeight that gives
+        at most max_uncertain_count uncertains, and classify the peaks of that threshold.
+
+        A higher threshold leaves fewer peaks and so fewer uncertains, so the steps are bisected instead of tried one by one.
+        If no threshold up to MaxCompHeight succeeds, the peaks of MinHeight are kept and the failure is saved in
+        threshold_failure, so that it is reported by `write` instead of stopping the run.
+
+        Args:
+            max_uncertain_count (float): The maximum amount of uncertains.
+
+        Returns:
+            float: The threshold, or the first step above MaxCompHeight if none succeeded.
+        """
+        increase = (self.max_comp_height - self.segmentation_min_height) / self.max_comp_iter
+        # The same steps as raising the threshold one step at a time
+        heights = [self.segmentation_min_height]
+        while heights[-1] <= self.max_comp_height and len(heights) <= self.max_comp_iter + 1:
+            heights.append(heights[-1] + increase)
+
+        uncertain_counts = {}
+        def succeeds(step: int) -> bool:
+            if step not in uncertain_counts:
+                try:
+                    _, _, uncertain = self.classify_peaks(self.find_peaks(heights[step]), save_y_line=False, save_peaks=False)
+                    uncertain_counts[step] = len(uncertain)
+                except (IndexError, RuntimeError, ValueError):
+                    # No line found between the peaks that are left, the threshold is too high
+                    uncertain_counts[step] = np.inf
+            return uncertain_counts[step] <= max_uncertain_count
+
+        # The last step is above MaxCompHeight and counts as succeeding
+        low, high = 1, len(heights) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if succeeds(middle):
+                high = middle
+            else:
+                low = middle + 1
+
+        if low < len(heights) - 1:
+            self.peaks = self.find_peaks(heights[low])
+            self.s1_peaks, self.s2_peaks, self.uncertain = self.classify_peaks(self.peaks)
+            return heights[low]
+
+        self.peaks = self.find_peaks(self.segmentation_min_height)
+        self.s1_peaks, self.s2_peaks, self.uncertain = self.classify_peaks(self.peaks)
+        self.threshold_failure = {
+            "max_uncertain_count": max_uncertain_count,
+            "uncertain_counts": {heights[step]: count for step, count in sorted(uncertain_counts.items())},
+        }
+        print(f"WARNING: Did not succeed to achieve max {max_uncertain_count:.0f} uncertains for {self.file_path}, continuing with {len(self.uncertain)} uncertains")
+        return heights[-1]
+
+    def plot_threshold_failure(self) -> Figure:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Plot the envelope with the range in which the global threshold was searched, after the search failed.
+        The figure is not attached to pyplot, so it is never shown and does not block.
+
+        Returns:
+            Figure: The figure.
+        """
+        duration = len(self.see_normalized) / self.Fs_target
+        t = np.linspace(0, duration, len(self.see_normalized))
+        fig = Figure(figsize=(12, 4))
+        ax = fig.subplots()
+        ax.hlines(self.segmentation_min_height, xmin=0, xmax=duration, label="min")
+        ax.hlines(self.max_comp_height, xmin=0, xmax=duration, label="max")
+        ax.plot(t, self.see_normalized, color="orange", label="signal")
+        ax.set_title(f"Did not succeed with {Path(self.file_path).parent.stem + "/" + Path(self.file_path).stem}")
+        ax.legend()
+        return fig
+
     def segment(self):
         """
         @author: Gerrald
@@ -247,13 +393,48 @@ class Processor:
         
         self.ind_s1 = detect_peak_domains(self.s1_peaks, self.see_normalized, self.segmentation_threshold)
         self.ind_s2 = detect_peak_domains(self.s2_peaks, self.see_normalized, self.segmentation_threshold)
+        self.cut_segments()
+        
+    def cut_segments(self, buffers: SegmentBuffers|None = None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Cut the domains in ind_s1 and ind_s2 out of the processed and the raw signal.
+
+        Args:
+            buffers (SegmentBuffers | None, optional): Buffers to cut the segments into, e.g. the buffers of the previous file.
+                If None, new arrays are made. Defaults to None.
+        """
+        def out(name: str, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]|None:
+            return None if buffers is None else buffers.get(name, x)
+
         # Calculate compensation for filters
         see_filter_comp = int(len(self.see_filter)/2)
+        self.segmented_s1, self.segmented_s1_concat = segment(self.y_normalized, self.ind_s1, lambda index: (index - see_filter_comp), out("s1", self.y_normalized))
+        self.segmented_s2, self.segmented_s2_concat = segment(self.y_normalized, self.ind_s2, lambda index: (index - see_filter_comp), out("s2", self.y_normalized))
+        self.segmented_s1_raw, self.segmented_s1_raw_concat = segment(self.x, self.ind_s1, self.raw_index, out("s1_raw", self.x))
+        self.segmented_s2_raw, self.segmented_s2_raw_concat = segment(self.x, self.ind_s2, self.raw_index, out("s2_raw", self.x))
+        
+    def raw_index(self, index: int|np.ndarray) -> int|np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Convert an index of the Shannon energy envelope to the index in the raw signal, compensating the delays of both filters.
+
+        Args:
+            index (int | np.ndarray): The index or an array of indices in the Shannon energy envelope.
+
+        Returns:
+            int | np.ndarray: The index or indices in the raw signal.
+        """
+        see_filter_comp = int(len(self.see_filter)/2)
         g_filter_comp = int(len(self.g)/2)
-        self.segmented_s1, self.segmented_s1_concat = segment(self.y_normalized, self.ind_s1, lambda index: (index - see_filter_comp))
-        self.segmented_s2, self.segmented_s2_concat = segment(self.y_normalized, self.ind_s2, lambda index: (index - see_filter_comp))
-        self.segmented_s1_raw, self.segmented_s1_raw_concat = segment(self.x, self.ind_s1, lambda index: (index - see_filter_comp) * self.M - g_filter_comp)
-        self.segmented_s2_raw, self.segmented_s2_raw_concat = segment(self.x, self.ind_s2, lambda index: (index - see_filter_comp) * self.M - g_filter_comp)
+        if self.up in (None, 1):
+            return (index - see_filter_comp) * self.M - g_filter_comp
+        # The bandpass filter was applied on the upsampled signal, so its delay is up times shorter in raw samples
+        return np.round((index - see_filter_comp) * self.M - g_filter_comp / self.up).astype(np.int64)
         
     def write(self):
         # Path were it is saved "value from config/subfolder/(concat|segmented)/(raw|processed)/file"
@@ -263,6 +444,11 @@ class Processor:
         """
         basefolder = join(self.generation_path, self.subfolder)
         
+        if self.threshold_failure is not None and self.see_normalized is not None:
+            diagnostics_path = join(basefolder, self.diagnostics_path)
+            ensure_path_exists(diagnostics_path, is_parent=True)
+            self.plot_threshold_failure().savefig(join(diagnostics_path, f"threshold-{splitext(basename(self.file_path))[0]}.png"))
+        
         if self.write_result_processed:
             self.log("Writing processed files...")
             file_name = splitext(basename(self.file_path))[0]
@@ -313,70 +499,14 @@ class Processor:
         @author: Gerrald
         @date: 10-12-2025
         """
-        minima = []
-        maxima = []
-        prev_d = None
-        # Get temporary mimima and maxima on difference plot
-        for x, d, d2 in peaks:
-            to_add = (x,d,d2)
-            if prev_d is not None and d > prev_d and d2 < 0:
-                maxima.append(to_add)
-            elif prev_d is not None and d < prev_d and d2 > 0:
-                minima.append(to_add)
-            prev_d = d
-                
-        minima = np.array(minima)
-        maxima = np.array(maxima)
-        
-        # Sort minima ascending
-        minima = minima[minima[:,1].argsort()]
-        # Sort maxima descending
-        maxima = maxima[maxima[:,1].argsort()[::-1]]
-        
-        y_line = None
-        # Get line that goes through most lines in the difference plot
-        while True:
-            cur_min, minima = pop_np(minima)
-            cur_max, maxima = pop_np(maxima)
-            if cur_min[1] < cur_max[1]:
-                y_line = 0.5 * (max(minima[:,1]) + min(maxima[:,1]))
-            
-            if y_line != None:
-                #print(y_line)
-                break
-            elif len(minima) == 0 or len(maxima) == 0:
-                raise RuntimeError("No line found")
-            # else:
-                #print("Skipped some peaks, invalid line through middle")
+        y_line = find_y_line(peaks)
             
         # New function: classify based on y_line
-        classification = []
-        
-        prev_s1 = None
-        for x, d, d2 in peaks:
-            c = Classification.Uncertain
-            if d <= y_line and not prev_s1:
-                c = Classification.S1
-                prev_s1 = True
-            elif d > y_line and (prev_s1 or prev_s1 is None):
-                c = Classification.S2
-                prev_s1 = False
-            classification.append((x,d,d2,c))
-
-        classification = np.array(classification)
-        
-        mask_uncertain = classification[:,3] == Classification.Uncertain
-        mask_prev = np.concatenate(([False], mask_uncertain[:-1]))
-        mask_next = np.concatenate((mask_uncertain[1:], [False]))
-        
-        uncertain_total_mask = mask_uncertain | mask_next # | mask_prev
-        
-        s1_mask = classification[:,3] == Classification.S1
-        s2_mask = classification[:,3] == Classification.S2
+        s1_mask, s2_mask, uncertain_mask = classify_distances(peaks[:,1], y_line)
         
-        uncertain = classification[uncertain_total_mask, :3].astype(np.int64)
-        s1 = classification[~uncertain_total_mask & s1_mask, :3].astype(np.int64)
-        s2 = classification[~uncertain_total_mask & s2_mask, :3].astype(np.int64)
+        uncertain = peaks[uncertain_mask].astype(np.int64)
+        s1 = peaks[s1_mask].astype(np.int64)
+        s2 = peaks[s2_mask].astype(np.int64)
         
         if save_y_line:
             self.y_line = y_line
@@ -400,6 +530,8 @@ class Processor:
         groups = np.split(uncertain, breaks)
 
         debug_samples = int(debug_length * Fs)
+        # Removing a peak only changes the classification around it, so the classification of all peaks is kept up to date
+        classifier = None
         for group in groups:
             # if (np.any(group[:,1] < self.y_line) != np.all(group[:,1] < self.y_line) or
             #         np.any(group[:,1] > self.y_line) != np.all(group[:,1] > self.y_line)):
@@ -416,18 +548,22 @@ class Processor:
                 group_height = np.array(list(zip(group[:,0], see[group[:,0]])))
                 group_height = group_height[group_height[:,1].argsort()[::-1]]
                 
+                if classifier is None:
+                    classifier = IncrementalClassifier(peaks)
                 while True:
                     smallest_peak, group_height = pop_np(group_height)
-                    peaks = np.setdiff1d(peaks, [smallest_peak[0]])
-                    s1_peaks_new, s2_peaks_new, uncertain_new = self.classify_peaks(peaks, save_y_line = False)
+                    classifier.remove(smallest_peak[0])
                     
-                    if not np.any(np.isin(uncertain_new[:,0], group_height[:,0])) and len(peaks) > 0:
+                    if not np.any(classifier.is_uncertain(group_height[:,0])) and len(classifier.peaks) > 0:
                         success = True
                         break
                     elif len(group_height) == 0:
                         self.log(f"Debugging uncertains failed (going up) {group_height[:,0]}")
                         break
+                peaks = classifier.peaks
+                self.detected_peaks = classifier.rows()
                 if success:
+                    s1_peaks_new, s2_peaks_new, _ = classifier.result()
                     new_s1 = get_difference(s1_peaks_new, s1_peaks)
                     new_s2 = get_difference(s2_peaks_new, s2_peaks)
                     s1_u.extend(new_s1)
@@ -495,11 +631,13 @@ class Processor:
         self.file_path = file_path
         
         # Initialize fields that values can be saved to
+        self.wav = None
         self.Fs_original = None
         self.x = None
         self.g = None
         self.y = None
         self.M = None
+        self.up = None
         self.y_downsampled = None
         self.y_normalized = None
         self.y_energy = None
@@ -516,6 +654,7 @@ class Processor:
         self.uncertain = None
         self.ind_s1 = None
         self.ind_s2 = None
+        self.threshold_failure = None
         self.segmented_s1 = None
         self.segmented_s2 = None
         self.segmented_s1_raw = None
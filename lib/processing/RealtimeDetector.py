@@ -0,0 +1,246 @@
+from collections import deque
+from time import perf_counter
+from typing import Iterator
+from scipy import signal
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+from lib.processing.Processor import Classification
+from lib.processing.functions import shannon_energy
+from lib.processing.dataprocessing import find_y_line
+from lib.processing.resampling import rational_factors
+from lib.processing.streaming import RunningStats, PeakCandidates, OnlinePeakPicker
+from lib.processing.realtime import RingBuffer
+
+class OnlineClassifier:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    S1/S2 classification of peaks that arrive one by one, in the style of Processor.analyze_diff2.
+
+    The line between the short (S1 to S2) and long (S2 to S1) distances is searched in the last `window` peaks.
+    A peak is classified once the next peak is known, because its distance to the next peak is needed.
+    """
+    def __init__(self, window: int = 16):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            window (int, optional): The amount of recent peaks to find the line in. Defaults to 16.
+        """
+        self.peaks = deque(maxlen=window + 2)
+        self.prev_s1 = None
+        self.y_line = None
+
+    def process(self, peak: int) -> tuple[int, Classification]|None:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Add the next peak and classify the previous one.
+
+        Args:
+            peak (int): The index of the new peak.
+
+        Returns:
+            tuple[int, Classification] | None: The previous peak and its classification, or None if there is no previous peak.
+        """
+        self.peaks.append(peak)
+        if len(self.peaks) < 2:
+            return None
+
+        x_peaks = np.array(self.peaks)
+        diff = np.diff(x_peaks)
+        diff2 = np.diff(diff)
+        try:
+            self.y_line = find_y_line(np.array(list(zip(x_peaks[:-2], diff[:-1], diff2))))
+        except (RuntimeError, ValueError, IndexError):
+            # Too few peaks, or no line found in the window, keep the last line
+            pass
+
+        previous, d = x_peaks[-2], diff[-1]
+        c = Classification.Uncertain
+        if self.y_line is None:
+            pass
+        elif d <= self.y_line and not self.prev_s1:
+            c = Classification.S1
+            self.prev_s1 = True
+        elif d > self.y_line and (self.prev_s1 or self.prev_s1 is None):
+            c = Classification.S2
+            self.prev_s1 = False
+        return int(previous), c
+
+class RealtimeDetector:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Real-time S1/S2 detection on a live (multichannel) stream, built on the stages of the Processor.
+
+    The stages are replaced by their causal counterparts:
+    - The zero-phase FIR filters are replaced by Butterworth filters with the same cutoffs and slopes, which keep their state between blocks.
+    - The normalizations by the maximum and the standard deviation of the whole recording use the values up to now.
+    - A peak is confirmed when MinDist seconds have passed without a higher peak and it is classified when the next peak is confirmed.
+
+    So a heart sound is reported around MinDist plus one heart sound interval after it happened,
+    while the processing time of every block is kept under the LatencyBudget.
+    """
+    def __init__(self, config: ConfigParser, Fs: int, channel: int|None = None, log: bool = True):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Initializes the detector.
+
+        Args:
+            config (ConfigParser): The config object.
+            Fs (int): The sampling frequency of the stream (Hz).
+            channel (int | None, optional): The channel to detect on. If None, the mean of all channels is used. Defaults to None.
+            log (bool, optional): Whether to log blocks that exceed the latency budget. Defaults to True.
+
+        Raises:
+            ValueError: If Fs is not a multiple of FsTarget.
+        """
+        self.Fs = Fs
+        self.Fs_target = config.Downsampling.FsTarget
+        up, self.M = rational_factors(Fs, self.Fs_target)
+        if up != 1:
+            raise ValueError(f"ERROR: M is not an integer: {Fs}/{self.Fs_target}={Fs/self.Fs_target:.5f}")
+        self.channel = channel
+        self.log_enabled = log
+
+        self.block_duration = config.Realtime.BlockDuration
+        self.latency_budget = config.Realtime.LatencyBudget
+        self.buffer_duration = config.Realtime.BufferDuration
+        self.min_height = config.Segmentation.MinHeight
+        self.min_dist = config.Segmentation.MinDist * self.Fs_target
+
+        # The FIR filters of the Processor are filtfilt'ed Butterworth filters, so the causal filters get double the order
+        self.bandpass = signal.butter(2 * config.LowpassFilter.FilterOrder, [config.LowpassFilter.LowFrequency, config.LowpassFilter.HighFrequency],
+                                      btype="band", fs=Fs, output="sos")
+        self.lowpass = signal.butter(2 * config.Energy.FilterOrder, config.Energy.CutoffFrequency, btype="lowpass", fs=self.Fs_target, output="sos")
+        self.reset()
+
+    def reset(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Reset the state, to start on a new stream.
+        """
+        self.bandpass_state = np.zeros((self.bandpass.shape[0], 2))
+        self.lowpass_state = np.zeros((self.lowpass.shape[0], 2))
+        # Index of the next input sample, to keep every M-th sample over the block boundaries
+        self.position = 0
+        self.max_amplitude = 0.0
+        self.see_stats = RunningStats()
+        self.candidates = PeakCandidates(self.min_height, store=False)
+        self.picker = OnlinePeakPicker(self.min_dist)
+        self.classifier = OnlineClassifier()
+
+        self.block_count = 0
+        self.over_budget = 0
+        self.overflows = 0
+        self.latencies = deque(maxlen=10000)
+
+    def process_block(self, frames: np.ndarray) -> list[tuple[int, float, Classification]]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Process the next block of the stream.
+
+        Args:
+            frames (np.ndarray): The frames with shape (n,) or (n, channels).
+
+        Returns:
+            list[tuple[int, float, Classification]]: The classified peaks: the index in the envelope (at FsTarget),
+                the time in the stream (s) and the classification. The time includes the delay of the causal filters.
+        """
+        t_start = perf_counter()
+
+        frames = np.asarray(frames, dtype=np.float64)
+        if frames.ndim == 2:
+            x = frames.mean(axis=1) if self.channel is None else frames[:,self.channel]
+        else:
+            x = frames
+
+        y, self.bandpass_state = signal.sosfilt(self.bandpass, x, zi=self.bandpass_state)
+        # The first sample of this block that is a multiple of M in the whole stream
+        offset = -self.position % self.M
+        self.position += len(x)
+        y = y[offset::self.M]
+
+        self.max_amplitude = max(self.max_amplitude, np.max(np.abs(y), initial=0))
+        detections = []
+        if len(y) > 0 and self.max_amplitude > 0:
+            see, self.lowpass_state = signal.sosfilt(self.lowpass, shannon_energy(y / self.max_amplitude), zi=self.lowpass_state)
+            self.see_stats.update(see)
+            if self.see_stats.count > 1 and self.see_stats.m2 > 0:
+                peaks, heights = self.candidates.process(see / self.see_stats.std(ddof=1))
+                for peak in self.picker.process(peaks, heights, self.candidates.offset + 1):
+                    classified = self.classifier.process(peak)
+                    if classified is not None:
+                        detections.append((classified[0], classified[0] / self.Fs_target, classified[1]))
+
+        latency = perf_counter() - t_start
+        self.latencies.append(latency)
+        self.block_count += 1
+        if latency > self.latency_budget:
+            self.over_budget += 1
+            if self.log_enabled:
+                print(f"WARNING: block {self.block_count} took {latency*1000:.2f} ms, budget is {self.latency_budget*1000:.2f} ms")
+        return detections
+
+    def run(self, source) -> Iterator[tuple[int, float, Classification]]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Detect on a sound source until it ends, through a ring buffer.
+
+        Args:
+            source (WavReplaySource | SoundDeviceSource): The sound source, see lib.processing.realtime.
+
+        Raises:
+            ValueError: If the sampling frequency of the source does not match the detector.
+
+        Yields:
+            tuple[int, float, Classification]: The classified peaks, see `process_block`.
+        """
+        if source.Fs != self.Fs:
+            raise ValueError(f"The source has a sampling frequency of {source.Fs} Hz, expected {self.Fs} Hz")
+
+        block_size = max(1, int(self.block_duration * self.Fs))
+        ring = RingBuffer(int(self.buffer_duration * self.Fs), source.channels)
+        source.start(ring)
+        try:
+            while True:
+                frames = ring.read(block_size)
+                if len(frames) == 0:
+                    break
+                yield from self.process_block(frames)
+        finally:
+            source.stop()
+            self.overflows = ring.overflows
+
+    def latency_stats(self) -> dict[str, float]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            dict[str, float]: The mean, 99th percentile and maximum processing time per block (s) of the recent blocks,
+                and the fraction of all blocks over the budget.
+        """
+        latencies = np.array(self.latencies)
+        if len(latencies) == 0:
+            return {"mean": 0.0, "p99": 0.0, "max": 0.0, "over_budget": 0.0}
+        return {
+            "mean": float(np.mean(latencies)),
+            "p99": float(np.percentile(latencies, 99)),
+            "max": float(np.max(latencies)),
+            "over_budget": self.over_budget / self.block_count,
+        }
@@ -0,0 +1,354 @@
+from tempfile import TemporaryDirectory
+from typing import Iterator
+from os.path import join
+import numpy as np
+
+from lib.processing.Processor import Processor, Classification
+from lib.processing.functions import construct_bandpass_filter, construct_lowpass_filter, shannon_energy
+from lib.processing.resampling import rational_factors
+from lib.processing.streaming import StreamingFilter, RunningStats, PeakCandidates, ThresholdDomains, select_by_peak_distance
+from lib.processing.dataprocessing import domains_with_peaks, SegmentBuffers
+from lib.config.ConfigParser import ConfigParser
+
+class StreamingProcessor(Processor):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Processor for recordings that are too long to keep in memory, e.g. hour long Holter recordings.
+
+    The wav file is memory mapped and processed in blocks, with the filter states carried over the block boundaries.
+    The downsampled signal and the Shannon energy envelope are written to memory mapped temporary files instead of
+    arrays in memory, and the peak candidates and envelope domains are collected while the envelope is computed.
+    Classification needs the peaks of the whole recording (the line between S1 and S2 is global), so the S1/S2
+    peaks are emitted by `stream` after the last block has been read. The segments that `write` saves are cut
+    into temporary memory mapped files as well.
+
+    The peaks are the same as the ones of Processor.run on the same file.
+    """
+    def __init__(self, file_path: str, config: ConfigParser, subfolder: str = "", log: bool = True, postprocessing: bool = True, block_size: int = 2**16, tmp_dir: str|None = None,
+                 write_result_processed: bool = True, write_result_raw: bool = True):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Initializes the processor.
+
+        Args:
+            file_path (str): The path to the wav file.
+            config (ConfigParser): The config object.
+            subfolder (str, optional): The subfolder to save results in. Defaults to "".
+            log (bool, optional): Whether to log its process in the console. Defaults to True.
+            postprocessing (bool, optional): Whether to postprocess the uncertain peaks. Defaults to True.
+            block_size (int, optional): The amount of samples per block at FsTarget. Defaults to 2**16.
+            tmp_dir (str | None, optional): The folder for the temporary files. If None, the system default is used. Defaults to None.
+            write_result_processed (bool, optional): Whether `write` saves the processed segments. Defaults to True.
+            write_result_raw (bool, optional): Whether `write` saves the raw segments. Defaults to True.
+        """
+        super().__init__(file_path, config, subfolder, log, write_result_processed=write_result_processed, write_result_raw=write_result_raw, postprocessing=postprocessing)
+        self.block_size = block_size
+        self.tmp_dir = tmp_dir
+        self._tmp = None
+        self.peak_candidates = None
+        self.peak_candidate_heights = None
+        self.domains = None
+
+    def __enter__(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        return self
+
+    def __exit__(self, *_):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.close()
+
+    def close(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Remove the temporary files and release the memory mapped wav file.
+        """
+        self.wav = None
+        self.x = None
+        self.y_downsampled = None
+        self.y_normalized = None
+        self.see = None
+        self.see_normalized = None
+        self.segmented_s1 = self.segmented_s1_concat = None
+        self.segmented_s2 = self.segmented_s2_concat = None
+        self.segmented_s1_raw = self.segmented_s1_raw_concat = None
+        self.segmented_s2_raw = self.segmented_s2_raw_concat = None
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def run(self, write_enabled: bool = False):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Run the process and drop the emitted peaks.
+
+        Args:
+            write_enabled (bool, optional): Whether to cut and write the segmentation result. Defaults to False.
+        """
+        for _ in self.stream():
+            pass
+        if write_enabled:
+            self.cut_segments()
+            self.write()
+        self.log("Finished! :-)")
+        self.log(f"Results:\n  - S1 count: {len(self.s1_peaks)}\n  - S2 count: {len(self.s2_peaks)}\n  - Uncertain: {len(self.uncertain)}")
+
+    def stream(self) -> Iterator[tuple[int, Classification, tuple[int, int]|None]]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Process the file and emit the classified peaks in order of time.
+
+        The peaks are only emitted after the whole file has been processed and classified, because the line between
+        S1 and S2 is searched in all peaks. The memory use stays low, but the first peak is not emitted earlier.
+
+        Yields:
+            tuple[int, Classification, tuple[int, int] | None]: The index of the peak in the envelope, S1 or S2 and the
+                (start, end) domain of the peak in the envelope, or None if the peak is not in a domain.
+                Use `processed_segment` and `raw_segment` to get the samples of a domain.
+        """
+        self.load()
+        self.preprocess()
+        self.process()
+        self.classify()
+        self.segment()
+
+        peaks = np.concatenate((self.s1_peaks[:,0], self.s2_peaks[:,0]))
+        classes = [Classification.S1] * len(self.s1_peaks) + [Classification.S2] * len(self.s2_peaks)
+        starts = self.domains[:,0]
+        for i in np.argsort(peaks, kind="stable"):
+            peak = int(peaks[i])
+            j = np.searchsorted(starts, peak, side="right") - 1
+            domain = (int(self.domains[j,0]), int(self.domains[j,1])) if j >= 0 and self.domains[j,1] >= peak else None
+            yield peak, classes[i], domain
+
+    def cut_segments(self, buffers: SegmentBuffers|None = None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Cut the domains in ind_s1 and ind_s2 out of the processed and the raw signal, see Processor.cut_segments.
+
+        Args:
+            buffers (SegmentBuffers | None, optional): Buffers to cut the segments into. If None, temporary memory mapped files are used. Defaults to None.
+        """
+        super().cut_segments(_TemporaryBuffers(self) if buffers is None else buffers)
+
+    def processed_segment(self, domain: tuple[int, int]) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            domain (tuple[int, int]): The (start, end) domain in the envelope.
+
+        Returns:
+            np.ndarray: The normalized downsampled signal in the domain.
+        """
+        see_filter_comp = int(len(self.see_filter)/2)
+        start, end = domain
+        return np.array(self.y_normalized[start - see_filter_comp:end - see_filter_comp])
+
+    def raw_segment(self, domain: tuple[int, int]) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            domain (tuple[int, int]): The (start, end) domain in the envelope.
+
+        Returns:
+            np.ndarray: The raw signal in the domain.
+        """
+        start, end = domain
+        return np.array(self.x[self.raw_index(start):self.raw_index(end)])
+
+    def preprocess(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Filter and downsample the signal block by block, and normalize it in place.
+        Because of this, y_downsampled and y_normalized are the same (normalized) buffer.
+        """
+        if self.x is None or self.Fs_original is None:
+            self.load()
+
+        up, self.M = rational_factors(self.Fs_original, self.Fs_target)
+        if up != 1:
+            raise ValueError(f"ERROR: M is not an integer: {self.Fs_original}/{self.Fs_target}={self.Fs_original/self.Fs_target:.5f}")
+        self.up = 1
+
+        self.log("Constructing bandpass filter...")
+        self.g = construct_bandpass_filter(self.lp_low_freq, self.lp_high_freq, self.Fs_original, order=self.lp_filter_order, size=self.lp_filter_size)
+
+        self.log("Filtering and downsampling input signal...")
+        self.y_downsampled = self._buffer("y_downsampled", (len(self.x) + len(self.g) - 2) // self.M + 1)
+        bandpass = StreamingFilter(self.g, self.M)
+        position = 0
+        peak = 0.0
+        for start in range(0, len(self.x), self.block_size * self.M):
+            y = bandpass.process(self.x[start:start + self.block_size * self.M])
+            self.y_downsampled[position:position + len(y)] = y
+            position += len(y)
+            peak = max(peak, np.max(np.abs(y), initial=0))
+        y = bandpass.flush()
+        self.y_downsampled[position:] = y
+        peak = max(peak, np.max(np.abs(y), initial=0))
+
+        self.log("Normalizing signal...")
+        for start in range(0, len(self.y_downsampled), self.block_size):
+            self.y_downsampled[start:start + self.block_size] /= peak
+        self.y_normalized = self.y_downsampled
+
+    def process(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Compute the Shannon energy envelope block by block, normalize it in place and collect the peak candidates and the domains.
+        """
+        if self.y_normalized is None:
+            self.preprocess()
+
+        self.log("Constructing Shannon Energy Envelope Filter...")
+        self.see_filter = construct_lowpass_filter(self.energy_cutoff_freq, self.Fs_target, self.energy_filter_order, self.energy_filter_size)
+
+        self.log("Creating Shannon Energy Envelope...")
+        self.see = self._buffer("see", len(self.y_normalized) + len(self.see_filter) - 1)
+        envelope_filter = StreamingFilter(self.see_filter)
+        stats = RunningStats()
+        position = 0
+        for start in range(0, len(self.y_normalized), self.block_size):
+            see = envelope_filter.process(shannon_energy(self.y_normalized[start:start + self.block_size]))
+            self.see[position:position + len(see)] = see
+            position += len(see)
+            stats.update(see)
+        see = envelope_filter.flush()
+        self.see[position:] = see
+        stats.update(see)
+
+        self.log("Normalizing Shannon Energy Envelope and collecting peaks...")
+        std = stats.std(ddof=1)
+        candidates = PeakCandidates(self.segmentation_min_height)
+        domains = ThresholdDomains(self.segmentation_threshold)
+        for start in range(0, len(self.see), self.block_size):
+            see = self.see[start:start + self.block_size]
+            see /= std
+            candidates.process(see)
+            domains.process(see)
+        self.see_normalized = self.see
+        self.peak_candidates, self.peak_candidate_heights = candidates.result()
+        self.domains = domains.result()
+
+        self.peaks = self.find_peaks(self.segmentation_min_height)
+
+    def find_peaks(self, min_height: float) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns the peaks of the normalized Shannon energy envelope from the collected candidates, without reading the envelope again.
+
+        Args:
+            min_height (float): The minimum height of a peak, at least the MinHeight from the config.
+
+        Returns:
+            np.ndarray: The indices of the peaks.
+        """
+        if min_height < self.segmentation_min_height:
+            return super().find_peaks(min_height)
+        mask = self.peak_candidate_heights >= min_height
+        return select_by_peak_distance(self.peak_candidates[mask], self.peak_candidate_heights[mask], self.segmentation_min_dist)
+
+    def segment(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Select the domains of the S1 and S2 peaks. The segments are not cut out, see `processed_segment` and `raw_segment`.
+        """
+        self.log("Segmenting them...")
+
+        self.s1_peaks = self.s1_peaks[self.s1_peaks[:,0].argsort()]
+        self.s2_peaks = self.s2_peaks[self.s2_peaks[:,0].argsort()]
+
+        self.ind_s1 = domains_with_peaks(self.domains, self.s1_peaks[:,0])
+        self.ind_s2 = domains_with_peaks(self.domains, self.s2_peaks[:,0])
+
+    def open_file(self, file_path):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.close()
+        super().open_file(file_path)
+        self.peak_candidates = None
+        self.peak_candidate_heights = None
+        self.domains = None
+
+    def _buffer(self, name: str, length: int, dtype: np.dtype = np.float64, shape: tuple = ()) -> np.memmap:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Create a temporary memory mapped buffer.
+
+        Args:
+            name (str): The name of the buffer.
+            length (int): The amount of samples.
+            dtype (np.dtype, optional): The data type of the samples. Defaults to np.float64.
+            shape (tuple, optional): The shape of one sample, e.g. (channels,). Defaults to ().
+
+        Returns:
+            np.memmap: The buffer.
+        """
+        if self._tmp is None:
+            self._tmp = TemporaryDirectory(prefix="streaming-processor-", dir=self.tmp_dir, ignore_cleanup_errors=True)
+        return np.memmap(join(self._tmp.name, f"{name}.dat"), dtype=dtype, mode="w+", shape=(max(length, 1),) + tuple(shape))[:length]
+
+class _TemporaryBuffers(SegmentBuffers):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Segment buffers in the temporary memory mapped files of a StreamingProcessor.
+    """
+    def __init__(self, processor: StreamingProcessor):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            processor (StreamingProcessor): The processor that owns the temporary files.
+        """
+        super().__init__()
+        self.processor = processor
+
+    def get(self, name: str, signal: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            name (str): The name of the result.
+            signal (np.ndarray): The signal that will be segmented.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The buffers for the segmented signal and the concatenation, both as long as the signal.
+        """
+        return tuple(self.processor._buffer(f"{kind}-{name}", len(signal), signal.dtype, signal.shape[1:]) for kind in ("segmented", "concatenated"))
@@ -0,0 +1,251 @@
+from math import ceil, log2
+import numpy as np
+from scipy import fft
+
+# Below this amount of kernel taps the direct convolution is always faster than any FFT method
+DIRECT_MAX_TAPS = 64
+CONVOLUTION_METHODS = ("auto", "direct", "fft", "overlap-add", "overlap-save")
+
+def _fft_cost(nfft: int) -> float:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Rough operation count of one real FFT of length nfft.
+
+    Args:
+        nfft (int): The length of the FFT.
+
+    Returns:
+        float: The estimated amount of operations.
+
+    """
+    return nfft * log2(nfft)
+
+def block_fft_size(kernel_length: int) -> int:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Returns the FFT size used per block by overlap-add and overlap-save.
+
+    Eight times the kernel length keeps the part of every block that is wasted on the kernel overlap small.
+
+    Args:
+        kernel_length (int): The length of the kernel.
+
+    Returns:
+        int: The FFT size of one block.
+
+    """
+    return fft.next_fast_len(8 * kernel_length, real=True)
+
+def estimate_costs(signal_length: int, kernel_length: int) -> dict[str, float]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Estimate the amount of operations of every convolution method for the given lengths.
+
+    Args:
+        signal_length (int): The length of the signal.
+        kernel_length (int): The length of the kernel.
+
+    Returns:
+        dict[str, float]: The estimated cost per method.
+
+    """
+    N, L = signal_length, kernel_length
+    out_length = N + L - 1
+
+    nfft = fft.next_fast_len(out_length, real=True)
+    # Forward transforms of both inputs and the inverse transform
+    fft_cost = 3 * _fft_cost(nfft) + nfft
+
+    nfft_block = block_fft_size(L)
+    step = nfft_block - L + 1
+    block_cost = 2 * _fft_cost(nfft_block) + nfft_block
+    # Overlap-add needs one block per input step and adds the L-1 tail of every block
+    n_blocks_oa = ceil(N / step)
+    # Overlap-save needs one block per output step, but does not need to add anything
+    n_blocks_os = ceil(out_length / step)
+
+    return {
+        "direct": float(N * L),
+        "fft": fft_cost,
+        "overlap-add": _fft_cost(nfft_block) + n_blocks_oa * (block_cost + L - 1),
+        "overlap-save": _fft_cost(nfft_block) + n_blocks_os * block_cost,
+    }
+
+def choose_convolution_method(signal_length: int, kernel_length: int) -> str:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Choose the cheapest convolution method for the given signal and kernel lengths.
+
+    Args:
+        signal_length (int): The length of the signal.
+        kernel_length (int): The length of the kernel.
+
+    Returns:
+        str: One of `direct`, `fft`, `overlap-add` or `overlap-save`.
+
+    """
+    if min(signal_length, kernel_length) <= DIRECT_MAX_TAPS:
+        return "direct"
+
+    costs = estimate_costs(max(signal_length, kernel_length), min(signal_length, kernel_length))
+    # A block method is only useful if the signal spans multiple blocks
+    if max(signal_length, kernel_length) <= block_fft_size(min(signal_length, kernel_length)):
+        costs.pop("overlap-add")
+        costs.pop("overlap-save")
+    return min(costs, key=costs.get)
+
+def fft_convolve(x: np.ndarray, g: np.ndarray) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Full linear convolution of x and g with one FFT over the whole output length.
+
+    Args:
+        x (np.ndarray): The signal.
+        g (np.ndarray): The filter.
+
+    Returns:
+        np.ndarray: The result with length len(x) + len(g) - 1.
+
+    """
+    out_length = len(x) + len(g) - 1
+    nfft = fft.next_fast_len(out_length, real=True)
+    Y = fft.rfft(x, nfft) * fft.rfft(g, nfft)
+    return fft.irfft(Y, nfft)[:out_length]
+
+def overlap_add_convolve(x: np.ndarray, g: np.ndarray, nfft: int|None = None) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Full linear convolution of x and g with the overlap-add method.
+
+    The signal is cut in blocks of nfft-len(g)+1 samples, every block is convolved with the kernel through one
+    FFT of length nfft and the tails of the blocks are added to the start of the next block.
+
+    Args:
+        x (np.ndarray): The signal.
+        g (np.ndarray): The filter.
+        nfft (int | None, optional): The FFT size per block. If None, it is chosen from the kernel length. Defaults to None.
+
+    Returns:
+        np.ndarray: The result with length len(x) + len(g) - 1.
+
+    """
+    N, L = len(x), len(g)
+    nfft = nfft or block_fft_size(L)
+    step = nfft - L + 1
+    if step < L - 1:
+        raise ValueError(f"nfft ({nfft}) should be at least 2*len(g)-2 ({2*L-2}) so that only neighbouring blocks overlap")
+
+    n_blocks = ceil(N / step)
+    G = fft.rfft(g, nfft)
+
+    # Transform all blocks at once: each row is one block zero-padded to nfft
+    blocks = np.zeros((n_blocks, step))
+    blocks.flat[:N] = x
+    Y = fft.irfft(fft.rfft(blocks, nfft, axis=1) * G, nfft, axis=1)
+
+    # The heads of the blocks do not overlap, so these can be written in one go
+    y = np.zeros((n_blocks + 1) * step)
+    y[:n_blocks * step] = Y[:, :step].ravel()
+    # The tails are at most one step long, so the tail of each block only overlaps the head of the next block
+    tails = np.zeros((n_blocks, step))
+    tails[:, :L - 1] = Y[:, step:]
+    y[step:] += tails.ravel()
+    return y[:N + L - 1]
+
+def overlap_save_convolve(x: np.ndarray, g: np.ndarray, nfft: int|None = None) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Full linear convolution of x and g with the overlap-save method.
+
+    Every block of nfft input samples overlaps len(g)-1 samples with the previous block. After the circular
+    convolution of a block with the kernel, the first len(g)-1 samples are corrupted by the wrap-around and thrown away.
+
+    Args:
+        x (np.ndarray): The signal.
+        g (np.ndarray): The filter.
+        nfft (int | None, optional): The FFT size per block. If None, it is chosen from the kernel length. Defaults to None.
+
+    Returns:
+        np.ndarray: The result with length len(x) + len(g) - 1.
+
+    """
+    N, L = len(x), len(g)
+    nfft = nfft or block_fft_size(L)
+    step = nfft - L + 1
+    if step <= 0:
+        raise ValueError(f"nfft ({nfft}) should be at least as long as the kernel ({L})")
+
+    out_length = N + L - 1
+    n_blocks = ceil(out_length / step)
+    G = fft.rfft(g, nfft)
+
+    # Prepend L-1 zeros (the 'saved' part of the first block) and pad the end to fill the last block
+    x_padded = np.zeros(n_blocks * step + L - 1)
+    x_padded[L - 1:L - 1 + N] = x
+    # Each row is a view on nfft samples, starting every step samples
+    blocks = np.lib.stride_tricks.sliding_window_view(x_padded, nfft)[::step]
+    Y = fft.irfft(fft.rfft(blocks, nfft, axis=1) * G, nfft, axis=1)
+
+    return Y[:, L - 1:].ravel()[:out_length]
+
+def convolve(x: list|np.ndarray, g: list|np.ndarray, method: str = "auto") -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Full linear convolution of x and g, equal to np.convolve(x, g) (up to floating point errors).
+
+    Args:
+        x (list | np.ndarray): The signal.
+        g (list | np.ndarray): The filter.
+        method (str, optional): One of `auto`, `direct`, `fft`, `overlap-add` or `overlap-save`.
+            If `auto`, the cheapest method is chosen from the lengths of x and g. Defaults to `auto`.
+
+    Raises:
+        ValueError: If the method is not supported.
+
+    Returns:
+        np.ndarray: The result with length len(x) + len(g) - 1.
+
+    """
+    if method not in CONVOLUTION_METHODS:
+        raise ValueError(f"{method} is not supported")
+
+    x = np.asarray(x)
+    g = np.asarray(g)
+    if len(x) == 0 or len(g) == 0:
+        raise ValueError("x and g should not be empty")
+
+    if method == "auto":
+        method = choose_convolution_method(len(x), len(g))
+    # The block methods block the longest input and use the shortest as kernel
+    if len(g) > len(x):
+        x, g = g, x
+
+    if np.iscomplexobj(x) or np.iscomplexobj(g):
+        # The FFT methods are written for real signals
+        method = "direct"
+
+    match method:
+        case "direct":
+            return np.convolve(x, g)
+        case "fft":
+            return fft_convolve(x, g)
+        case "overlap-add":
+            return overlap_add_convolve(x, g)
+        case "overlap-save":
+            return overlap_save_convolve(x, g)
@@ -95,6 +95,282 @@ def pop_np(x):
     """
     return x[-1], x[:-1]
 
+def find_y_line(peaks: np.ndarray) -> float:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Find the line in the difference plot that separates the short (S1 to S2) and long (S2 to S1) distances to the next peak.
+
+    Args:
+        peaks (np.ndarray): Rows of (peak, distance to the next peak, second difference).
+
+    Raises:
+        IndexError: If there are no minima or maxima.
+        RuntimeError: If no line is found.
+        ValueError: If no minima or maxima are left beyond the line.
+
+    Returns:
+        float: The distance that separates S1 (below or on the line) and S2 (above the line).
+    """
+    # Get temporary mimima and maxima on difference plot
+    minima, maxima = find_extrema(peaks[:,1], peaks[:,2])
+    return y_line_from_extrema(np.sort(peaks[minima,1]), np.sort(peaks[maxima,1]))
+
+def find_extrema(d: np.ndarray, d2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Find the local minima and maxima of the distances to the next peak.
+
+    Args:
+        d (np.ndarray): The distances to the next peak.
+        d2 (np.ndarray): The differences between the next distance and these distances.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Masks of the minima and the maxima. The first distance is never an extremum.
+    """
+    rising = np.zeros(len(d), dtype=bool)
+    falling = np.zeros(len(d), dtype=bool)
+    rising[1:] = d[1:] > d[:-1]
+    falling[1:] = d[1:] < d[:-1]
+    return falling & (d2 > 0), rising & (d2 < 0)
+
+def y_line_from_extrema(minima: np.ndarray, maxima: np.ndarray) -> float:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Find the line through the difference plot, starting from the largest minimum and the smallest maximum
+    and moving inward until the minimum is below the maximum. The line lies halfway the next minimum and maximum.
+
+    Args:
+        minima (np.ndarray): The distances of the minima, sorted ascending.
+        maxima (np.ndarray): The distances of the maxima, sorted ascending.
+
+    Raises:
+        IndexError: If there are no minima or maxima.
+        RuntimeError: If no line is found.
+        ValueError: If no minima or maxima are left beyond the line.
+
+    Returns:
+        float: The distance that separates S1 (below or on the line) and S2 (above the line).
+    """
+    if len(minima) == 0 or len(maxima) == 0:
+        raise IndexError("No minima or maxima found")
+    minima = minima[::-1]
+    n = min(len(minima), len(maxima))
+    separated = np.flatnonzero(minima[:n] < maxima[:n])
+    if len(separated) == 0:
+        raise RuntimeError("No line found")
+    i = separated[0]
+    if i + 1 == n:
+        raise ValueError("No minima or maxima left beyond the line")
+    return 0.5 * (minima[i + 1] + maxima[i + 1])
+
+def classify_distances(d: np.ndarray, y_line: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Classify peaks by their distance to the next peak. A short distance (S1 to S2) is an S1 and a long one an S2,
+    unless the previous distance was also short or long. Then the peak is uncertain, just like the peak before it.
+
+    Args:
+        d (np.ndarray): The distances to the next peak.
+        y_line (float): The line between the short and long distances, see find_y_line.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Masks of the S1, S2 and uncertain peaks.
+    """
+    short = d <= y_line
+    alternates = short != np.concatenate((~short[:1], short[:-1]))
+    uncertain = ~alternates
+    uncertain[:-1] |= ~alternates[1:]
+    return short & ~uncertain, ~short & ~uncertain, uncertain
+
+class IncrementalClassifier:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The classification of Processor.classify_peaks, that is updated when a peak is removed or inserted.
+
+    A peak is classified by its distance to the next peak and the distance before it, so one peak only changes
+    the distances and extrema around it. The distances of the extrema are kept sorted, so the line is found again
+    without going over all peaks, and a peak is only classified when it is asked for.
+    """
+    def __init__(self, x_peaks: np.ndarray):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            x_peaks (np.ndarray): The sorted indices of the peaks.
+
+        Raises:
+            IndexError | RuntimeError | ValueError: If no line is found, see find_y_line.
+        """
+        self.peaks = np.asarray(x_peaks)
+        self.diff = np.diff(self.peaks)
+        self.minima, self.maxima = self._extrema(0, self._rows())
+        self.minima.sort()
+        self.maxima.sort()
+        self.y_line = y_line_from_extrema(self.minima, self.maxima)
+
+    def _rows(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            int: The amount of classified peaks, the last two peaks have no second difference.
+        """
+        return max(len(self.peaks) - 2, 0)
+
+    def _extrema(self, start: int, stop: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            start (int): The first peak.
+            stop (int): The peak after the last peak.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The distances of the minima and maxima between start and stop.
+        """
+        # One extra distance before start is needed to know whether start is an extremum
+        before = 1 if start > 0 else 0
+        d = self.diff[start - before:stop]
+        minima, maxima = find_extrema(d, self.diff[start - before + 1:stop + 1] - d)
+        return d[before:][minima[before:]], d[before:][maxima[before:]]
+
+    def _update(self, position: int, peaks: np.ndarray, diff: np.ndarray, rows_after: int):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Replace the peaks after a change at a position, and update the extrema around it and the line.
+
+        Args:
+            position (int): The index of the changed peak.
+            peaks (np.ndarray): The new peaks.
+            diff (np.ndarray): The new distances to the next peak.
+            rows_after (int): The amount of peaks from the position on that may have changed, in the new peaks.
+        """
+        # The peaks from three peaks before the position up to three peaks after it may have changed in the old peaks
+        start = max(position - 3, 0)
+        minima, maxima = self._extrema(start, min(position + 3, self._rows()))
+        for d in minima:
+            self.minima = np.delete(self.minima, np.searchsorted(self.minima, d))
+        for d in maxima:
+            self.maxima = np.delete(self.maxima, np.searchsorted(self.maxima, d))
+
+        self.peaks, self.diff = peaks, diff
+        minima, maxima = self._extrema(start, min(position + rows_after, self._rows()))
+        minima.sort()
+        maxima.sort()
+        self.minima = np.insert(self.minima, np.searchsorted(self.minima, minima), minima)
+        self.maxima = np.insert(self.maxima, np.searchsorted(self.maxima, maxima), maxima)
+        self.y_line = y_line_from_extrema(self.minima, self.maxima)
+
+    def remove(self, peak: int):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Remove a peak. Nothing changes if it is not one of the peaks.
+
+        Args:
+            peak (int): The index of the peak.
+
+        Raises:
+            IndexError | RuntimeError | ValueError: If no line is found anymore, see find_y_line.
+        """
+        position = np.searchsorted(self.peaks, peak)
+        if position == len(self.peaks) or self.peaks[position] != peak:
+            return
+
+        peaks = np.delete(self.peaks, position)
+        # The distances to and from the peak are replaced by the distance between its neighbours
+        before = max(position - 1, 0)
+        diff = np.concatenate((self.diff[:before], np.diff(peaks[before:position + 1]), self.diff[position + 1:]))
+        self._update(position, peaks, diff, 2)
+
+    def insert(self, peak: int):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Insert a peak. Nothing changes if it is already one of the peaks.
+
+        Args:
+            peak (int): The index of the peak.
+
+        Raises:
+            IndexError | RuntimeError | ValueError: If no line is found anymore, see find_y_line.
+        """
+        position = np.searchsorted(self.peaks, peak)
+        if position < len(self.peaks) and self.peaks[position] == peak:
+            return
+
+        peaks = np.insert(self.peaks, position, peak)
+        # The distance between its neighbours is replaced by the distances to and from the peak
+        before = max(position - 1, 0)
+        diff = np.concatenate((self.diff[:before], np.diff(peaks[before:position + 2]), self.diff[position:]))
+        self._update(position, peaks, diff, 4)
+
+    def rows(self) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            np.ndarray: Rows of (peak, distance to the next peak, second difference), like Processor.detected_peaks.
+        """
+        rows = self._rows()
+        return np.column_stack((self.peaks[:rows], self.diff[:rows], np.diff(self.diff)))
+
+    def is_uncertain(self, peaks: np.ndarray) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Classify only the given peaks.
+
+        Args:
+            peaks (np.ndarray): The indices of the peaks.
+
+        Returns:
+            np.ndarray: Whether the peaks are uncertain. Peaks that are not classified (or unknown) are not uncertain.
+        """
+        peaks = np.asarray(peaks)
+        rows = self._rows()
+        position = np.searchsorted(self.peaks, peaks)
+        classified = (position < rows) & (self.peaks[np.minimum(position, len(self.peaks) - 1)] == peaks)
+
+        def alternates(i: np.ndarray) -> np.ndarray:
+            # Whether the distance at i is short and the previous one long or the other way around
+            inside = (i > 0) & (i < rows)
+            i = np.clip(i, 1, max(rows - 1, 1))
+            return ~inside | ((self.diff[i] <= self.y_line) != (self.diff[i - 1] <= self.y_line))
+
+        return classified & (~alternates(position) | ~alternates(position + 1))
+
+    def result(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The rows of the S1, S2 and uncertain peaks, like Processor.classify_peaks.
+        """
+        rows = self.rows()
+        s1, s2, uncertain = classify_distances(rows[:,1], self.y_line)
+        return rows[s1].astype(np.int64), rows[s2].astype(np.int64), rows[uncertain].astype(np.int64)
+
 def get_difference(a,b):
     """
     @author: Gerrald
@@ -105,21 +381,93 @@ def get_difference(a,b):
     
     return list(a_rows - b_rows)
 
+def threshold_edges(see: np.ndarray, threshold: float, inside: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Find where a signal enters and leaves the domains above a threshold, without walking over every sample.
+
+    A domain starts at the first sample >= threshold and ends at the next sample <= threshold. So a sample above the threshold
+    always ends up inside a domain, a sample below it always outside, and a sample exactly on the threshold toggles the state.
+    The state after a sample follows from the last sample that is not on the threshold and the amount of samples on it since then.
+
+    Args:
+        see (np.ndarray): The signal.
+        threshold (float): The threshold.
+        inside (bool, optional): Whether the signal is inside a domain before the first sample. Defaults to False.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The indices where a domain starts and where a domain ends, in order.
+    """
+    see = np.asarray(see)
+    state = see > threshold
+    on_threshold = see == threshold
+    if on_threshold.any():
+        last_strict = np.maximum.accumulate(np.where(on_threshold, -1, np.arange(len(see))))
+        n_on_threshold = np.cumsum(on_threshold)
+        has_strict = last_strict >= 0
+        toggles = n_on_threshold - np.where(has_strict, n_on_threshold[last_strict], 0)
+        state = (np.where(has_strict, state[last_strict], inside) + toggles) % 2 == 1
+
+    changes = np.flatnonzero(state[1:] != state[:-1]) + 1
+    if len(see) > 0 and state[0] != inside:
+        changes = np.concatenate(([0], changes))
+    # The changes alternate between starts and ends
+    if inside:
+        return changes[1::2], changes[::2]
+    return changes[::2], changes[1::2]
+
+def threshold_domains(see: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Args:
+        see (np.ndarray): The signal.
+        threshold (float): The threshold.
+
+    Returns:
+        np.ndarray: The (start, end) of the domains above the threshold, see `threshold_edges`.
+            A domain that is still open at the end of the signal is dropped.
+    """
+    starts, ends = threshold_edges(see, threshold)
+    return np.column_stack((starts[:len(ends)], ends)).astype(np.int64).reshape(-1, 2)
+
+def domains_with_peaks(domains: np.ndarray, peaks: np.ndarray) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Returns the domains that contain at least one of the peaks.
+
+    Args:
+        domains (np.ndarray): The sorted (start, end) domains.
+        peaks (np.ndarray): The indices of the peaks.
+
+    Returns:
+        np.ndarray: The domains that contain a peak.
+    """
+    peaks = np.sort(peaks)
+    contains = np.searchsorted(peaks, domains[:,0], side="left") < np.searchsorted(peaks, domains[:,1], side="right")
+    return domains[contains]
+
 def detect_peak_domains(peaks: np.ndarray, see: np.ndarray, threshold: float):
     """
     @author: Gerrald
     @date: 10-12-2025
+
+    Find the domains of the envelope above the threshold that contain a peak.
+
+    Args:
+        peaks (np.ndarray): Rows that start with the index of the peak.
+        see (np.ndarray): The normalized Shannon energy envelope.
+        threshold (float): The threshold.
+
+    Returns:
+        np.ndarray: The (start, end) of the domains.
     """
-    peak_start = None
-    peaks_ind = []
-    for i, s in enumerate(see):
-        if s >= threshold and peak_start is None:
-            peak_start = i
-        elif s <= threshold and peak_start is not None:
-            if np.any((peaks[:,0] >= peak_start) & (peaks[:,0] <= i)):
-                peaks_ind.append((peak_start, i))
-            peak_start = None
-    return np.array(peaks_ind)
+    return domains_with_peaks(threshold_domains(see, threshold), peaks[:,0])
 
 def segment_only_with_len_filter_and_thus_deprecated_should_not_be_used(signal: np.ndarray, domains: np.ndarray, len_filter: int):
     """
@@ -132,14 +480,96 @@ def segment_only_with_len_filter_and_thus_deprecated_should_not_be_used(signal:
         mask[start - comp:end - comp] = True
     return np.where(mask, signal, 0)
 
-def segment(signal: np.ndarray, domains: np.ndarray, comp: Callable[[int], int]):
+def segment(signal: np.ndarray, domains: np.ndarray, comp: Callable[[np.ndarray], np.ndarray], out: tuple[np.ndarray, np.ndarray]|None = None):
     """
     @author: Gerrald
     @date: 10-12-2025
+
+    Cut the domains out of a signal.
+
+    Args:
+        signal (np.ndarray): The signal.
+        domains (np.ndarray): The (start, end) domains.
+        comp (Callable[[np.ndarray], np.ndarray]): Converts an array of indices of the domains to indices in the signal.
+        out (tuple[np.ndarray, np.ndarray] | None, optional): Buffers for the results, see SegmentBuffers. The results are views on them.
+            If None, new arrays are made. Defaults to None.
+
+    Raises:
+        ValueError: If the buffers are too small.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The signal with zeros outside the domains and the concatenation of the domains.
     """
-    mask = np.zeros(len(signal), dtype=bool)
-    concatenated = []
-    for start, end in domains:
-        mask[comp(start):comp(end)] = True
-        concatenated.extend(signal[comp(start):comp(end)])
-    return np.where(mask, signal, 0), np.array(concatenated) 
\ No newline at end of file
+    n = len(signal)
+    domains = np.asarray(domains, dtype=np.int64).reshape(-1, 2)
+    # The same bounds as the slice signal[comp(start):comp(end)]
+    bounds = np.asarray(comp(domains), dtype=np.int64).reshape(-1, 2)
+    bounds = np.clip(np.where(bounds < 0, bounds + n, bounds), 0, n)
+    starts, ends = bounds[:,0], bounds[:,1]
+    lengths = np.maximum(ends - starts, 0)
+    total = int(np.sum(lengths))
+
+    if out is None:
+        segmented = np.empty(signal.shape, dtype=signal.dtype)
+        concatenated = np.empty((total,) + signal.shape[1:], dtype=signal.dtype)
+    else:
+        segmented, concatenated = out
+        if len(segmented) < n or len(concatenated) < total:
+            raise ValueError(f"The buffers of {len(segmented)} and {len(concatenated)} samples are too small for {n} and {total} samples")
+        segmented, concatenated = segmented[:n], concatenated[:total]
+
+    mask_starts, mask_ends = starts[lengths > 0], ends[lengths > 0]
+    if np.all(mask_starts[1:] >= mask_ends[:-1]):
+        # Sorted domains that do not overlap, the mask consists of runs outside and inside the domains
+        runs = np.empty(2 * len(mask_starts) + 1, dtype=np.int64)
+        runs[0::2] = np.append(mask_starts, n) - np.insert(mask_ends, 0, 0)
+        runs[1::2] = mask_ends - mask_starts
+        mask = np.repeat(np.arange(len(runs)) % 2 == 1, runs)
+    else:
+        # The running sum of the starts and ends is positive inside a domain
+        edges = np.zeros(n + 1, dtype=np.int32)
+        np.add.at(edges, mask_starts, 1)
+        np.add.at(edges, mask_ends, -1)
+        mask = np.cumsum(edges[:-1]) > 0
+    segmented[...] = 0
+    np.copyto(segmented, signal, where=mask.reshape((n,) + (1,) * (signal.ndim - 1)))
+
+    # The index in the signal of every sample of the concatenation
+    index = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    np.take(signal, index, axis=0, out=concatenated)
+    return segmented, concatenated
+
+class SegmentBuffers:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Output buffers for segment that are reused for the next signals, and only grow when a longer signal comes along.
+
+    The results of segment are views on these buffers, so they are overwritten by the next segment with the same name.
+    """
+    def __init__(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.buffers = {}
+
+    def get(self, name: str, signal: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            name (str): The name of the result.
+            signal (np.ndarray): The signal that will be segmented.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The buffers for the segmented signal and the concatenation.
+                Both are as long as the signal, which is the maximum length of a concatenation of domains that do not overlap.
+        """
+        buffers = self.buffers.get(name)
+        if buffers is None or buffers[0].dtype != signal.dtype or buffers[0].shape[1:] != signal.shape[1:] or len(buffers[0]) < len(signal):
+            buffers = (np.empty(signal.shape, dtype=signal.dtype), np.empty(signal.shape, dtype=signal.dtype))
+            self.buffers[name] = buffers
+        return buffers 
\ No newline at end of file
@@ -1,8 +1,8 @@
 from scipy import signal
 import numpy as np
 from math import floor
-from joblib import Memory
-memory = Memory("./_cache")
+from lib.processing.convolution import convolve
+from lib.processing.kernels import kernel_cache
 
 def construct_bandpass_filter(low: float, high: float, Fs: int, order: int = 2, size: int = 2000):
     """
@@ -10,6 +10,7 @@ def construct_bandpass_filter(low: float, high: float, Fs: int, order: int = 2,
     @date: 10-12-2025
 
     Construct a bandpass non-causal Butterworth filter with a phase of 0.
+    The filter is designed once per set of parameters and then taken from the kernel cache, see lib.processing.kernels.
 
     Args:
         low (float): The lower cutoff frequency in Hz.
@@ -19,14 +20,15 @@ def construct_bandpass_filter(low: float, high: float, Fs: int, order: int = 2,
         size (int, optional): The length of the filter minus 1. Defaults to 2000.
 
     Returns:
-        g (np.ndarray): returns the filter with length of size+1.
+        g (np.ndarray): returns the (read-only) filter with length of size+1.
     
     """
-    resolution = floor(size/2)
+    def design():
+        resolution = floor(size/2)
+        b, a = signal.butter(order, [2*low/Fs, 2*high/Fs], btype="band")
+        return signal.filtfilt(b, a, [*np.zeros(resolution), 1, *np.zeros(resolution)])
     
-    b, a = signal.butter(order, [2*low/Fs, 2*high/Fs], btype="band")
-    g = signal.filtfilt(b, a, [*np.zeros(resolution), 1, *np.zeros(resolution)])
-    return g
+    return kernel_cache.get(("bandpass", float(low), float(high), int(Fs), int(order), int(size)), design)
 
 def construct_lowpass_filter(fc: float, Fs: int, order: int = 2, size: int = 2000):
     """
@@ -34,6 +36,7 @@ def construct_lowpass_filter(fc: float, Fs: int, order: int = 2, size: int = 200
     @date: 10-12-2025
 
     Construct a lowpass non-causal Butterworth filter with a phase of 0.
+    The filter is designed once per set of parameters and then taken from the kernel cache, see lib.processing.kernels.
 
     Args:
         fc (float): The cutoff frequency in Hz.
@@ -42,32 +45,36 @@ def construct_lowpass_filter(fc: float, Fs: int, order: int = 2, size: int = 200
         size (int, optional): The length of the filter minus 1. Defaults to 2000.
 
     Returns:
-        g (np.ndarray): returns the filter with length of size+1.
+        g (np.ndarray): returns the (read-only) filter with length of size+1.
     
     """
-    resolution = floor(size/2)
+    def design():
+        resolution = floor(size/2)
+        b, a = signal.butter(order, fc, btype="lowpass", fs=Fs)
+        return signal.filtfilt(b, a, [*np.zeros(resolution), 1, *np.zeros(resolution)])
     
-    b, a = signal.butter(order, fc, btype="lowpass", fs=Fs)
-    g = signal.filtfilt(b, a, [*np.zeros(resolution), 1, *np.zeros(resolution)])
-    return g
+    return kernel_cache.get(("lowpass", float(fc), int(Fs), int(order), int(size)), design)
 
-@memory.cache
-def apply_filter(x: list|np.ndarray, g: list|np.ndarray):
+def apply_filter(x: list|np.ndarray, g: list|np.ndarray, method: str = "auto"):
     """
     @author: Gerrald
-    @date: 10-12-2025
+    @date: 18-10-2026
 
     Filter x through g by convolution.
+    
+    The result is the full convolution (length len(x)+len(g)-1), so the delay of the zero-phase filters in this file stays len(g)/2 samples.
+    Long signals are convolved with FFTs (overlap-add/overlap-save), see `lib.processing.convolution.convolve`.
 
     Args:
         x (list | np.ndarray): The signal.
         g (list | np.ndarray): The filter.
+        method (str, optional): The convolution method: `auto`, `direct`, `fft`, `overlap-add` or `overlap-save`. Defaults to `auto`.
 
     Returns:
         y (np.ndarray): The result.
     
     """
-    return np.convolve(x, g)
+    return convolve(x, g, method)
 
 def downsample(x: list|np.ndarray, Fs_original:int, Fs_target: int):
     """
@@ -0,0 +1,152 @@
+from collections import OrderedDict
+from hashlib import sha1
+from os import replace, getpid
+from pathlib import Path
+from typing import Callable
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+
+class KernelCache:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Least recently used cache for filter kernels, keyed on the design parameters of the filter.
+
+    Designing a kernel runs filtfilt over an impulse of the whole kernel length, while the same few kernels
+    are needed for every file and every beat. The kernels are returned read-only, because every caller shares them.
+    With a path, the kernels are also saved as .npy files, so other processes and later runs can load them instead of designing them.
+    """
+    def __init__(self, max_size: int = 32, path: str|Path|None = None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            max_size (int, optional): The maximum amount of kernels in memory. Defaults to 32.
+            path (str | Path | None, optional): The folder to save the kernels in. If None, kernels are only kept in memory. Defaults to None.
+        """
+        self.kernels = OrderedDict()
+        self.max_size = max_size
+        self.path = None if path is None else Path(path)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        return len(self.kernels)
+
+    def get(self, key: tuple, design: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns the kernel of key, designing it only if it is not in memory or on disk.
+
+        Args:
+            key (tuple): The type of the filter and its design parameters, e.g. ("bandpass", low, high, Fs, order, size).
+            design (Callable[[], np.ndarray]): Designs the kernel.
+
+        Returns:
+            np.ndarray: The read-only kernel.
+        """
+        kernel = self.kernels.get(key)
+        if kernel is not None:
+            self.kernels.move_to_end(key)
+            self.hits += 1
+            return kernel
+
+        file_path = self._file_path(key)
+        if file_path is not None and file_path.exists():
+            kernel = np.load(file_path)
+            self.disk_hits += 1
+        else:
+            kernel = np.asarray(design(), dtype=np.float64)
+            self.misses += 1
+            if file_path is not None:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temporary file first, so other processes never load a partly written kernel
+                tmp_path = file_path.with_name(f"{file_path.stem}.{getpid()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    np.save(f, kernel)
+                replace(tmp_path, file_path)
+
+        kernel.flags.writeable = False
+        self.kernels[key] = kernel
+        self._evict()
+        return kernel
+
+    def resize(self, max_size: int):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            max_size (int): The new maximum amount of kernels in memory, the least recently used kernels are dropped.
+        """
+        self.max_size = max_size
+        self._evict()
+
+    def clear(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Drop all kernels from memory (not from disk) and reset the counters.
+        """
+        self.kernels.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            dict[str, int]: The amount of hits in memory, hits on disk, misses and kernels in memory.
+        """
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self.kernels)}
+
+    def _evict(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        while len(self.kernels) > max(self.max_size, 0):
+            self.kernels.popitem(last=False)
+
+    def _file_path(self, key: tuple) -> Path|None:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            key (tuple): The key of the kernel.
+
+        Returns:
+            Path | None: The file of the kernel, or None without persistence.
+        """
+        if self.path is None:
+            return None
+        return self.path / f"{key[0]}-{sha1(repr(key).encode()).hexdigest()[:16]}.npy"
+
+kernel_cache = KernelCache()
+
+def configure_kernel_cache(config: ConfigParser):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Apply the Cache section of the config to the shared kernel cache.
+
+    Args:
+        config (ConfigParser): The config object.
+    """
+    kernel_cache.resize(config.Cache.KernelCacheSize)
+    path = str(config.Cache.KernelCachePath)
+    kernel_cache.path = None if path.lower() == "none" else Path(path)
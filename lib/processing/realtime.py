@@ -0,0 +1,244 @@
+from threading import Condition, Thread, Event
+from time import perf_counter, sleep
+import numpy as np
+
+from lib.os.wavUtils import MappedWav
+
+class RingBuffer:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Fixed size multichannel buffer between a sound source (writer thread) and a detector (reader).
+
+    A sound source cannot wait for the reader, so when the buffer is full the oldest frames are overwritten and counted in `overflows`.
+    """
+    def __init__(self, capacity: int, channels: int = 1):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            capacity (int): The maximum amount of frames in the buffer.
+            channels (int, optional): The amount of channels per frame. Defaults to 1.
+        """
+        self.data = np.zeros((capacity, channels))
+        self.capacity = capacity
+        self.channels = channels
+        # Total amount of frames written and read, the positions in the buffer are these modulo the capacity
+        self.written = 0
+        self.read_count = 0
+        self.overflows = 0
+        self.closed = False
+        self.condition = Condition()
+
+    def __len__(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        return self.written - self.read_count
+
+    def write(self, frames: np.ndarray, wait: bool = False):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Append frames to the buffer.
+
+        Args:
+            frames (np.ndarray): The frames, with shape (n,) for one channel or (n, channels).
+            wait (bool, optional): Whether to wait for free space instead of overwriting the oldest frames,
+                for sources that are not bound to real time. Defaults to False.
+        """
+        frames = np.asarray(frames).reshape(len(frames), -1)
+        with self.condition:
+            if wait:
+                self.condition.wait_for(lambda: self.capacity - len(self) >= min(len(frames), self.capacity) or self.closed)
+            # Frames that do not fit at all are skipped directly
+            skipped = max(0, len(frames) - self.capacity)
+            frames = frames[skipped:]
+            self.written += skipped
+
+            start = self.written % self.capacity
+            n_first = min(len(frames), self.capacity - start)
+            self.data[start:start + n_first] = frames[:n_first]
+            self.data[:len(frames) - n_first] = frames[n_first:]
+            self.written += len(frames)
+
+            lost = len(self) - self.capacity
+            if lost > 0:
+                self.overflows += lost
+                self.read_count += lost
+            self.condition.notify_all()
+
+    def read(self, n: int, timeout: float|None = None) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Take n frames from the buffer, waiting until they are available.
+
+        Args:
+            n (int): The amount of frames.
+            timeout (float | None, optional): The maximum time to wait (s). If None, wait until the frames are available
+                or the buffer is closed. Defaults to None.
+
+        Returns:
+            np.ndarray: The frames with shape (m, channels). m is smaller than n if the buffer was closed or the timeout passed.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: len(self) >= n or self.closed, timeout)
+            n = min(n, len(self))
+            start = self.read_count % self.capacity
+            indices = (start + np.arange(n)) % self.capacity
+            frames = self.data[indices]
+            self.read_count += n
+            self.condition.notify_all()
+            return frames
+
+    def close(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Mark the end of the stream, waiting readers get the remaining frames.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+class WavReplaySource:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Sound source that plays a wav file into a ring buffer at real time, to run the real-time detector without audio hardware.
+    """
+    def __init__(self, file_path: str, block_duration: float = 0.01, speed: float = 1.0):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            file_path (str): The path to the wav file.
+            block_duration (float, optional): The duration of the blocks that are written at once (s). Defaults to 0.01.
+            speed (float, optional): The playback speed relative to real time. If 0, the file is written as fast as the reader can keep up. Defaults to 1.0.
+        """
+        self.file_path = file_path
+        self.wav = MappedWav(file_path)
+        self.Fs, self.x = self.wav.Fs, self.wav.data
+        self.channels = self.wav.channels
+        self.block_size = max(1, int(block_duration * self.Fs))
+        self.speed = speed
+        self.thread = None
+        self.ring = None
+        self.stopped = Event()
+
+    def start(self, ring: RingBuffer):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Start playing into the ring buffer. The ring buffer is closed at the end of the file.
+
+        Args:
+            ring (RingBuffer): The buffer to write to.
+        """
+        self.stopped.clear()
+        self.ring = ring
+        self.thread = Thread(target=self._play, args=(ring,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.stopped.set()
+        if self.ring is not None:
+            # Wake up the player if it waits for free space in the buffer
+            self.ring.close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _play(self, ring: RingBuffer):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Write the blocks of the file on the moments they would arrive from a microphone.
+
+        Args:
+            ring (RingBuffer): The buffer to write to.
+        """
+        t_start = perf_counter()
+        for start in range(0, len(self.x), self.block_size):
+            if self.stopped.is_set():
+                break
+            if self.speed > 0:
+                # The block is available once its last sample has been recorded, schedule from the start to prevent drift
+                wait = t_start + (start + self.block_size) / self.Fs / self.speed - perf_counter()
+                if wait > 0:
+                    sleep(wait)
+            ring.write(self.x[start:start + self.block_size], wait=self.speed == 0)
+        ring.close()
+
+class SoundDeviceSource:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Sound source that records from an audio input device with sounddevice.
+    """
+    def __init__(self, Fs: int, channels: int = 1, device: int|str|None = None, block_duration: float = 0.01):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            Fs (int): The sampling frequency (Hz).
+            channels (int, optional): The amount of channels to record. Defaults to 1.
+            device (int | str | None, optional): The input device, see sounddevice.query_devices. If None, the default device is used. Defaults to None.
+            block_duration (float, optional): The duration of the blocks delivered by the device (s). Defaults to 0.01.
+        """
+        self.Fs = Fs
+        self.channels = channels
+        self.device = device
+        self.block_size = max(1, int(block_duration * Fs))
+        self.stream = None
+        self.status_flags = 0
+
+    def start(self, ring: RingBuffer):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Start recording into the ring buffer.
+
+        Args:
+            ring (RingBuffer): The buffer to write to.
+        """
+        # Only needed when recording, so the detector also works without the PortAudio library
+        import sounddevice as sd
+
+        def callback(indata, frames, time, status):
+            if status:
+                self.status_flags += 1
+            ring.write(indata)
+
+        self.ring = ring
+        self.stream = sd.InputStream(samplerate=self.Fs, channels=self.channels, device=self.device, blocksize=self.block_size, callback=callback)
+        self.stream.start()
+
+    def stop(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+            self.ring.close()
@@ -0,0 +1,119 @@
+from fractions import Fraction
+from scipy import signal
+import numpy as np
+
+from lib.processing.convolution import convolve
+from lib.processing.functions import construct_bandpass_filter
+
+def rational_factors(Fs_original: int, Fs_target: int) -> tuple[int, int]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Returns the smallest up- and downsampling factors to convert Fs_original Hz to Fs_target Hz.
+
+    Args:
+        Fs_original (int): The original sampling frequency (Hz).
+        Fs_target (int): The sampling frequency to convert to (Hz).
+
+    Returns:
+        tuple[int, int]: up, down such that Fs_target = Fs_original * up / down.
+    """
+    ratio = Fraction(Fs_target) / Fraction(Fs_original)
+    return ratio.numerator, ratio.denominator
+
+def polyphase_decimate(x: np.ndarray, g: np.ndarray, M: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Filter x through g and keep every M-th sample, without computing the samples that are thrown away.
+
+    The filter and the signal are split in M phases: g_p[j] = g[jM+p] and x_p[m] = x[mM-p].
+    The decimated output is the sum of the convolutions of the phases, y[nM] = sum_p (g_p * x_p)[n],
+    so every convolution is M times shorter and the total work is M times less than filtering first.
+
+    Args:
+        x (np.ndarray): The signal.
+        g (np.ndarray): The filter.
+        M (int): The downsampling factor.
+
+    Returns:
+        np.ndarray: Equal to apply_filter(x, g)[::M].
+    """
+    x = np.asarray(x)
+    g = np.asarray(g)
+    out_length = (len(x) + len(g) - 2) // M + 1
+    if M == 1:
+        return convolve(x, g)
+
+    y = np.zeros(out_length)
+    for p in range(min(M, len(g))):
+        g_p = g[p::M]
+        # x_p[0] = x[-p] is before the start of the signal for p > 0
+        x_p = x[0::M] if p == 0 else np.concatenate(([0], x[M - p::M]))
+        if len(x_p) == 0:
+            continue
+        y_p = convolve(x_p, g_p)
+        n = min(len(y_p), out_length)
+        y[:n] += y_p[:n]
+    return y
+
+def resample_rational(x: np.ndarray, g: np.ndarray, up: int, down: int) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Upsample x by up, filter it through g and downsample it by down, with a polyphase implementation that only
+    computes the output samples that are kept.
+
+    Args:
+        x (np.ndarray): The signal.
+        g (np.ndarray): The filter, designed for the upsampled sampling frequency.
+        up (int): The upsampling factor.
+        down (int): The downsampling factor.
+
+    Returns:
+        np.ndarray: The resampled signal. Sample n corresponds to sample n*down/up of x, delayed by len(g)/2 samples of the upsampled signal.
+    """
+    # Zero-stuffing divides the energy by up, so compensate the gain of the filter
+    return signal.upfirdn(g * up, np.asarray(x, dtype=np.float64), up, down)
+
+def bandpass_downsample(x: np.ndarray, low: float, high: float, Fs_original: int, Fs_target: int, order: int = 2, size: int = 2000) -> tuple[np.ndarray, np.ndarray, int, int]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Bandpass filter x and convert it from Fs_original Hz to Fs_target Hz in one step.
+
+    Combines construct_bandpass_filter, apply_filter and downsample, but only the samples that are kept are computed.
+    If Fs_original is not a multiple of Fs_target, a rational resampler is used with the bandpass filter as anti-aliasing filter.
+
+    Args:
+        x (np.ndarray): The signal.
+        low (float): The lower cutoff frequency in Hz.
+        high (float): The higher cutoff frequency in Hz.
+        Fs_original (int): The original sampling frequency (Hz).
+        Fs_target (int): The sampling frequency to convert to (Hz).
+        order (int, optional): Half the order of the filter. Defaults to 2.
+        size (int, optional): The length of the filter minus 1, at Fs_original. Defaults to 2000.
+
+    Raises:
+        ValueError: If the higher cutoff frequency is above the Nyquist frequency of Fs_target.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, int, int]: The resampled signal, the filter, up, down.
+            The filter is designed at Fs_original*up Hz, so its delay is len(g)/2/up samples of x.
+    """
+    if high >= Fs_target / 2:
+        raise ValueError(f"The higher cutoff frequency {high} Hz does not prevent aliasing at {Fs_target} Hz")
+
+    up, down = rational_factors(Fs_original, Fs_target)
+
+    g = construct_bandpass_filter(low, high, Fs_original * up, order=order, size=size * up)
+    if up == 1:
+        y = polyphase_decimate(x, g, down)
+    else:
+        y = resample_rational(x, g, up, down)
+
+    return y, g, up, down
@@ -0,0 +1,227 @@
+from collections import OrderedDict
+from hashlib import sha1
+from os import replace, utime, getpid
+from pathlib import Path
+from typing import Callable
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+
+class SignalCache:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Disk cache for intermediate signals of the pipeline, e.g. the filtered recording and the envelope.
+
+    The key is made from the path, modification time and size of the source file plus the stage and its parameters,
+    so the samples never have to be hashed. Every signal is one .npy file in the cache folder, which is loaded memory mapped.
+    When the folder grows over its size cap, the least recently used files are removed. Other processes may use
+    the same folder, the folder is scanned before evicting so the cap holds for all of them together.
+    """
+    def __init__(self, path: str|Path|None = None, max_bytes: int = 2**30):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            path (str | Path | None, optional): The cache folder. If None, nothing is cached. Defaults to None.
+            max_bytes (int, optional): The maximum total size of the cached signals (bytes). Defaults to 2**30.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.bytes_evicted = 0
+        self.set_path(path)
+
+    def set_path(self, path: str|Path|None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Use another cache folder, the files already in it are indexed from least to most recently used.
+
+        Args:
+            path (str | Path | None): The cache folder. If None, nothing is cached.
+        """
+        self.path = None if path is None else Path(path)
+        self.files = OrderedDict()
+        self._scan()
+
+    @property
+    def size(self) -> int:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            int: The total size of the cached signals (bytes).
+        """
+        return sum(self.files.values())
+
+    def key(self, file_path: str|Path, stage: str, params: tuple) -> str:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            file_path (str | Path): The source file the signal is computed from.
+            stage (str): The name of the stage that computes the signal.
+            params (tuple): The parameters of the stage and of the stages before it.
+
+        Returns:
+            str: The key of the signal, which changes when the file is modified.
+        """
+        file_path = Path(file_path).resolve()
+        stat = file_path.stat()
+        digest = sha1(repr((str(file_path), stat.st_mtime_ns, stat.st_size, stage, params)).encode()).hexdigest()
+        return f"{stage}-{digest[:24]}"
+
+    def get(self, key: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns the cached signal of key, or computes and caches it.
+
+        Args:
+            key (str): The key, see `key`.
+            compute (Callable[[], np.ndarray]): Computes the signal.
+
+        Returns:
+            np.ndarray: The signal, read-only and memory mapped if it came from the cache.
+        """
+        if self.path is None:
+            return compute()
+
+        file_path = self.path / f"{key}.npy"
+        try:
+            x = np.load(file_path, mmap_mode="r")
+        except (OSError, ValueError):
+            # Not cached, removed by another process or a partly written file of a crashed run
+            x = None
+        if x is not None:
+            self.hits += 1
+            self.bytes_read += x.nbytes
+            self.files[file_path.name] = file_path.stat().st_size
+            self.files.move_to_end(file_path.name)
+            # The modification time is the last use, so the order survives a restart
+            utime(file_path)
+            return x
+
+        self.misses += 1
+        x = np.asarray(compute())
+        self._store(file_path, x)
+        return x
+
+    def clear(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Remove all cached signals and reset the counters.
+        """
+        for name in list(self.files):
+            self._remove(name)
+        self.hits = self.misses = self.bytes_read = self.bytes_written = self.bytes_evicted = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            dict[str, int]: The amount of hits and misses, the bytes read from, written to and evicted from the cache,
+                and the current size of the cache (bytes).
+        """
+        return {"hits": self.hits, "misses": self.misses, "bytes_read": self.bytes_read, "bytes_written": self.bytes_written,
+                "bytes_evicted": self.bytes_evicted, "size": self.size}
+
+    def _store(self, file_path: Path, x: np.ndarray):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Write a signal to the cache and evict the least recently used signals when the cache is too large.
+
+        Args:
+            file_path (Path): The file of the signal.
+            x (np.ndarray): The signal.
+        """
+        if x.nbytes > self.max_bytes:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so other processes never load a partly written signal
+        tmp_path = file_path.with_name(f"{file_path.stem}.{getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, x)
+        replace(tmp_path, file_path)
+
+        size = file_path.stat().st_size
+        self.bytes_written += size
+        self.files[file_path.name] = size
+        self.files.move_to_end(file_path.name)
+        # Other processes may have written to the folder as well, so the cap is checked on the whole folder
+        self._scan()
+        total = self.size
+        while total > self.max_bytes:
+            name = next(iter(self.files))
+            total -= self.files[name]
+            self.bytes_evicted += self.files[name]
+            self._remove(name)
+
+    def _scan(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Index the files in the cache folder from least to most recently used. The modification time is the last use,
+        files used at the same moment keep their order in this process.
+        """
+        if self.path is None or not self.path.exists():
+            return
+        order = {name: i for i, name in enumerate(self.files)}
+        entries = []
+        for file in self.path.glob("*.npy"):
+            try:
+                stat = file.stat()
+            except OSError:
+                # Evicted by another process in the meantime
+                continue
+            entries.append((stat.st_mtime_ns, order.get(file.name, -1), file.name, stat.st_size))
+        self.files = OrderedDict((name, size) for _, _, name, size in sorted(entries))
+
+    def _remove(self, name: str):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            name (str): The file name of the signal.
+        """
+        del self.files[name]
+        try:
+            (self.path / name).unlink(missing_ok=True)
+        except OSError:
+            # Still memory mapped somewhere (Windows), it will be evicted again in a later run
+            pass
+
+signal_cache = SignalCache()
+
+def configure_signal_cache(config: ConfigParser):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Apply the Cache section of the config to the shared signal cache.
+
+    Args:
+        config (ConfigParser): The config object.
+    """
+    path = str(config.Cache.SignalCachePath)
+    path = None if path.lower() == "none" else Path(path)
+    if path != signal_cache.path:
+        signal_cache.set_path(path)
+    signal_cache.max_bytes = int(config.Cache.SignalCacheSize * 2**20)
@@ -0,0 +1,212 @@
+from typing import Sequence
+import numpy as np
+from scipy.fft import rfft
+from scipy.signal import ShortTimeFFT
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Bands with at most this many bins are computed with a DFT matrix instead of the FFT of all bins
+BASIS_BINS = 24
+
+class MultichannelSTFT:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The STFT of all channels of a recording in one call, the same as ShortTimeFFT.stft of every channel.
+
+    The window, the scaling and the selected bins are prepared once (the plan). The frames are taken as views of one zero padded
+    copy of the channels and transformed in blocks, so the temporary arrays stay small, and every block is written
+    into one (channels, bins, frames) output, which can be preallocated and reused. For a narrow band only the bins in it are
+    computed, with a DFT matrix of the windowed frames.
+    """
+    def __init__(self, sft: ShortTimeFFT, band: tuple[float, float]|None = None, dtype: type = np.complex64, frames_per_block: int = 512):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            sft (ShortTimeFFT): The window, hop, FFT length, scaling and phase shift, with fft_mode "onesided" or "onesided2X".
+            band (tuple[float, float] | None, optional): The lowest and highest frequency to compute (Hz). If None, all bins. Defaults to None.
+            dtype (type, optional): The complex type of the output. Defaults to np.complex64.
+            frames_per_block (int, optional): The amount of frames transformed at once. Defaults to 512.
+
+        Raises:
+            ValueError: If the fft mode or window is not supported, or no bin is in the band.
+        """
+        if sft.fft_mode not in ("onesided", "onesided2X"):
+            raise ValueError(f"Only the one-sided STFT of real signals is supported, got fft_mode {sft.fft_mode}")
+        if np.iscomplexobj(sft.win):
+            raise ValueError("Only real windows are supported")
+
+        self.sft = sft
+        self.dtype = dtype
+        self.frames_per_block = frames_per_block
+
+        freqs = sft.f
+        self.bins = np.arange(len(freqs)) if band is None else np.flatnonzero((freqs >= band[0]) & (freqs <= band[1]))
+        if len(self.bins) == 0:
+            raise ValueError(f"No bins between {band[0]} and {band[1]} Hz")
+        self.f = freqs[self.bins]
+
+        # The scaled window, and per bin the doubling of onesided2X and the phase shift
+        self.window = np.asarray(sft.win, dtype=np.float64)
+        self.factors = np.ones(len(self.bins), dtype=np.complex128)
+        if sft.fft_mode == "onesided2X":
+            paired = (self.bins > 0) & ((self.bins < len(freqs) - 1) | (sft.mfft % 2 == 1))
+            self.factors[paired] = np.sqrt(2) if sft.scaling == "psd" else 2
+        if sft.phase_shift is not None:
+            # ShortTimeFFT rolls the zero padded frame, a circular shift is a phase per bin
+            shift = (sft.phase_shift + sft.m_num_mid) % sft.m_num
+            self.factors *= np.exp(2j*np.pi * self.bins * shift / sft.mfft)
+
+        self.basis = None
+        if len(self.bins) < len(freqs) and len(self.bins) <= BASIS_BINS:
+            m = np.arange(sft.m_num)
+            basis = self.window[:,None] * np.exp(-2j*np.pi * np.outer(m, self.bins) / sft.mfft) * self.factors
+            # Real and imaginary part separately, so the frames are multiplied as real matrices
+            self.basis = (np.ascontiguousarray(basis.real), np.ascontiguousarray(basis.imag))
+
+    @classmethod
+    def from_window(cls, win_param, fs: float, nperseg: int, noverlap: int, band: tuple[float, float]|None = None,
+                    dtype: type = np.complex64, **kwargs) -> "MultichannelSTFT":
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            win_param: The window, see ShortTimeFFT.from_window.
+            fs (float): The sampling frequency (Hz).
+            nperseg (int): The length of the window.
+            noverlap (int): The overlap of the windows.
+            band (tuple[float, float] | None, optional): The frequencies to compute, see __init__. Defaults to None.
+            dtype (type, optional): The complex type of the output. Defaults to np.complex64.
+            kwargs: The other arguments of ShortTimeFFT.from_window, e.g. scale_to.
+
+        Returns:
+            MultichannelSTFT: The STFT.
+        """
+        return cls(ShortTimeFFT.from_window(win_param, fs, nperseg, noverlap, **kwargs), band, dtype)
+
+    def shape(self, n_channels: int, n: int) -> tuple[int, int, int]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            n_channels (int): The amount of channels.
+            n (int): The amount of samples per channel.
+
+        Returns:
+            tuple[int, int, int]: The shape of the STFT, (channels, bins, frames).
+        """
+        p0, p1 = self.sft.p_range(n)
+        return (n_channels, len(self.bins), p1 - p0)
+
+    def allocate(self, n_channels: int, n: int) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            n_channels (int): The amount of channels.
+            n (int): The amount of samples per channel.
+
+        Returns:
+            np.ndarray: An output buffer for stft.
+        """
+        return np.empty(self.shape(n_channels, n), dtype=self.dtype)
+
+    def stft(self, x: np.ndarray|Sequence[np.ndarray], out: np.ndarray|None = None, scale: float = 1.0) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            x (np.ndarray | Sequence[np.ndarray]): The channels, with shape (channels, samples), e.g. the transposed data of a MappedWav,
+                or a list of channels of the same length, which are not stacked first. A 1D signal is one channel.
+            out (np.ndarray | None, optional): The output buffer, see allocate. If None, a new array is made. Defaults to None.
+            scale (float, optional): A factor for all samples, e.g. 1/full_scale for raw integer samples. Defaults to 1.0.
+
+        Raises:
+            ValueError: If the channels do not have the same length or the output buffer has the wrong shape or type.
+
+        Returns:
+            np.ndarray: The STFT with shape (channels, bins, frames), or (bins, frames) for a 1D signal.
+        """
+        single = isinstance(x, np.ndarray) and x.ndim == 1
+        channels = [x] if single else list(x)
+        n = len(channels[0])
+        if any(len(channel) != n for channel in channels):
+            raise ValueError("All channels must have the same length")
+        shape = self.shape(len(channels), n)
+        if out is None:
+            out = np.empty(shape, dtype=self.dtype)
+        elif out.shape != shape or out.dtype != self.dtype:
+            raise ValueError(f"The output buffer has shape {out.shape} and type {out.dtype}, expected {shape} and {np.dtype(self.dtype)}")
+
+        # Zero padded copy of the channels, the frames are views of it (see ShortTimeFFT._x_slices)
+        sft = self.sft
+        p0, p1 = sft.p_range(n)
+        k0 = p0 * sft.hop - sft.m_num_mid
+        k1 = k0 + (p1 - p0) * sft.hop + sft.m_num
+        i0, i1 = max(k0, 0), min(k1, n)
+        padded = np.zeros((len(channels), k1 - k0))
+        for c, channel in enumerate(channels):
+            padded[c, i0 - k0:i1 - k0] = channel[i0:i1]
+        if scale != 1.0:
+            padded *= scale
+        frames = sliding_window_view(padded, sft.m_num, axis=1)[:, ::sft.hop][:, :shape[2]]
+
+        for start in range(0, shape[2], self.frames_per_block):
+            block = frames[:, start:start + self.frames_per_block]
+            if self.basis is not None:
+                out[:, :, start:start + block.shape[1]].real = np.swapaxes(block @ self.basis[0], 1, 2)
+                out[:, :, start:start + block.shape[1]].imag = np.swapaxes(block @ self.basis[1], 1, 2)
+            else:
+                X = rfft(block * self.window, n=sft.mfft, axis=-1, overwrite_x=True)
+                if len(self.bins) < X.shape[-1]:
+                    X = X[:, :, self.bins]
+                out[:, :, start:start + block.shape[1]] = np.swapaxes(X * self.factors, 1, 2)
+        return out[0] if single else out
+
+    def spectrogram(self, x: np.ndarray|Sequence[np.ndarray], scale: float = 1.0) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            x (np.ndarray | Sequence[np.ndarray]): The channels, see stft.
+            scale (float, optional): A factor for all samples. Defaults to 1.0.
+
+        Returns:
+            np.ndarray: The squared magnitude of the STFT, see stft.
+        """
+        S = self.stft(x, scale=scale)
+        return S.real**2 + S.imag**2
+
+    def t(self, n: int) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            n (int): The amount of samples per channel.
+
+        Returns:
+            np.ndarray: The time of every frame (s).
+        """
+        return self.sft.t(n)
+
+    def extent(self, n: int) -> tuple[float, float, float, float]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            n (int): The amount of samples per channel.
+
+        Returns:
+            tuple[float, float, float, float]: The time and frequency range of the bins (s, Hz), for imshow.
+        """
+        t0, t1 = self.sft.extent(n)[:2]
+        return (t0, t1, self.f[0] - self.sft.delta_f/2, self.f[-1] + self.sft.delta_f/2)
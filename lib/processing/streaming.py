@@ -0,0 +1,332 @@
+from math import ceil
+import numpy as np
+from scipy import signal
+
+from lib.processing.resampling import polyphase_decimate
+from lib.processing.dataprocessing import threshold_edges
+
+class StreamingFilter:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Filter (and optionally downsample) a signal that arrives in blocks.
+
+    The output of every block is overlap-added with the tail of the previous block, so the concatenated outputs
+    are equal to apply_filter(x, g)[::M] of the whole signal.
+    """
+    def __init__(self, g: np.ndarray, M: int = 1):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            g (np.ndarray): The filter.
+            M (int, optional): The downsampling factor. Defaults to 1.
+        """
+        self.g = np.asarray(g)
+        self.M = M
+        self.tail = np.zeros(0)
+        self.finished = False
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Filter the next block of the signal.
+
+        Args:
+            block (np.ndarray): The next samples. Every block except the last must be a multiple of M long.
+
+        Raises:
+            ValueError: If a block that is not a multiple of M long was already processed.
+
+        Returns:
+            np.ndarray: The output samples that do not depend on later blocks anymore.
+        """
+        if len(block) == 0:
+            return np.zeros(0)
+        if self.finished:
+            raise ValueError(f"Only the last block may have a length that is not a multiple of {self.M}")
+        if len(block) % self.M != 0:
+            self.finished = True
+
+        y = polyphase_decimate(np.asarray(block, dtype=np.float64), self.g, self.M)
+        y[:len(self.tail)] += self.tail
+
+        n_done = ceil(len(block) / self.M)
+        self.tail = y[n_done:]
+        return y[:n_done]
+
+    def flush(self) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns the remaining output after the last block.
+
+        Returns:
+            np.ndarray: The tail of the filtered signal.
+        """
+        tail, self.tail = self.tail, np.zeros(0)
+        return tail
+
+class RunningStats:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Mean and standard deviation of a signal that arrives in blocks, merged per block with Chan's parallel algorithm.
+    """
+    def __init__(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, block: np.ndarray):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Add the next block of the signal.
+
+        Args:
+            block (np.ndarray): The next samples.
+        """
+        n = len(block)
+        if n == 0:
+            return
+        mean = np.mean(block)
+        m2 = np.sum((block - mean)**2)
+
+        count = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / count
+        self.m2 += m2 + delta**2 * self.count * n / count
+        self.count = count
+
+    def std(self, ddof: int = 0) -> float:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            ddof (int, optional): Delta degrees of freedom, like np.std. Defaults to 0.
+
+        Returns:
+            float: The standard deviation of all samples so far.
+        """
+        return float(np.sqrt(self.m2 / (self.count - ddof)))
+
+class PeakCandidates:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Collects the local maxima above a minimum height of a signal that arrives in blocks.
+
+    These are the peaks of signal.find_peaks(x, height=min_height) before the distance condition is applied,
+    so get_peaks for any height at or above min_height can be answered with select_by_peak_distance.
+    """
+    def __init__(self, min_height: float, store: bool = True):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            min_height (float): The minimum height of a candidate.
+            store (bool, optional): Whether to keep all candidates for `result`. Defaults to True.
+        """
+        self.min_height = min_height
+        self.store = store
+        # Samples of which it is not known yet whether they belong to a peak
+        self.carry = np.zeros(0)
+        self.offset = 0
+        self.peaks = []
+        self.heights = []
+
+    def process(self, block: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Search the next block of the signal for peaks.
+
+        Args:
+            block (np.ndarray): The next samples.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The indices and heights of the candidates that were found in this block.
+        """
+        if len(block) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        buffer = np.concatenate((self.carry, block))
+        peaks, properties = signal.find_peaks(buffer, height=self.min_height)
+        peaks = peaks.astype(np.int64) + self.offset
+        if self.store:
+            self.peaks.append(peaks)
+            self.heights.append(properties["peak_heights"])
+
+        # A peak (or flat peak) that reaches the end of the buffer is not reported yet, so keep the flat end
+        # and the sample before it to see whether it rises or falls in the next block.
+        changes = np.flatnonzero(buffer[1:] != buffer[:-1])
+        keep_from = changes[-1] if len(changes) > 0 else 0
+        self.carry = buffer[keep_from:]
+        self.offset += keep_from
+        return peaks, properties["peak_heights"]
+
+    def result(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The indices and heights of all candidates so far.
+        """
+        if not self.peaks:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate(self.peaks).astype(np.int64), np.concatenate(self.heights)
+
+def select_by_peak_distance(peaks: np.ndarray, heights: np.ndarray, distance: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The distance condition of signal.find_peaks: starting with the highest peak, remove all smaller peaks
+    closer than distance samples.
+
+    Args:
+        peaks (np.ndarray): The sorted indices of the peaks.
+        heights (np.ndarray): The heights of the peaks.
+        distance (float): The minimum distance between peaks (samples).
+
+    Returns:
+        np.ndarray: The indices of the remaining peaks.
+    """
+    distance = ceil(distance)
+    if len(peaks) < 2 or np.all(np.diff(peaks) >= distance):
+        return peaks
+
+    keep = np.ones(len(peaks), dtype=bool)
+    # Same order as scipy so that equal heights are resolved the same way
+    priority_to_position = np.argsort(heights)
+    for j in priority_to_position[::-1]:
+        if not keep[j]:
+            continue
+        k = j - 1
+        while k >= 0 and peaks[j] - peaks[k] < distance:
+            keep[k] = False
+            k -= 1
+        k = j + 1
+        while k < len(peaks) and peaks[k] - peaks[j] < distance:
+            keep[k] = False
+            k += 1
+    return peaks[keep]
+
+class OnlinePeakPicker:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The distance condition of signal.find_peaks for peaks that arrive one by one.
+
+    A candidate is confirmed once the signal has passed distance samples after it without a higher candidate.
+    This is the same as select_by_peak_distance, except when a removed peak would have removed another peak in a chain of close peaks.
+    """
+    def __init__(self, distance: float):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            distance (float): The minimum distance between peaks (samples).
+        """
+        self.distance = ceil(distance)
+        self.pending = None
+
+    def process(self, peaks: np.ndarray, heights: np.ndarray, position: int) -> list[int]:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Add the new candidates.
+
+        Args:
+            peaks (np.ndarray): The indices of the new candidates, in order.
+            heights (np.ndarray): The heights of the new candidates.
+            position (int): The first index at which later candidates can still be found.
+
+        Returns:
+            list[int]: The confirmed peaks.
+        """
+        confirmed = []
+        for peak, height in zip(peaks, heights):
+            if self.pending is not None and peak - self.pending[0] >= self.distance:
+                confirmed.append(self.pending[0])
+                self.pending = None
+            if self.pending is None or height > self.pending[1]:
+                self.pending = (int(peak), height)
+
+        if self.pending is not None and position - self.pending[0] >= self.distance:
+            confirmed.append(self.pending[0])
+            self.pending = None
+        return confirmed
+
+class ThresholdDomains:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Collects the intervals in which a signal that arrives in blocks is above a threshold, with the same edges as detect_peak_domains:
+    an interval starts at the first sample >= threshold and ends at the next sample <= threshold.
+    """
+    def __init__(self, threshold: float):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Args:
+            threshold (float): The threshold.
+        """
+        self.threshold = threshold
+        self.offset = 0
+        self.start = None
+        self.starts = []
+        self.ends = []
+
+    def process(self, block: np.ndarray):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Search the next block of the signal for intervals.
+
+        Args:
+            block (np.ndarray): The next samples.
+        """
+        starts, ends = threshold_edges(block, self.threshold, inside=self.start is not None)
+        starts = starts.astype(np.int64) + self.offset
+        if self.start is not None:
+            starts = np.concatenate(([self.start], starts))
+
+        self.starts.append(starts[:len(ends)])
+        self.ends.append(ends.astype(np.int64) + self.offset)
+        self.start = int(starts[-1]) if len(starts) > len(ends) else None
+        self.offset += len(block)
+
+    def result(self) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Returns:
+            np.ndarray: The (start, end) of all closed intervals so far. An interval that is still open at the end of the signal is dropped.
+        """
+        if not self.ends:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.column_stack((np.concatenate(self.starts), np.concatenate(self.ends)))
@@ -1,10 +1,10 @@
 import numpy as np
-from scipy.signal import ShortTimeFFT
 from scipy.signal.windows import gaussian
 from scipy.io import wavfile
 from pathlib import Path
 import matplotlib.pyplot as plt
-import soundfile as sf
+from lib.os.wavUtils import MappedWav
+from lib.processing.stft import MultichannelSTFT
 from loc import a_z
 from loc import mvdr_z
 from loc import music_z
@@ -17,7 +17,7 @@ from loc import generate_mic_positions
 if __name__ == "__main__":
     fs = 48000
     win = ('gaussian', 1e-2 * fs)
-    SFT = ShortTimeFFT.from_window(win, fs, nperseg = 256 ,noverlap=0, scale_to='magnitude', phase_shift=None)
+    SFT = MultichannelSTFT.from_window(win, fs, nperseg = 256 ,noverlap=0, scale_to='magnitude', phase_shift=None)
     path2source = Path(r"C:\Users\kkouk\IP3\2 source, distance 7 meter, microphone stand at 0 degrees, speaker at 7 degrees left and right.wav")
     #filepath1 = Path(r"C:\Users\kkouk\IP3\Project-Heart-EE2L1\samples\Linear array sample recordings\LinearArray-60-degrees\recording_2024-09-30_12-58-35_channel_1.wav")
     #filepath2 = Path(r"C:\Users\kkouk\IP3\Project-Heart-EE2L1\samples\Linear array sample recordings\LinearArray-60-degrees\recording_2024-09-30_12-58-35_channel_2.wav")
@@ -26,7 +26,8 @@ if __name__ == "__main__":
     #filepath5 = Path(r"C:\Users\kkouk\IP3\Project-Heart-EE2L1\samples\Linear array sample recordings\LinearArray-60-degrees\recording_2024-09-30_12-58-35_channel_5.wav")
     #filepath6 = Path(r"C:\Users\kkouk\IP3\Project-Heart-EE2L1\samples\Linear array sample recordings\LinearArray-60-degrees\recording_2024-09-30_12-58-35_channel_6.wav")
     
-    sources, rate = sf.read(path2source)
+    wav = MappedWav(path2source)
+    rate = wav.Fs
     #rate, signal1 = wavfile.read(filepath1)
     #rate, signal2 = wavfile.read(filepath2)
     #rate, signal3 = wavfile.read(filepath3)
@@ -34,26 +35,17 @@ if __name__ == "__main__":
     #rate, signal5 = wavfile.read(filepath5)
     #rate, signal6 = wavfile.read(filepath6)
     print ("ayo")
-    print (sources.shape)
+    print (wav.data.shape)
     #print(signal1.shape)
 
-    signal1 = sources[:,0]
-    signal2 = sources[:,1]
-    signal3 = sources[:,2]
-    signal4 = sources[:,3]
-    signal5 = sources[:,4]
-    signal6 = sources[:,5]
+    # Views on the mapped file, the channels are not copied
+    signal1, signal2, signal3, signal4, signal5, signal6 = wav.channel_views()[:6]
     
 
     
-    Sx1 = SFT.stft(signal1)
-    Sx2 = SFT.stft(signal2)
-    Sx3 = SFT.stft(signal3)
-    Sx4 = SFT.stft(signal4)
-    Sx5 = SFT.stft(signal5)
-    Sx6 = SFT.stft(signal6)
-
-    Sx_all=np.stack((Sx1,Sx2,Sx3,Sx4,Sx5,Sx6))
+
+    # Scale the raw samples to [-1, 1] like soundfile did
+    Sx_all = SFT.stft([signal1, signal2, signal3, signal4, signal5, signal6], scale=1/wav.full_scale)
     
     #print (Sx1.shape)
     print(Sx_all.shape)
@@ -0,0 +1,27 @@
+from lib.config.ConfigParser import ConfigParser
+from lib.model_optimize.ModelFitter import fit_recording
+
+MAX_TIME = 30
+WORKERS = -1
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Fit the model to every channel of a recording without the TUI, starting from model_params.csv.
+    The fitted parameters are written per channel as a csv that can be imported in the TUI with import_csv.
+    """
+    config = ConfigParser()
+    paths = [
+        ".\\samples\\stethoscope_2_realHeart_\\recording_2025-07-10_14-34-04_channel_1.wav",
+        ".\\samples\\stethoscope_2_realHeart_\\recording_2025-07-10_14-34-04_channel_2.wav",
+        ".\\samples\\stethoscope_2_realHeart_\\recording_2025-07-10_14-34-05_channel_3.wav",
+    ]
+    for channel, path in enumerate(paths, start=1):
+        result = fit_recording(path, config, warm_start=".\\src\\module_2\\model_params.csv",
+                               output=f".\\generated\\fits\\channel_{channel}.csv", max_time=MAX_TIME, workers=WORKERS)
+        print(f"Channel {channel}: {result.summary()}")
+
+if __name__ == "__main__":
+    main()
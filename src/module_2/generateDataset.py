@@ -0,0 +1,39 @@
+from lib.model.DatasetGenerator import DatasetGenerator
+from lib.model.Model import Model
+from lib.model.Model_3D import Point
+from lib.config.ConfigParser import ConfigParser
+
+N_BEATS = 20
+REPETITIONS = 5
+PARALLEL = True
+
+# Order of the valves: MTAP
+SOURCE_POSITIONS = {
+    "default": [Point(-1, 8, -15), Point(3, 12, -15), Point(6, 14, -15), Point(7, 9, -15)],
+    "deep": [Point(-1, 8, -20), Point(3, 12, -20), Point(6, 14, -20), Point(7, 9, -20)],
+    "shifted": [Point(1, 6, -15), Point(5, 10, -15), Point(8, 12, -15), Point(9, 7, -15)],
+}
+GEOMETRIES = {
+    "2x3": [Point(2.5, 5, 0), Point(2.5, 10, 0), Point(2.5, 15, 0),
+            Point(7.5, 5, 0), Point(7.5, 10, 0), Point(7.5, 15, 0)],
+    "4x4": [Point(2.5 * i, 5 * j, 0) for i in range(4) for j in range(4)],
+}
+
+def main():
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    Generate a dataset to benchmark localization, with the valves of model_params.csv.
+    """
+    config = ConfigParser()
+    model = Model(config)
+    model.import_csv(".\\src\\module_2\\model_params.csv")
+
+    generator = DatasetGenerator(config, SOURCE_POSITIONS, GEOMETRIES, bpms=[50, 66, 90], r_ratios=[0, 0.05], bpm_ratios=[0.05],
+                                 noise_levels=[0, 0.01, 0.05], n_beats=N_BEATS, repetitions=REPETITIONS, valves=model.valves)
+    manifest_path = generator.generate(parallel=PARALLEL)
+    print(f"Wrote {manifest_path}")
+
+if __name__ == "__main__":
+    main()
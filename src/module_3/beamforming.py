@@ -1,27 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 # array response, depends on angle of arrival
-def a_lin(theta, M, d, v, f0):
-    """
-    @author: Gerrald
-    @date: 10-12-2025
-
-    Returns the *array response* or *steering vector* for a Uniform Linear Microphone Array
-
-    Args:
-        theta (float): angle of arrival
-        M (int): number of microphones
-        d (float): distance between microphones (m)
-        v (float): speed of sound (m/s)
-        f0 (float): frequency of wave (Hz)
-
-    Returns:
-        np.ndarray: The array response
-    """  
-    """okay"""
-    result = np.array([ np.exp((0 -1*mic*(d/v)*np.sin(theta*np.pi/180)*2*np.pi*f0 *1j)) for mic in range (M)])
-
-    return result
+from lib.localization.steering import a_lin
 
 def test_a_lin():
     theta = 0
@@ -41,8 +21,8 @@ def spatial_spectrum(theta0):
     v = 340
     f0 = 500
     
-    power_out = np.array([ ( np.abs ((  np.dot(a_lin(theta, M, d, v, f0).conj().T,
-                          a_lin(theta0, M, d, v, f0))   )))**2 for theta in range (-90,90,1)  ]   )
+    # All angles at once, the steering vectors are columns
+    power_out = np.abs(a_lin(np.arange(-90,90), M, d, v, f0).conj().T @ a_lin(theta0, M, d, v, f0))**2
     
     x = np.arange(-90,90)
     y = power_out
@@ -58,8 +38,7 @@ def test_spatial_spectrum(theta0):
     f0 = 500
     d = (v*Delta/f0)
     
-    power_out = np.array([ ( np.abs ((  np.dot(a_lin(theta, M, d, v, f0).conj().T,
-                          a_lin(theta0, M, d, v, f0))   )))**2 for theta in range (-90,90,1)  ]   )
+    power_out = np.abs(a_lin(np.arange(-90,90), M, d, v, f0).conj().T @ a_lin(theta0, M, d, v, f0))**2
     theta = np.arange(-90,90)
     plt.plot(theta, power_out)
     plt.xlim(-90, 90)   
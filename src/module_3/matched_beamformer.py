@@ -4,11 +4,13 @@ from scipy.io.wavfile import write
 import winsound
 import wave 
 import os
+from lib.localization.steering import a_lin
+from lib.localization.beamformer import matched_spectrum
 def autocorr(th_range, M, d, v, f0):
     SNR = 10
     sigma_n = 10**(-SNR/20)
 
-    A = np.array([a_lin(angle, M, d, v, f0) for angle in th_range]).T  # (M,Q)
+    A = a_lin(np.asarray(th_range), M, d, v, f0)                       # (M,Q)
     R = A @ A.conj().T                                                 # (M,M)
 
     Rn = (sigma_n**2) * np.eye(M)                                      # (M,M)
@@ -16,29 +18,10 @@ def autocorr(th_range, M, d, v, f0):
     return Rx
 
 
-def a_lin(theta, M, d, v, f0):
-    """Returns the *array response* or *steering vector* for a Uniform Linear Microphone Array
-
-    Args:
-        theta (float): angle of arrival
-        M (int): number of microphones
-        d (float): distance between microphones (m)
-        v (float): speed of sound (m/s)
-        f0 (float): frequency of wave (Hz)
-
-    Returns:
-        np.ndarray: The array response
-    """  
-    """okay"""
-    result = np.array([ np.exp(-1*mic*(d/v)*np.sin(theta*np.pi/180)*2*np.pi*f0 *1j) for mic in range (M)])
-
-    return result
-
-
 def matchedbeamforming(th_range, M, d, v, f0, Rx):
     
     #Rx = autocorr(th_range, M, d, v, f0)
-    P = np.array([np.matmul(np.matmul(a_lin(angle, M, d, v, f0).conj().T , Rx), a_lin(angle, M, d, v, f0) ) for angle in th_range])
+    P = matched_spectrum(Rx, a_lin(np.asarray(th_range), M, d, v, f0)[:,:,None])[:,0]
     #P =np.array( [  1/(np.matmul(np.matmul(A[:,i].conj().T,np.linalg.inv(Rx)),A[:,i]))   for i in range (len(th_range)) ] )
     #print(f"A shape {A.shape}")
     #print(f"Complex conjugate shape {A.conj().T.shape}")
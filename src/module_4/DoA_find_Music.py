@@ -1,36 +1,34 @@
 import numpy as np
-from scipy.signal import ShortTimeFFT
 from scipy.signal.windows import gaussian
 from scipy.io import wavfile
 from pathlib import Path
 import matplotlib.pyplot as plt
-import soundfile as sf
-from exercise import a_lin
+from lib.os.wavUtils import MappedWav
+from lib.localization.steering import far_field_steering, ula_positions
+from lib.localization.music import music_spectrum, root_music
+from lib.localization.wideband import covariances, wideband_spectrum
+from lib.processing.stft import MultichannelSTFT
+
+# The band of the wideband spectrum (Hz)
+BAND = (500, 4000)
 
 def music(X, Q, M, d, v, f0):
 
     # X shape: (M, T)
     Rx = (X @ X.conj().T) / X.shape[1]
 
-    eigvals, eigvecs = np.linalg.eigh(Rx)  
-    Un = eigvecs[:, :M-Q]                   
-
     angles = np.linspace(-90, 90, 360)
-    P = []
-
-    for angle in angles:
-        a = a_lin(angle, M, d, v, f0).reshape(M,1)
-        denom = a.conj().T @ Un @ Un.conj().T @ a
-        P.append(1.0 / np.abs(denom[0,0]))
-
-    return np.array(P)
+    # The noise subspace once, all angles in one batched quadratic form
+    A = far_field_steering(ula_positions(M, d), angles, v, f0)
+    return music_spectrum(Rx, A, Q)[:,0]
 
 
 
 if __name__ == "__main__":
     fs = 48000
     win = ('gaussian', 1e-2 * fs)
-    SFT = ShortTimeFFT.from_window(win, fs, nperseg = 256 ,noverlap=0, scale_to='magnitude', phase_shift=None)
+    # Only the bins of the band are computed
+    SFT = MultichannelSTFT.from_window(win, fs, nperseg = 256 ,noverlap=0, band=BAND, scale_to='magnitude', phase_shift=None)
     #path2source = Path(r"C:\Users\kkouk\IP3\2 source, distance 7 meter, microphone stand at 0 degrees, speaker at 7 degrees left and right.wav")
     filepath1 = Path(r"C:\Users\kkouk\IP3\Project-Heart-EE2L1\samples\Linear array sample recordings\LinearArray-60-degrees\recording_2024-09-30_12-58-35_channel_1.wav")
     filepath2 = Path(r"C:\Users\kkouk\IP3\Project-Heart-EE2L1\samples\Linear array sample recordings\LinearArray-60-degrees\recording_2024-09-30_12-58-35_channel_2.wav")
@@ -40,12 +38,10 @@ if __name__ == "__main__":
     filepath6 = Path(r"C:\Users\kkouk\IP3\Project-Heart-EE2L1\samples\Linear array sample recordings\LinearArray-60-degrees\recording_2024-09-30_12-58-35_channel_6.wav")
     
     #sources, rate = sf.read(path2source)
-    rate, signal1 = wavfile.read(filepath1)
-    rate, signal2 = wavfile.read(filepath2)
-    rate, signal3 = wavfile.read(filepath3)
-    rate, signal4 = wavfile.read(filepath4)
-    rate, signal5 = wavfile.read(filepath5)
-    rate, signal6 = wavfile.read(filepath6)
+    wavs = [MappedWav(filepath) for filepath in (filepath1, filepath2, filepath3, filepath4, filepath5, filepath6)]
+    rate = wavs[0].Fs
+    # Views on the mapped files, the channels are not copied
+    signal1, signal2, signal3, signal4, signal5, signal6 = (wav.channel(0) for wav in wavs)
     print ("ayo")
     #print (sources.shape)
     print(signal1.shape)
@@ -56,38 +52,25 @@ if __name__ == "__main__":
     #signal4 = sources[:,3]
     #signal5 = sources[:,4]
     #signal6 = sources[:,5]
-    
 
-    
-    Sx1 = SFT.stft(signal1)
-    Sx2 = SFT.stft(signal2)
-    Sx3 = SFT.stft(signal3)
-    Sx4 = SFT.stft(signal4)
-    Sx5 = SFT.stft(signal5)
-    Sx6 = SFT.stft(signal6)
-
-    Sx_all=np.stack((Sx1,Sx2,Sx3,Sx4,Sx5,Sx6))
-    
-    #print (Sx1.shape)
+    # All channels in one call, without stacking them first
+    Sx_all = SFT.stft([signal1, signal2, signal3, signal4, signal5, signal6])
     print(Sx_all.shape)
 
     f_bins = SFT.f
-
-    Delta_f = f_bins[1] - f_bins[0]
-    print( Delta_f)
-    bin = 12
-    central_freq = bin*Delta_f
-    X = Sx_all[:,bin , :]
-    print(X.shape)
-    print(central_freq)
+    # All bins of the band instead of one hand-picked bin
+    print(f"{len(f_bins)} bins from {f_bins[0]} to {f_bins[-1]} Hz")
 
     Q = 2
     M = 6
     v = 343
-    f0 = central_freq
     d = 0.10
-    Pout = music (X, Q, M, d, v, f0)
     angles = np.linspace(-90, 90, 360)
+    A = far_field_steering(ula_positions(M, d), angles, v, f_bins)
+    Pout = wideband_spectrum(Sx_all, A, method="music", combine="incoherent", n_sources=Q)
+    # The angles without a grid, at the middle bin of the band
+    k = len(f_bins) // 2
+    print(f"root-MUSIC at {f_bins[k]} Hz:", root_music(covariances(Sx_all[:,k:k + 1])[0], Q, d, v, f_bins[k]))
 
     plt.figure(figsize=(8,4))
     plt.plot(angles, np.abs(Pout), linewidth=2)
@@ -99,14 +82,14 @@ if __name__ == "__main__":
     #plt.axvline(6.22,  linestyle='--', color='red')
 
     # labels, slightly shifted so they don't overlap
-    plt.text(55.181 -3, ymax - 1, "55.181°",
+    plt.text(55.181 -3, ymax*0.9, "55.181°",
              ha='right', va='bottom', fontsize=13, color='red')
     #plt.text(6.22 + 3,  ymax - 1, "6.22°",
              #ha='left', va='bottom', fontsize=10, color='red')
 
     plt.xlabel("Angle (degrees)", fontsize=12)
     plt.ylabel("MUSIC Spectrum", fontsize=12)
-    plt.title("MUSIC Spectrum (1 source at 60°) / Bin Frequency = 1687 Hz" , fontsize=13)
+    plt.title(f"MUSIC Spectrum (1 source at 60°) / Band = {BAND[0]}-{BAND[1]} Hz" , fontsize=13)
 
     plt.grid(True, linestyle="--", alpha=0.4)
     plt.tight_layout()
@@ -1,26 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-
-def a_lin(theta, M, d, v, f0):
-    """Returns the *array response* or *steering vector* for a Uniform Linear Microphone Array
-
-    Args:
-        theta (float): angle of arrival
-        M (int): number of microphones
-        d (float): distance between microphones (m)
-        v (float): speed of sound (m/s)
-        f0 (float): frequency of wave (Hz)
-
-    Returns:
-        np.ndarray: The array response
-    """  
-    """okay"""
-    result = np.array([ np.exp(
-        (0 -1*mic*(d/v)*np.sin(theta*np.pi/180)*2*np.pi*f0 *1j)
-        ) 
-                       for mic in range (M)])
-
-    return result
+from lib.localization.steering import a_lin
 
 def generate_source(N):
     
@@ -39,8 +19,7 @@ def datamodel (M, N, theta_range, d, v, f0):
     
     
     #create the A matrix (M x Q) of the steering vectors a(θ)
-    A = np.array([a_lin(theta_range[i], M, d, v, f0)     for i in range (len(theta_range))] )
-    A = np.transpose(A)
+    A = a_lin(np.asarray(theta_range), M, d, v, f0)
 
     #create the S matrix (Q x N) of the incoming signals of all sources
     S = np.array([generate_source(N) for i in range (len(theta_range))])
@@ -1,5 +1,6 @@
 import numpy as np
-from exercise import a_lin
+from lib.localization.music import esprit, music_spectrum, root_music, subspace_spectrum
+from lib.localization.steering import far_field_steering, ula_positions
 from exercise import generate_source
 from exercise import datamodel
 from autocorrelation import autocorr
@@ -16,20 +17,19 @@ def fake_music (Rx, Q, M, th_range, d, v, f0, N):
 
     angles_to_try = np.array([i for i in range (-90,90)])
     
-    Pmusic = np.array([1 / (np.matmul (np.matmul(np.matmul(a_lin(angle, M, d, v, f0).conj().T, Un), Un.conj().T) , a_lin(angle, M, d, v, f0) ))   
-                       for angle in angles_to_try])
+    # All angles in one batched quadratic form
+    A = far_field_steering(ula_positions(M, d), angles_to_try, v, f0)
+    Pmusic = subspace_spectrum(Un, A)[:,0]
     return Pmusic
 
 def music (X, Q, M, d, v, f0):
     Rx = (1/len(X))*np.matmul(X, X.conj().T)
-    eigenvals, eigenvecs = np.linalg.eigh(Rx)
-    noises = M - Q
-    Un = eigenvecs[:, :noises]
     
     angles_to_try = np.array([i for i in range (-90,90)])
     
-    Pmusic = np.array([1 / (np.matmul (np.matmul(np.matmul(a_lin(angle, M, d, v, f0).conj().T, Un), Un.conj().T) , a_lin(angle, M, d, v, f0) ))   
-                       for angle in angles_to_try])
+    # The noise subspace once, all angles in one batched quadratic form
+    A = far_field_steering(ula_positions(M, d), angles_to_try, v, f0)
+    Pmusic = music_spectrum(Rx, A, Q)[:,0]
     return Pmusic
 
 
@@ -53,6 +53,10 @@ if __name__ == "__main__":
     #Pmusic = fake_music(Rx, Q, M, th_range, d, v, f0, N)
     X = datamodel (M, N, th_range, d, v, f0)
     Pmusic = music(X, Q, M, d, v, f0)
+    # The angles without a grid
+    Rx = (1/len(X))*np.matmul(X, X.conj().T)
+    print("root-MUSIC:", root_music(Rx, Q, d, v, f0))
+    print("ESPRIT:", esprit(Rx, Q, d, v, f0))
     angles = np.arange(-90,90)
     plt.plot(angles,Pmusic)
     plt.show()
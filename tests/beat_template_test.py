@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from scipy.fft import fft, fftshift
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.model.generate import advanced_model
+
+class TestBeatTemplate(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.model = Model(ConfigParser())
+        self.model.n = 4
+
+    def assertMatchesFullModel(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        model = self.model
+        t_ref, h_ref = advanced_model(model.Fs, model.BPM, model.lf, model.hf, model.order, model.size, model.valves, model.n)
+        H_ref = fftshift(fft(h_ref))
+        t, h, _, H = model.generate_model_and_freq()
+        self.assertTrue(np.array_equal(t, t_ref))
+        self.assertTrue(np.allclose(h, h_ref, rtol=0, atol=1e-12 * np.max(np.abs(h_ref))))
+        self.assertTrue(np.allclose(H, H_ref / np.max(np.abs(H_ref)), rtol=0, atol=1e-9))
+
+    def test_only_changed_valve_is_synthesized(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.assertMatchesFullModel()
+        self.assertEqual(self.model.template.misses, 4)
+
+        self.model.valves[2].freq_main += 5
+        self.assertMatchesFullModel()
+        self.assertEqual(self.model.template.misses, 5)
+
+        # Nothing is synthesized again for another amount of beats or a removed valve
+        self.model.valves.pop()
+        self.model.n = 3
+        self.assertMatchesFullModel()
+        self.assertEqual(self.model.template.misses, 5)
+
+    def test_overlapping_beats(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        # The beats are longer than 60/BPM, so the repeated signal is not a whole number of beats long
+        self.model.BPM = 200
+        self.model.valves[3].duration_total = 0.2
+        self.assertMatchesFullModel()
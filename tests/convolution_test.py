@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+
+from lib.processing.convolution import convolve, choose_convolution_method, CONVOLUTION_METHODS
+from lib.processing.functions import construct_bandpass_filter
+
+class TestConvolution(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.rng = np.random.default_rng(0)
+        
+    def test_methods_match_direct(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        for N, L in [(1, 1), (50, 7), (300, 5001), (20000, 1001), (100000, 5001)]:
+            x = self.rng.standard_normal(N)
+            g = self.rng.standard_normal(L)
+            expected = np.convolve(x, g)
+            for method in CONVOLUTION_METHODS:
+                y = convolve(x, g, method)
+                self.assertEqual(y.shape, expected.shape)
+                self.assertTrue(np.allclose(y, expected, atol=1e-9 * np.max(np.abs(expected))), f"{method} N={N} L={L}")
+                
+    def test_filter_alignment(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        # The zero-phase filter delays an impulse by exactly half the filter length, which Processor.segment compensates for
+        g = construct_bandpass_filter(10, 800, 48000, size=5000)
+        x = np.zeros(200000)
+        x[100000] = 1
+        y = convolve(x, g)
+        self.assertEqual(len(y), len(x) + len(g) - 1)
+        self.assertEqual(np.argmax(np.abs(y)), 100000 + len(g) // 2)
+        
+    def test_choose_method(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.assertEqual(choose_convolution_method(1000, 10), "direct")
+        self.assertIn(choose_convolution_method(48000 * 60, 5001), ("overlap-add", "overlap-save"))
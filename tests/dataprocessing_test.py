@@ -0,0 +1,215 @@
+import unittest
+import numpy as np
+
+from lib.processing.dataprocessing import detect_peak_domains, threshold_domains, segment, SegmentBuffers, find_y_line, IncrementalClassifier, pop_np
+from lib.processing.streaming import ThresholdDomains
+
+def detect_peak_domains_loop(peaks: np.ndarray, see: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The original sample by sample implementation of detect_peak_domains, as reference.
+    """
+    peak_start = None
+    peaks_ind = []
+    for i, s in enumerate(see):
+        if s >= threshold and peak_start is None:
+            peak_start = i
+        elif s <= threshold and peak_start is not None:
+            if np.any((peaks[:,0] >= peak_start) & (peaks[:,0] <= i)):
+                peaks_ind.append((peak_start, i))
+            peak_start = None
+    return np.array(peaks_ind).reshape(-1, 2)
+
+def segment_loop(signal: np.ndarray, domains: np.ndarray, comp) -> tuple[np.ndarray, np.ndarray]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The original implementation of segment, as reference.
+    """
+    mask = np.zeros(len(signal), dtype=bool)
+    concatenated = []
+    for start, end in domains:
+        mask[comp(start):comp(end)] = True
+        concatenated.extend(signal[comp(start):comp(end)])
+    return np.where(mask, signal, 0), np.array(concatenated, dtype=signal.dtype)
+
+def classify_loop(x_peaks: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The original implementation of Processor.classify_peaks, with the loops over all peaks, as reference.
+    """
+    diff = np.diff(x_peaks)
+    peaks = np.array(list(zip(x_peaks[:-2], diff[:-1], np.diff(diff))))
+
+    minima, maxima = [], []
+    prev_d = None
+    for x, d, d2 in peaks:
+        if prev_d is not None and d > prev_d and d2 < 0:
+            maxima.append((x, d, d2))
+        elif prev_d is not None and d < prev_d and d2 > 0:
+            minima.append((x, d, d2))
+        prev_d = d
+    minima = np.array(minima)
+    maxima = np.array(maxima)
+    minima = minima[minima[:,1].argsort()]
+    maxima = maxima[maxima[:,1].argsort()[::-1]]
+    y_line = None
+    while True:
+        cur_min, minima = pop_np(minima)
+        cur_max, maxima = pop_np(maxima)
+        if cur_min[1] < cur_max[1]:
+            y_line = 0.5 * (max(minima[:,1]) + min(maxima[:,1]))
+        if y_line is not None:
+            break
+        elif len(minima) == 0 or len(maxima) == 0:
+            raise RuntimeError("No line found")
+
+    classification = []
+    prev_s1 = None
+    for x, d, d2 in peaks:
+        c = 2
+        if d <= y_line and not prev_s1:
+            c = 0
+            prev_s1 = True
+        elif d > y_line and (prev_s1 or prev_s1 is None):
+            c = 1
+            prev_s1 = False
+        classification.append((x, d, d2, c))
+    classification = np.array(classification)
+    mask_uncertain = classification[:,3] == 2
+    uncertain = mask_uncertain | np.concatenate((mask_uncertain[1:], [False]))
+    s1 = classification[~uncertain & (classification[:,3] == 0), :3]
+    s2 = classification[~uncertain & (classification[:,3] == 1), :3]
+    return s1, s2, classification[uncertain, :3], y_line
+
+class TestDataprocessing(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.rng = np.random.default_rng(0)
+
+    def test_detect_peak_domains(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        # Rounding puts many samples exactly on the threshold, also several in a row
+        see = np.round(np.convolve(self.rng.standard_normal(20000), np.ones(10) / 4), 1)
+        for threshold in [0.0, 0.5, 1.0]:
+            peaks = np.column_stack((np.sort(self.rng.choice(len(see), 300, replace=False)), np.zeros(300)))
+            expected = detect_peak_domains_loop(peaks, see, threshold)
+            self.assertGreater(len(expected), 0)
+            self.assertTrue(np.array_equal(detect_peak_domains(peaks, see, threshold), expected))
+
+            all_peaks = np.column_stack((np.arange(len(see)), np.zeros(len(see))))
+            self.assertTrue(np.array_equal(threshold_domains(see, threshold), detect_peak_domains_loop(all_peaks, see, threshold)))
+
+    def test_threshold_domains_blocks(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        see = np.round(np.convolve(self.rng.standard_normal(20000), np.ones(10) / 4), 1)
+        for block_size in [1, 7, 1000]:
+            domains = ThresholdDomains(0.5)
+            for start in range(0, len(see), block_size):
+                domains.process(see[start:start + block_size])
+            self.assertTrue(np.array_equal(domains.result(), threshold_domains(see, 0.5)))
+
+    def test_segment(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        see = np.convolve(self.rng.standard_normal(5000), np.ones(10) / 4)
+        buffers = SegmentBuffers()
+        for signal, comp in [
+            (self.rng.standard_normal(len(see)), lambda index: index - 20),
+            # Raw like signal
+            ((self.rng.standard_normal(12 * len(see)) * 1000).astype(np.int16), lambda index: (index - 20) * 12 - 150),
+        ]:
+            # With an extra domain that ends up at the end of the signal, like a slice with negative indices
+            for domains in [threshold_domains(see, 0.5), np.vstack(([[0, 1]], threshold_domains(see, 0.5)))]:
+                expected_segmented, expected_concatenated = segment_loop(signal, domains, comp)
+                for out in [None, buffers.get("s1", signal)]:
+                    segmented, concatenated = segment(signal, domains, comp, out)
+                    self.assertEqual(segmented.dtype, signal.dtype)
+                    self.assertTrue(np.array_equal(segmented, expected_segmented))
+                    self.assertTrue(np.array_equal(concatenated, expected_concatenated))
+
+        # The buffers are reused for a shorter signal of the same type
+        signal = self.rng.standard_normal(len(see) // 2)
+        out = buffers.get("s1", signal)
+        self.assertIs(segment(signal, domains[:3], lambda index: index, out)[0].base, out[0])
+        with self.assertRaises(ValueError):
+            segment(signal, domains, lambda index: index, (out[0][:10], out[1]))
+
+    def heart_peaks(self, n_beats: int) -> np.ndarray:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        Peaks of S1 and S2 with a varying heart rate, some missed and some extra peaks.
+        """
+        beats = np.cumsum(self.rng.integers(3000, 3600, n_beats))
+        peaks = np.concatenate((beats, beats + self.rng.integers(1000, 1400, n_beats), self.rng.integers(0, beats[-1], n_beats // 10)))
+        peaks = np.unique(peaks)
+        return np.delete(peaks, self.rng.choice(len(peaks), n_beats // 20, replace=False))
+
+    def test_find_y_line(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        for _ in range(20):
+            x_peaks = self.heart_peaks(200)
+            diff = np.diff(x_peaks)
+            peaks = np.array(list(zip(x_peaks[:-2], diff[:-1], np.diff(diff))))
+            self.assertEqual(find_y_line(peaks), classify_loop(x_peaks)[3])
+
+    def test_incremental_classifier(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        x_peaks = self.heart_peaks(200)
+        classifier = IncrementalClassifier(x_peaks)
+        for step in range(150):
+            if step % 3 == 0:
+                peak = self.rng.integers(x_peaks[0] - 100, x_peaks[-1] + 100)
+                classifier.insert(peak)
+                x_peaks = np.union1d(x_peaks, [peak])
+            else:
+                # Also remove the first and last peaks
+                peak = x_peaks[self.rng.choice([0, 1, len(x_peaks) - 1, self.rng.integers(len(x_peaks))])]
+                classifier.remove(peak)
+                x_peaks = np.setdiff1d(x_peaks, [peak])
+
+            self.assertTrue(np.array_equal(classifier.peaks, x_peaks))
+            s1, s2, uncertain, y_line = classify_loop(x_peaks)
+            self.assertEqual(classifier.y_line, y_line)
+            for result, expected in zip(classifier.result(), (s1, s2, uncertain)):
+                self.assertTrue(np.array_equal(result, expected))
+            self.assertTrue(np.array_equal(classifier.is_uncertain(x_peaks), np.isin(x_peaks, uncertain[:,0])))
+
+    def test_edge_cases(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.assertEqual(threshold_domains(np.zeros(0), 0.5).shape, (0, 2))
+        # Open at the end
+        self.assertTrue(np.array_equal(threshold_domains(np.array([0, 1, 0, 1, 1]), 0.5), [[1, 2]]))
+        # A sample on the threshold starts a domain and the next one on the threshold ends it
+        self.assertTrue(np.array_equal(threshold_domains(np.array([0.5, 0.5, 0.5, 1, 0]), 0.5), [[0, 1], [2, 4]]))
@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from os.path import join
+from tempfile import TemporaryDirectory
+from scipy.io import wavfile
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.DatasetGenerator import DatasetGenerator, load_manifest
+from lib.model.Model_3D import Point
+
+class TestDatasetGenerator(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def test_generate(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        config = ConfigParser()
+        sources = {"default": [Point(-1, 8, -15), Point(3, 12, -15), Point(6, 14, -15), Point(7, 9, -15)]}
+        geometries = {
+            "line": [Point(2.5, 5, 0), Point(2.5, 10, 0), Point(2.5, 15, 0)],
+            "square": [Point(2.5, 5, 0), Point(2.5, 10, 0), Point(7.5, 5, 0), Point(7.5, 10, 0)],
+        }
+        generator = DatasetGenerator(config, sources, geometries, r_ratios=[0.05], bpm_ratios=[0.05], noise_levels=[0.0, 0.01],
+                                     n_beats=3, seed=1, log=False)
+
+        with TemporaryDirectory() as sequential, TemporaryDirectory() as parallel:
+            manifest = load_manifest(generator.generate(sequential, parallel=False).parent)
+            generator.generate(parallel, parallel=True, max_workers=2)
+
+            self.assertEqual(len(manifest["samples"]), 4)
+            self.assertEqual(manifest["failures"], {})
+            for record in manifest["samples"]:
+                Fs, h = wavfile.read(join(sequential, record["file"]))
+                self.assertEqual(Fs, record["Fs"])
+                self.assertEqual(h.shape, (record["samples"], len(geometries[record["geometry"]])))
+                self.assertEqual(np.array(record["delays"]).shape, (h.shape[1], 4))
+                self.assertEqual(len(record["beat_starts"]), 3)
+                # The same seeds give the same recordings in the worker processes
+                self.assertTrue(np.array_equal(h, wavfile.read(join(parallel, record["file"]))[1]))
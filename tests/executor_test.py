@@ -0,0 +1,88 @@
+import unittest
+import shutil
+import numpy as np
+from os.path import join
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from scipy.io.wavfile import read
+
+from lib.config.ConfigParser import ConfigParser
+from lib.processing.Executor import Executor, process_file
+
+class TestExecutor(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.folder = TemporaryDirectory()
+        for file in Path("samples/chapter_2").glob("*.wav"):
+            shutil.copy(file, self.folder.name)
+        # Not a wav file, so processing it fails
+        (Path(self.folder.name) / "broken.wav").write_bytes(b"RIFF")
+        
+    def tearDown(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.folder.cleanup()
+        
+    def test_parallel_matches_sequential(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        config = ConfigParser()
+        sequential = Executor(self.folder.name, config)
+        sequential.execute(write_enabled=False)
+        parallel = Executor(self.folder.name, config)
+        parallel.execute(write_enabled=False, parallel=True, max_workers=2)
+        
+        self.assertEqual(list(parallel.results), list(sequential.results))
+        self.assertEqual(parallel.failures.keys(), sequential.failures.keys())
+        self.assertIn(Path(self.folder.name) / "broken.wav", parallel.failures)
+        for file, value in sequential.results.items():
+            self.assertEqual(parallel.results[file][:3], value[:3])
+            self.assertTrue(np.array_equal(parallel.results[file][3].s1_peaks, value[3].s1_peaks))
+            self.assertTrue(np.array_equal(parallel.results[file][3].ind_s1, value[3].ind_s1))
+            self.assertTrue(np.array_equal(parallel.results[file][3].ind_s2, value[3].ind_s2))
+            
+    def test_compact_result(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        config = ConfigParser()
+        file = sorted(Path("samples/chapter_2").glob("*.wav"))[0]
+        with TemporaryDirectory() as signal_folder:
+            result = process_file(file, config, signal_folder)
+            y_normalized = np.load(result.y_normalized_path)
+            # Only the peaks, domains and filters are returned, the signal stays in the folder
+            for name, value in vars(result).items():
+                if isinstance(value, np.ndarray):
+                    self.assertLess(value.size, len(y_normalized) // 2, name)
+            
+    def test_parallel_writes_like_sequential(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        config = ConfigParser()
+        with TemporaryDirectory() as output:
+            config.Segmentation.OutputPath = join(output, "sequential")
+            Executor(self.folder.name, config).execute(write_enabled=True)
+            config.Segmentation.OutputPath = join(output, "parallel")
+            Executor(self.folder.name, config).execute(write_enabled=True, parallel=True, max_workers=2)
+            
+            files = sorted(path.relative_to(join(output, "sequential")) for path in Path(output, "sequential").rglob("*.wav"))
+            self.assertEqual(sorted(path.relative_to(join(output, "parallel")) for path in Path(output, "parallel").rglob("*.wav")), files)
+            for file in files:
+                Fs, x = read(Path(output, "sequential", file))
+                Fs_parallel, x_parallel = read(Path(output, "parallel", file))
+                self.assertEqual(Fs_parallel, Fs)
+                self.assertTrue(np.array_equal(x_parallel, x))
@@ -1,7 +1,10 @@
+from copy import deepcopy
+import random
 import unittest
 import numpy as np
 
-from lib.model.generate import repeat
+from lib.model.generate import repeat, advanced_model, advanced_model_single_beat, advanced_model_valve_params, valve_responses, randomized_valve_params
+from lib.model.ValveParams import ValveParams
 
 class TestGenerate(unittest.TestCase):
     """
@@ -16,4 +19,77 @@ class TestGenerate(unittest.TestCase):
         h_filtered = [3,2,1,0,-1]
         t_filtered = [0,1,2]
         _, a = repeat(5, h_filtered, t_filtered, 1, 3)
-        self.assertTrue(np.array_equal(a, [3,  2,  1,  3,  1,  1,  3,  1,  1,  3,  1,  1,  3,  1,  1,  0, -1]))
\ No newline at end of file
+        self.assertTrue(np.array_equal(a, [3,  2,  1,  3,  1,  1,  3,  1,  1,  3,  1,  1,  3,  1,  1,  0, -1]))
+    def test_valve_responses(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        valves = [
+            ValveParams( 10, 30, 10, 10, 0.05, 0.1,   1,  50,  50, "M"),
+            ValveParams( 40, 30, 10, 10, 0.05, 0.1, 0.5, 150, 150, "T"),
+            ValveParams(300, 30, 10, 10, 0.05, 0.1, 0.5,  50,  50, "A"),
+            # Onset longer than the total duration and a valve without sound
+            ValveParams(100,  5, 10, -3,   -5, 0.3, 0.4,  80,  60, "X"),
+            ValveParams(  0,  0,  0,  3,   -5, 0.3, 0.4,  80,  60, "Z"),
+        ]
+        Fs = 4000
+        h_out = [advanced_model_valve_params(valve, Fs, use_transfer=True)[1] for valve in valves]
+        h_len = max(len(h) for h in h_out)
+        expected = np.sum([np.pad(h, (0, h_len - len(h))) for h in h_out], axis=0)
+
+        h = valve_responses(valves, Fs)
+        self.assertEqual(len(h), len(expected))
+        self.assertLess(np.max(np.abs(h - expected)), 1e-9 * np.max(np.abs(expected)))
+
+    def test_advanced_model_randomized(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        Fs, BPM, n = 4000, 66, 5
+        valves = [
+            ValveParams( 10, 30, 10, 10, 0.05, 0.1,   1,  50,  50, "M"),
+            ValveParams(300, 30, 10, 10, 0.05, 0.1, 0.5,  50,  50, "A"),
+        ]
+        # Without randomization of the parameters, the batched beats equal the beats generated one by one
+        _, h = advanced_model(Fs, BPM, 20, 200, 2, 200, deepcopy(valves), n, randomize_enabled=True)
+        _, h_beat = advanced_model_single_beat(Fs, BPM, 20, 200, 2, 200, valves)
+        beat_length = int(60/BPM*Fs)
+        expected = np.zeros(beat_length * n)
+        for i in range(n):
+            h_end = min(len(expected), i * beat_length + len(h_beat))
+            expected[i * beat_length:h_end] += h_beat[:h_end - i * beat_length]
+        self.assertTrue(np.allclose(h, expected, atol=1e-12))
+
+        # Reproducible by seed
+        _, h_1 = advanced_model(Fs, BPM, 20, 200, 2, 200, deepcopy(valves), n, True, 0.1, 0.1, 0.01, rng=1)
+        _, h_2 = advanced_model(Fs, BPM, 20, 200, 2, 200, deepcopy(valves), n, True, 0.1, 0.1, 0.01, rng=1)
+        self.assertTrue(np.array_equal(h_1, h_2))
+
+        # And by the global seed without a generator
+        np.random.seed(0)
+        _, h_1 = advanced_model(Fs, BPM, 20, 200, 2, 200, deepcopy(valves), n, True, 0.1, 0.1, 0.01)
+        np.random.seed(0)
+        _, h_2 = advanced_model(Fs, BPM, 20, 200, 2, 200, deepcopy(valves), n, True, 0.1, 0.1, 0.01)
+        self.assertTrue(np.array_equal(h_1, h_2))
+
+    def test_randomized_valve_params(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        valve = ValveParams(10, 30, 10, 10, 0.05, 0.1, 1, 50, 50, "M")
+        params = randomized_valve_params([valve], 20000, 0.1, np.random.default_rng(0))
+
+        # Same distribution of the factors per beat as ValveParams.randomize
+        random.seed(0)
+        expected = []
+        for _ in range(20000):
+            previous = valve.freq_main
+            valve.randomize(0.1)
+            expected.append(valve.freq_main / previous)
+        factors = params["freq_main"][1:,0] / params["freq_main"][:-1,0]
+        self.assertTrue(np.all((factors >= 0.9) & (factors <= 1.1)))
+        self.assertAlmostEqual(np.mean(factors), np.mean(expected), delta=0.002)
+        self.assertAlmostEqual(np.std(factors), np.std(expected), delta=0.002)
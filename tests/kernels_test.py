@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from tempfile import TemporaryDirectory
+
+from lib.processing.kernels import KernelCache, kernel_cache
+from lib.processing.functions import construct_bandpass_filter
+
+class TestKernels(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def test_lru(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        cache = KernelCache(max_size=2)
+        designed = []
+        def design(value):
+            designed.append(value)
+            return np.full(3, value)
+
+        cache.get(("a",), lambda: design(1))
+        cache.get(("b",), lambda: design(2))
+        # a becomes the most recently used, so b is evicted by c
+        self.assertTrue(np.array_equal(cache.get(("a",), lambda: design(1)), [1, 1, 1]))
+        cache.get(("c",), lambda: design(3))
+        cache.get(("a",), lambda: design(1))
+        cache.get(("b",), lambda: design(2))
+
+        self.assertEqual(designed, [1, 2, 3, 2])
+        self.assertEqual(cache.stats(), {"hits": 2, "disk_hits": 0, "misses": 4, "size": 2})
+        with self.assertRaises(ValueError):
+            cache.get(("b",), lambda: design(2))[0] = 0
+
+    def test_persistence(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        with TemporaryDirectory() as folder:
+            g = KernelCache(path=folder).get(("bandpass", 1.0), lambda: np.arange(5.0))
+            cache = KernelCache(path=folder)
+            self.assertTrue(np.array_equal(cache.get(("bandpass", 1.0), lambda: np.zeros(5)), g))
+            self.assertEqual(cache.stats(), {"hits": 0, "disk_hits": 1, "misses": 0, "size": 1})
+
+    def test_construct_bandpass_filter(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        g = construct_bandpass_filter(10, 800, 48000, order=2, size=5000)
+        hits = kernel_cache.hits
+        # Integer and float cutoffs are the same kernel
+        self.assertIs(construct_bandpass_filter(10.0, 800.0, 48000, order=2, size=5000), g)
+        self.assertEqual(kernel_cache.hits, hits + 1)
+        self.assertEqual(len(g), 5001)
@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model_3D import Model_3D, Point
+
+def generate_loop(model: Model_3D, signals: list[np.ndarray]) -> list[np.ndarray]:
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+
+    The original per microphone implementation of Model_3D.generate with whole sample delays, as reference.
+    """
+    modelled_signals = []
+    for mic_loc in model.microphone_locs:
+        new_mic_loc = np.tile(mic_loc,(len(model.source_locs),1))
+        dists_to_valves = np.linalg.norm((model.source_locs-new_mic_loc)/100, axis=1)
+        delays = dists_to_valves/model.V_Body
+        gains = 1/dists_to_valves
+        mic_signals = []
+        max_delay = max(delays)
+        for delay, gain, signal in zip(delays, gains, signals):
+            mic_signals.append(gain * np.pad(signal, [round(delay*model.Fs), round(max_delay*model.Fs)-round(delay*model.Fs)]))
+        modelled_signals.append(np.array(mic_signals).sum(axis=0))
+    return modelled_signals
+
+class TestModel3D(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.config = ConfigParser()
+        self.mic_locs = [Point(2.5, 5, 0), Point(2.5, 10, 0), Point(7.5, 5, 0), Point(7.5, 15, 0)]
+        self.source_locs = [Point(-1, 8, -15), Point(3, 12, -15), Point(6, 14, -15)]
+
+    def test_whole_sample_delays(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        model = Model_3D(self.config, self.source_locs, self.mic_locs)
+        rng = np.random.default_rng(0)
+        signals = [rng.standard_normal(5000) for _ in self.source_locs]
+
+        h = model.generate(signals, fractional=False)
+        self.assertEqual(h.shape[0], len(self.mic_locs))
+        for x, expected in zip(h, generate_loop(model, signals)):
+            self.assertTrue(np.allclose(x[:len(expected)], expected, atol=1e-9))
+            self.assertTrue(np.allclose(x[len(expected):], 0, atol=1e-9))
+
+    def test_fractional_delays(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        model = Model_3D(self.config, self.source_locs[0], self.mic_locs)
+        Fs, f = model.Fs, 100
+        t = np.arange(Fs) / Fs
+        # A sine that fades in and out, so the delayed signal is known everywhere
+        window = np.sin(np.pi * t)**2
+        h = model.generate(window * np.sin(2 * np.pi * f * t))
+
+        delays, gains = model.propagation()
+        t_out = np.arange(h.shape[1]) / Fs
+        for x, delay, gain in zip(h, delays[:,0], gains[:,0]):
+            t_delayed = np.clip(t_out - delay, 0, 1)
+            expected = gain * np.sin(np.pi * t_delayed)**2 * np.sin(2 * np.pi * f * t_delayed)
+            self.assertLess(np.max(np.abs(x - expected)), 1e-6 * gain)
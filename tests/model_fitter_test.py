@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.model.OriginalSound import OriginalSound
+from lib.model_optimize.ModelFitter import ModelFitter
+
+class TestModelFitter(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        A recording of the model with a lower frequency of the M valve.
+        """
+        self.tmp = TemporaryDirectory()
+        self.config = ConfigParser()
+        truth = Model(self.config)
+        truth.valves[0].freq_main = 60
+        self.path = str(Path(self.tmp.name) / "truth.wav")
+        truth.save(self.path)
+
+    def tearDown(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.tmp.cleanup()
+
+    def test_recovers_frequency(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        model = Model(self.config)
+        original_sound = OriginalSound(self.path, self.config)
+        original_sound.shift = 0.0
+        fitter = ModelFitter(model, original_sound, parameters=["shift", "M.freq_main"])
+
+        # A batch gives the same misfit as the candidates one by one
+        X = np.array([[-0.05, 0.0], [60.0, 50.0]])
+        self.assertTrue(np.allclose(fitter.evaluate(X), [fitter.evaluate(X[:,0]), fitter.evaluate(X[:,1])]))
+
+        result = fitter.fit(maxiter=30, seed=0, log=False)
+        self.assertLess(result.loss, result.initial_loss)
+        self.assertEqual(result.evaluations, 2 * 8 * (result.iterations + 1))
+
+        result.apply(model, original_sound)
+        self.assertAlmostEqual(model.valves[0].freq_main, 60, delta=1)
@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+
+from lib.localization.music import esprit, music_spectrum, noise_subspace, root_music, subspace_spectrum
+from lib.localization.steering import a_lin, a_z, far_field_steering, near_field_steering, steering_cache, ula_positions
+
+class TestMUSIC(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The covariance of 200 snapshots of two sources at -20 and 15 degrees with noise.
+        """
+        steering_cache.clear()
+        self.M, self.d, self.v, self.f0 = 7, 0.17, 340, 800.0
+        self.sources = np.array([-20.0, 15.0])
+        rng = np.random.default_rng(1)
+        S = rng.normal(size=(2, 200)) + 1j*rng.normal(size=(2, 200))
+        N = rng.normal(size=(self.M, 200)) + 1j*rng.normal(size=(self.M, 200))
+        X = a_lin(self.sources, self.M, self.d, self.v, self.f0) @ S + 0.1 * N
+        self.Rx = X @ X.conj().T / 200
+
+    def test_matches_projector(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        angles = np.arange(-90, 90)
+        P = music_spectrum(self.Rx, far_field_steering(ula_positions(self.M, self.d), angles, self.v, self.f0), 2)[:,0]
+        Un = noise_subspace(self.Rx, 2)[0]
+        expected = np.array([1 / np.real(a.conj() @ Un @ Un.conj().T @ a) for a in a_lin(angles, self.M, self.d, self.v, self.f0).T])
+        self.assertTrue(np.allclose(P, expected))
+        peaks = angles[1:-1][(P[1:-1] > P[:-2]) & (P[1:-1] > P[2:])]
+        self.assertTrue({-20, 15} <= set(peaks))
+
+    def test_near_field(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        mics = ula_positions(self.M, self.d)
+        points = np.array([[x, 2.0, 0.0] for x in np.linspace(-2, 2, 50)])
+        Un = noise_subspace(self.Rx, 2)[0]
+        P = subspace_spectrum(Un, near_field_steering(mics, points, self.v, self.f0))[:,0]
+        expected = np.array([1 / np.real(a_z(p, mics, self.M, self.v, self.f0).conj() @ Un @ Un.conj().T @ a_z(p, mics, self.M, self.v, self.f0))
+                             for p in points])
+        self.assertTrue(np.allclose(P, expected))
+
+    def test_root_music_and_esprit(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        for estimator in (root_music, esprit):
+            with self.subTest(estimator=estimator.__name__):
+                angles = estimator(self.Rx, 2, self.d, self.v, self.f0)
+                self.assertEqual(angles.shape, (2,))
+                self.assertTrue(np.allclose(angles, self.sources, atol=0.1))
+
+    def test_too_many_sources(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        for estimator in (root_music, esprit):
+            with self.subTest(estimator=estimator.__name__):
+                with self.assertRaises(ValueError):
+                    estimator(self.Rx, self.M, self.d, self.v, self.f0)
@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+
+from lib.localization.mvdr import mvdr_grid, mvdr_spectrum, mvdr_weights
+from lib.localization.steering import a_lin, a_z, far_field_steering, steering_cache, ula_positions
+
+class TestMVDR(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The covariance of two sources at 0 and 15 degrees with noise, at two frequencies.
+        """
+        steering_cache.clear()
+        self.M, self.d, self.v = 7, 0.17, 340
+        self.freqs = np.array([500.0, 800.0])
+        self.angles = np.arange(-90, 90)
+        self.Rx = []
+        for f0 in self.freqs:
+            A = a_lin(np.array([0, 15]), self.M, self.d, self.v, f0)
+            self.Rx.append(A @ A.conj().T + 0.01 * np.eye(self.M))
+        self.Rx = np.array(self.Rx)
+
+    def test_matches_inverse(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        A = far_field_steering(ula_positions(self.M, self.d), self.angles, self.v, self.freqs)
+        P = mvdr_spectrum(self.Rx, A, chunk_size=50)
+        for k in range(len(self.freqs)):
+            expected = np.array([1 / np.real(a.conj() @ np.linalg.inv(self.Rx[k]) @ a) for a in A[:,:,k].T])
+            self.assertTrue(np.allclose(P[:,k], expected))
+            peaks = self.angles[1:-1][(P[1:-1,k] > P[:-2,k]) & (P[1:-1,k] > P[2:,k])]
+            self.assertTrue({0, 15} <= set(peaks))
+
+    def test_weights(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        a0 = a_lin(15, self.M, self.d, self.v, 500.0)
+        w = mvdr_weights(self.Rx[0], a0)
+        Rx_inv = np.linalg.inv(self.Rx[0])
+        self.assertTrue(np.allclose(w, Rx_inv @ a0 / (a0.conj() @ Rx_inv @ a0)))
+        self.assertAlmostEqual(np.vdot(w, a0), 1)
+
+    def test_singular_covariance_is_loaded(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        # Fewer frames than microphones, the covariance has rank 2
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(self.M, 2)) + 1j*rng.normal(size=(self.M, 2))
+        A = far_field_steering(ula_positions(self.M, self.d), self.angles, self.v, 500.0)
+        P = mvdr_spectrum(X @ X.conj().T / 2, A)
+        self.assertTrue(np.all(np.isfinite(P)) and np.all(P > 0))
+
+    def test_grid(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        mics = ula_positions(self.M, self.d)
+        points = np.stack([np.linspace(-1, 1, 101), np.full(101, 2.0), np.zeros(101)], axis=1)
+        P = mvdr_grid(self.Rx[0], mics, points, self.v, 500.0, chunk_size=32)
+        expected = [1 / np.real(a.conj() @ np.linalg.inv(self.Rx[0]) @ a) for a in (a_z(p, mics, self.M, self.v, 500.0) for p in points)]
+        self.assertTrue(np.allclose(P[:,0], expected))
@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from lib.config.ConfigParser import ConfigParser
+from lib.processing.Processor import Processor
+
+class TestProcessor(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.config = ConfigParser()
+        self.folder = TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.folder.cleanup()
+
+    def processor(self, seed: int, spurious: float = 0.2) -> Processor:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        A processor with a synthetic envelope of 60 heart beats, with an extra peak of random height in some of the beats.
+        """
+        rng = np.random.default_rng(seed)
+        Fs = self.config.Downsampling.FsTarget
+        beats = np.cumsum(rng.integers(int(0.75 * Fs), int(0.9 * Fs), 60))
+        t = np.arange(beats[-1] + Fs)
+        see = 0.01 * rng.random(len(t))
+        for beat in beats:
+            peaks = [(beat, 1.0), (beat + rng.integers(int(0.25 * Fs), int(0.33 * Fs)), 0.7)]
+            if rng.random() < spurious:
+                peaks.append((beat + rng.integers(int(0.45 * Fs), int(0.6 * Fs)), rng.uniform(0.05, 0.6)))
+            for peak, height in peaks:
+                see += height * np.exp(-0.5 * ((t - peak) / (0.015 * Fs))**2)
+
+        processor = Processor(None, self.config, log=False, write_result_processed=False, write_result_raw=False)
+        processor.file_path = str(Path(self.folder.name) / f"synthetic-{seed}.wav")
+        processor.generation_path = self.folder.name
+        processor.see_normalized = see / np.std(see)
+        processor.peaks = processor.find_peaks(processor.segmentation_min_height)
+        return processor
+
+    def linear_search(self, processor: Processor, max_uncertain_count: float) -> float|None:
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The original search, raising the threshold one step at a time.
+        """
+        increase = (processor.max_comp_height - processor.segmentation_min_height) / processor.max_comp_iter
+        min_height = processor.segmentation_min_height
+        while True:
+            min_height += increase
+            _, _, uncertain = processor.classify_peaks(processor.find_peaks(min_height), save_y_line=False, save_peaks=False)
+            if min_height > processor.max_comp_height:
+                return None
+            if len(uncertain) <= max_uncertain_count:
+                return min_height
+
+    def test_search_min_height(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        for seed, succeeds in [(0, True), (1, False)]:
+            processor = self.processor(seed)
+            max_uncertain_count = processor.max_uncertain_count_per_min * len(processor.see_normalized) / processor.Fs_target / 60
+            _, _, uncertain = processor.classify_peaks(processor.peaks)
+            self.assertGreater(len(uncertain), max_uncertain_count)
+            expected = self.linear_search(processor, max_uncertain_count)
+            self.assertEqual(expected is not None, succeeds)
+
+            processor.classify()
+            if succeeds:
+                self.assertEqual(processor.actual_segmentation_min_height, expected)
+                self.assertTrue(np.array_equal(processor.peaks, processor.find_peaks(expected)))
+                self.assertIsNone(processor.threshold_failure)
+            else:
+                self.assertGreater(processor.actual_segmentation_min_height, processor.max_comp_height)
+                self.assertTrue(np.array_equal(processor.peaks, processor.find_peaks(processor.segmentation_min_height)))
+                self.assertIsNotNone(processor.threshold_failure)
+
+                # The failure is written as a figure instead of shown
+                processor.write()
+                self.assertTrue((Path(self.folder.name) / processor.diagnostics_path / f"threshold-synthetic-{seed}.png").exists())
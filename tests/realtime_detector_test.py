@@ -0,0 +1,112 @@
+import unittest
+import random
+from threading import Thread
+import numpy as np
+from os.path import join
+from tempfile import TemporaryDirectory
+from scipy.io.wavfile import write
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.processing.Processor import Processor, Classification
+from lib.processing.RealtimeDetector import RealtimeDetector
+from lib.processing.realtime import RingBuffer, WavReplaySource
+
+class TestRealtimeDetector(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.config = ConfigParser()
+        self.folder = TemporaryDirectory()
+        random.seed(0)
+        np.random.seed(0)
+        model = Model(self.config, randomize_enabled=True)
+        model.set_n(20)
+        _, h = model.generate_model(use_transfer=False)
+        h = h + 0.02 * np.random.randn(len(h)) * np.max(np.abs(h))
+        self.file_path = join(self.folder.name, "synth.wav")
+        write(self.file_path, 48000, (h / np.max(np.abs(h)) * 20000).astype(np.int16))
+        
+    def tearDown(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.folder.cleanup()
+        
+    def test_ring_buffer(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        ring = RingBuffer(8, 2)
+        frames = np.arange(28).reshape(14, 2)
+        ring.write(frames[:6])
+        self.assertTrue(np.array_equal(ring.read(4), frames[:4]))
+        # Wraps around the end and overwrites the two oldest frames
+        ring.write(frames[6:])
+        self.assertEqual(ring.overflows, 2)
+        ring.close()
+        self.assertTrue(np.array_equal(ring.read(20), frames[6:]))
+        self.assertEqual(len(ring.read(1)), 0)
+        
+    def test_detects_like_batch(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        batch = Processor(self.file_path, self.config, log=False)
+        batch.run(write_enabled=False)
+        
+        source = WavReplaySource(self.file_path, speed=0)
+        detector = RealtimeDetector(self.config, source.Fs, log=False)
+        detections = list(detector.run(source))
+        s1 = [peak for peak, _, c in detections if c == Classification.S1]
+        s2 = [peak for peak, _, c in detections if c == Classification.S2]
+        
+        # The first peaks are needed to find the line between S1 and S2
+        self.assertGreaterEqual(len(s1), len(batch.s1_peaks) - 3)
+        self.assertGreaterEqual(len(s2), len(batch.s2_peaks) - 3)
+        # S1 and S2 alternate
+        labels = [c for _, _, c in detections if c != Classification.Uncertain]
+        self.assertTrue(all(a != b for a, b in zip(labels, labels[1:])))
+        self.assertEqual(detector.overflows, 0)
+        
+    def test_stop_early(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        # The file does not fit in the buffer, so the source waits for free space when the detector stops
+        source = WavReplaySource(self.file_path, speed=0)
+        detector = RealtimeDetector(self.config, source.Fs, log=False)
+        
+        def detect():
+            for i, _ in enumerate(detector.run(source)):
+                if i == 2:
+                    break
+        thread = Thread(target=detect, daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+        
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(source.thread)
+        
+    def test_realtime_replay_within_budget(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        source = WavReplaySource(self.file_path, speed=4)
+        detector = RealtimeDetector(self.config, source.Fs, log=False)
+        list(detector.run(source))
+        
+        self.assertEqual(detector.overflows, 0)
+        self.assertEqual(detector.block_count, int(np.ceil(len(source.x) / int(self.config.Realtime.BlockDuration * source.Fs))))
+        self.assertLess(detector.latency_stats()["p99"], self.config.Realtime.LatencyBudget)
@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+
+from lib.processing.functions import construct_bandpass_filter, apply_filter, downsample
+from lib.processing.convolution import convolve
+from lib.processing.resampling import rational_factors, polyphase_decimate, bandpass_downsample
+
+class TestResampling(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.rng = np.random.default_rng(0)
+        
+    def test_rational_factors(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.assertEqual(rational_factors(48000, 4000), (1, 12))
+        self.assertEqual(rational_factors(44100, 4000), (40, 441))
+        self.assertEqual(rational_factors(4000, 4000), (1, 1))
+        
+    def test_polyphase_decimate_matches_filter_then_downsample(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        for N, L, M in [(10, 3, 12), (100, 5, 4), (12345, 101, 7), (5, 5001, 12), (48000, 5001, 12)]:
+            x = self.rng.standard_normal(N)
+            g = self.rng.standard_normal(L)
+            expected = convolve(x, g)[::M]
+            y = polyphase_decimate(x, g, M)
+            self.assertEqual(y.shape, expected.shape)
+            self.assertTrue(np.allclose(y, expected, atol=1e-9 * np.max(np.abs(expected))))
+            
+    def test_bandpass_downsample_integer_ratio(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        x = self.rng.standard_normal(48000)
+        y, g, up, down = bandpass_downsample(x, 10, 800, 48000, 4000, order=2, size=5000)
+        
+        expected, M = downsample(apply_filter(x, construct_bandpass_filter(10, 800, 48000, order=2, size=5000)), 48000, 4000)
+        self.assertEqual((up, down), (1, M))
+        self.assertTrue(np.allclose(y, expected))
+        
+    def test_bandpass_downsample_rational_ratio(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        Fs = 44100
+        t = np.arange(3 * Fs) / Fs
+        x = np.sin(2 * np.pi * 100 * t)
+        y, g, up, down = bandpass_downsample(x, 10, 800, Fs, 4000, order=2, size=5000)
+        
+        # Sample n of y is sample n*down/up of x, delayed by half the filter length at the upsampled rate
+        t_y = (np.arange(len(y)) * down - len(g) // 2) / (up * Fs)
+        steady = (t_y > 0.5) & (t_y < 2.5)
+        gain = np.abs(np.sum(construct_bandpass_filter(10, 800, Fs * up, order=2, size=5000 * up) * np.exp(-2j * np.pi * 100 * np.arange(len(g)) / (Fs * up))))
+        self.assertTrue(np.allclose(y[steady], gain * np.sin(2 * np.pi * 100 * t_y[steady]), atol=1e-2))
+        
+    def test_bandpass_downsample_rejects_aliasing(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        with self.assertRaises(ValueError):
+            bandpass_downsample(np.zeros(100), 10, 2500, 48000, 4000)
@@ -0,0 +1,95 @@
+import os
+import unittest
+import numpy as np
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from lib.processing.signalcache import SignalCache
+
+class TestSignalCache(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.folder = TemporaryDirectory()
+        self.source = join(self.folder.name, "source.wav")
+        with open(self.source, "wb") as f:
+            f.write(b"samples")
+
+    def tearDown(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.folder.cleanup()
+
+    def test_hits_and_modified_files(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        cache = SignalCache(join(self.folder.name, "cache"))
+        key = cache.key(self.source, "filtered", (10, 800))
+        self.assertNotEqual(cache.key(self.source, "filtered", (10, 900)), key)
+
+        x = cache.get(key, lambda: np.arange(100.0))
+        self.assertTrue(np.array_equal(cache.get(key, lambda: np.zeros(100)), x))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["bytes_read"], 800)
+
+        # A modified source file gives another key
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertNotEqual(cache.key(self.source, "filtered", (10, 800)), key)
+
+        # The files are found again by a new cache on the same folder
+        self.assertEqual(SignalCache(join(self.folder.name, "cache")).size, cache.size)
+
+    def test_lru_eviction(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        cache = SignalCache(join(self.folder.name, "cache"), max_bytes=2500)
+        keys = [cache.key(self.source, "stage", (i,)) for i in range(3)]
+        cache.get(keys[0], lambda: np.zeros(100))
+        cache.get(keys[1], lambda: np.ones(100))
+        cache.get(keys[0], lambda: np.zeros(100))
+        # Every file is 928 bytes, so the third file evicts the least recently used one
+        cache.get(keys[2], lambda: np.full(100, 2.0))
+        self.assertLessEqual(cache.size, 2500)
+        self.assertEqual(cache.stats()["bytes_evicted"], 928)
+
+        cache.get(keys[0], lambda: np.zeros(100))
+        cache.get(keys[1], lambda: np.ones(100))
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_shared_folder(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        # Two processes on one folder, the cap holds for the folder as a whole
+        caches = [SignalCache(join(self.folder.name, "cache"), max_bytes=2500) for _ in range(2)]
+        for i in range(4):
+            caches[i % 2].get(caches[i % 2].key(self.source, "stage", (i,)), lambda: np.full(100, float(i)))
+        total = sum(os.path.getsize(join(self.folder.name, "cache", name)) for name in os.listdir(join(self.folder.name, "cache")))
+        self.assertLessEqual(total, 2500)
+        self.assertEqual(caches[1].size, total)
+
+    def test_disabled(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        cache = SignalCache(None)
+        x = cache.get("key", lambda: np.arange(10.0))
+        self.assertTrue(np.array_equal(x, np.arange(10.0)))
+        self.assertEqual(cache.stats()["misses"], 0)
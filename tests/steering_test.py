@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+
+from lib.localization.beamformer import matched_spectrum
+from lib.localization.steering import a_lin, a_z, far_field_steering, near_field_steering, steering_cache, ula_positions
+
+class TestSteering(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        steering_cache.clear()
+        self.M, self.d, self.v, self.f0 = 7, 0.1, 343, 500
+
+    def test_a_lin(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The same as the list comprehension over the microphones, for one angle and for an array of angles.
+        """
+        M, d, v, f0 = self.M, self.d, self.v, self.f0
+        theta = 30
+        expected = np.array([np.exp(-1*mic*(d/v)*np.sin(theta*np.pi/180)*2*np.pi*f0*1j) for mic in range(M)])
+        self.assertEqual(a_lin(theta, M, d, v, f0).shape, (M,))
+        self.assertTrue(np.allclose(a_lin(theta, M, d, v, f0), expected))
+
+        angles = np.arange(-90, 90)
+        A = a_lin(angles, M, d, v, f0)
+        self.assertEqual(A.shape, (M, len(angles)))
+        self.assertTrue(np.allclose(A[:,angles == theta][:,0], expected))
+
+    def test_tensor_is_cached(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        angles = np.linspace(-90, 90, 181)
+        freqs = np.array([250.0, 500.0, 1000.0])
+        A = far_field_steering(ula_positions(self.M, self.d), angles, self.v, freqs)
+        self.assertEqual(A.shape, (self.M, len(angles), len(freqs)))
+        self.assertFalse(A.flags.writeable)
+        self.assertIs(far_field_steering(ula_positions(self.M, self.d), angles, self.v, freqs), A)
+        self.assertEqual(steering_cache.stats()["hits"], 1)
+        self.assertTrue(np.allclose(A[:,:,1], a_lin(angles, self.M, self.d, self.v, 500.0)))
+
+        # Another speed of sound is another tensor
+        self.assertIsNot(far_field_steering(ula_positions(self.M, self.d), angles, 340, freqs), A)
+
+    def test_near_field(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        mics = ula_positions(self.M, self.d)
+        points = np.array([[0.2, 1.0, 0.0], [-0.5, 2.0, 0.3]])
+        A = near_field_steering(mics, points, self.v, self.f0)
+        for i, point in enumerate(points):
+            r = np.linalg.norm(point - mics, axis=1)
+            self.assertTrue(np.allclose(A[:,i,0], np.exp(-1j*2*np.pi*self.f0*r/self.v) / r))
+            self.assertTrue(np.allclose(a_z(point, mics, self.M, self.v, self.f0), A[:,i,0]))
+
+    def test_matched_spectrum(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(self.M, 50)) + 1j*rng.normal(size=(self.M, 50))
+        Rx = X @ X.conj().T / 50
+        angles = np.arange(-90, 90)
+        A = far_field_steering(ula_positions(self.M, self.d), angles, self.v, [self.f0, 2*self.f0])
+        P = matched_spectrum(np.stack((Rx, 2*Rx)), A)
+        expected = np.array([np.real(a.conj() @ Rx @ a) for a in a_lin(angles, self.M, self.d, self.v, self.f0).T])
+        self.assertEqual(P.shape, (len(angles), 2))
+        self.assertTrue(np.allclose(P[:,0], expected))
+        self.assertTrue(np.allclose(matched_spectrum(Rx, A)[:,0], expected))
@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+from scipy.signal import ShortTimeFFT
+
+from lib.processing.stft import MultichannelSTFT
+
+class TestMultichannelSTFT(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.Fs = 48000
+        self.x = np.random.default_rng(0).normal(size=(3, 5000))
+
+    def assertMatchesScipy(self, sft: ShortTimeFFT, band: tuple[float, float]|None = None):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        stft = MultichannelSTFT(sft, band)
+        expected = np.stack([sft.stft(channel) for channel in self.x])[:,stft.bins]
+        S = stft.stft(self.x)
+        self.assertEqual(S.shape, expected.shape)
+        self.assertEqual(S.dtype, np.complex64)
+        self.assertTrue(np.allclose(S, expected, rtol=0, atol=1e-5 * np.max(np.abs(expected))))
+
+    def test_matches_scipy(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        win = ("gaussian", 1e-2 * self.Fs)
+        for kwargs in [dict(nperseg=256, noverlap=0, scale_to="magnitude", phase_shift=None),
+                       dict(nperseg=256, noverlap=125, scale_to="psd"),
+                       dict(nperseg=255, noverlap=100, mfft=300, fft_mode="onesided2X", scale_to="psd")]:
+            for band in [None, (500, 4000), (1000, 1200)]:
+                with self.subTest(kwargs=kwargs, band=band):
+                    self.assertMatchesScipy(ShortTimeFFT.from_window(win, self.Fs, **kwargs), band)
+
+    def test_buffer_and_inputs(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        stft = MultichannelSTFT.from_window(("gaussian", 1e-2 * self.Fs), self.Fs, nperseg=256, noverlap=0, band=(500, 4000))
+        out = stft.allocate(*self.x.shape)
+        S = stft.stft(self.x, out=out)
+        self.assertIs(S, out)
+        # A list of channels and integer samples with a scale give the same STFT
+        S_list = stft.stft([np.round(channel * 1000).astype(np.int16) for channel in self.x], scale=1/1000)
+        self.assertTrue(np.allclose(S_list, S, atol=1e-3 * np.max(np.abs(S))))
+        self.assertTrue(np.allclose(stft.stft(self.x[1]), S[1]))
+
+        with self.assertRaises(ValueError):
+            stft.stft(self.x, out=stft.allocate(2, self.x.shape[1]))
+        with self.assertRaises(ValueError):
+            MultichannelSTFT.from_window("hann", self.Fs, nperseg=256, noverlap=0, fft_mode="centered")
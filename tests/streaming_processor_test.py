@@ -0,0 +1,95 @@
+import unittest
+import random
+import numpy as np
+from os.path import join
+from tempfile import TemporaryDirectory
+from scipy import signal
+from scipy.io.wavfile import write, read
+
+from lib.config.ConfigParser import ConfigParser
+from lib.model.Model import Model
+from lib.processing.convolution import convolve
+from lib.processing.Processor import Processor
+from lib.processing.StreamingProcessor import StreamingProcessor
+from lib.processing.streaming import StreamingFilter, PeakCandidates, select_by_peak_distance
+
+class TestStreamingProcessor(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.rng = np.random.default_rng(0)
+        
+    def test_streaming_filter(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        x = self.rng.standard_normal(10007)
+        g = self.rng.standard_normal(501)
+        for M in [1, 12]:
+            stream = StreamingFilter(g, M)
+            y = np.concatenate([stream.process(x[start:start + 120 * M]) for start in range(0, len(x), 120 * M)] + [stream.flush()])
+            expected = convolve(x, g)[::M]
+            self.assertEqual(y.shape, expected.shape)
+            self.assertTrue(np.allclose(y, expected))
+            
+    def test_peak_candidates(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        # Rounding creates flat peaks, also over the block boundaries
+        x = np.round(np.convolve(self.rng.standard_normal(20000), np.ones(20)), 0)
+        candidates = PeakCandidates(1.0)
+        for start in range(0, len(x), 97):
+            candidates.process(x[start:start + 97])
+        peaks, heights = candidates.result()
+        
+        for height, distance in [(1.0, 1), (2.0, 30), (4.0, 100)]:
+            expected, _ = signal.find_peaks(x, height=height, distance=distance)
+            mask = heights >= height
+            self.assertTrue(np.array_equal(select_by_peak_distance(peaks[mask], heights[mask], distance), expected))
+            
+    def test_matches_batch(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        config = ConfigParser()
+        random.seed(0)
+        np.random.seed(0)
+        model = Model(config, randomize_enabled=True)
+        model.set_n(20)
+        _, h = model.generate_model(use_transfer=False)
+        h = h + 0.02 * np.random.randn(len(h)) * np.max(np.abs(h))
+        
+        with TemporaryDirectory() as folder:
+            file_path = join(folder, "synth.wav")
+            write(file_path, 48000, (h / np.max(np.abs(h)) * 20000).astype(np.int16))
+            
+            batch = Processor(file_path, config, log=False)
+            batch.run(write_enabled=False)
+            
+            with StreamingProcessor(file_path, config, log=False, block_size=4096) as streaming:
+                emitted = list(streaming.stream())
+                
+                self.assertTrue(np.array_equal(streaming.peaks, batch.peaks))
+                self.assertTrue(np.array_equal(streaming.s1_peaks, batch.s1_peaks))
+                self.assertTrue(np.array_equal(streaming.s2_peaks, batch.s2_peaks))
+                self.assertTrue(np.array_equal(streaming.ind_s1, batch.ind_s1))
+                self.assertTrue(np.array_equal(streaming.ind_s2, batch.ind_s2))
+                self.assertEqual([peak for peak, _, _ in emitted], sorted(np.concatenate((batch.s1_peaks[:,0], batch.s2_peaks[:,0]))))
+                
+                streaming.generation_path = join(folder, "out")
+                streaming.cut_segments()
+                streaming.write()
+                _, s1 = read(join(folder, "out", config.Segmentation.ConcatPath, "processed", "segmented-s1-processed-synth.wav"))
+                _, s2_raw = read(join(folder, "out", config.Segmentation.SegmentedPath, "raw", "segmented-s2-raw-synth.wav"))
+                self.assertTrue(np.allclose(s1, batch.segmented_s1_concat))
+                self.assertTrue(np.array_equal(s2_raw, batch.segmented_s2_raw))
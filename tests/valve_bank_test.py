@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from lib.model.ValveBank import ValveBank
+from lib.model.ValveParams import ValveParams
+from lib.model.generate import randomized_valve_params, valve_responses, VALVE_PARAMETERS
+
+class TestValveBank(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.valves = [
+            ValveParams( 10, 30, 10, 10, 0.05, 0.1,   1,  50,  50, "M"),
+            ValveParams( 40, 30, 10, 10, 0.05, 0.1, 0.5, 150, 150, "T"),
+            ValveParams(300, 30, 10, 10, 0.05, 0.1, 0.5,  50,  50, "A"),
+        ]
+        self.bank = ValveBank.from_valves(self.valves)
+
+    def test_round_trips(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.assertEqual([valve.num_values() for valve in self.bank.to_valves()], [valve.num_values() for valve in self.valves])
+        self.assertTrue(np.array_equal(ValveBank.from_csv(self.bank.to_csv()).data, self.bank.data))
+
+        with TemporaryDirectory() as folder:
+            variants = self.bank.random_walk(100, 0.1, 0)
+            variants.save(join(folder, "variants.npy"))
+            loaded = ValveBank.load(join(folder, "variants.npy"))
+            self.assertIsInstance(loaded.data, np.memmap)
+            self.assertTrue(np.array_equal(loaded.data, variants.data))
+            del loaded
+
+    def test_random_walk_matches_randomized_valve_params(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        variants = self.bank.random_walk(50, 0.1, np.random.default_rng(3))
+        expected = randomized_valve_params(self.valves, 50, 0.1, np.random.default_rng(3))
+        self.assertEqual(variants.shape, (50, 3))
+        self.assertTrue(np.all(variants.names == ["M", "T", "A"]))
+        for name in VALVE_PARAMETERS:
+            self.assertTrue(np.array_equal(variants.params()[name], expected[name]))
+
+    def test_synthesize_variants(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        variants = self.bank.random_walk(20, 0.2, 1)
+        h = variants.synthesize_variants(4000)
+        self.assertEqual(h.shape[0], 20)
+        for i, valves in enumerate(variants.data):
+            expected = valve_responses(ValveBank(valves).to_valves(), 4000)
+            self.assertTrue(np.array_equal(h[i,:len(expected)], expected))
+            self.assertTrue(np.all(h[i,len(expected):] == 0))
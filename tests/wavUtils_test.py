@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+import soundfile as sf
+from os.path import join
+from tempfile import TemporaryDirectory
+from scipy.io.wavfile import write
+
+from lib.os.wavUtils import MappedWav, write_wav
+
+class TestWavUtils(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.folder = TemporaryDirectory()
+        self.file_path = join(self.folder.name, "multichannel.wav")
+        self.samples = np.random.default_rng(0).integers(-2**15, 2**15, size=(1000, 6), dtype=np.int16)
+        write(self.file_path, 48000, self.samples)
+        
+    def tearDown(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.folder.cleanup()
+        
+    def test_channel_views(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        wav = MappedWav(self.file_path)
+        self.assertTrue(wav.mapped)
+        self.assertEqual((wav.Fs, wav.channels, len(wav)), (48000, 6, 1000))
+        for i, view in enumerate(wav.channel_views()):
+            self.assertTrue(np.shares_memory(view, wav.data))
+            self.assertTrue(np.array_equal(view, self.samples[:,i]))
+        del view, wav
+        
+    def test_float_blocks_match_soundfile(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        wav = MappedWav(self.file_path)
+        expected, _ = sf.read(self.file_path)
+        self.assertTrue(np.array_equal(np.concatenate(list(wav.float_blocks(300))), expected))
+        self.assertTrue(np.array_equal(np.concatenate(list(wav.float_blocks(300, channel=2))), expected[:,2]))
+        del wav
+
+    def test_metadata(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        self.assertIsNone(MappedWav(self.file_path).metadata)
+
+        metadata = {"Fs": 48000, "microphone_positions": [[2.5, 5, 0], [7.5, 15, 0]], "name": "odd"}
+        file_path = join(self.folder.name, "metadata.wav")
+        samples = np.random.default_rng(1).standard_normal((999, 2))
+        write_wav(file_path, 48000, samples, metadata)
+
+        wav = MappedWav(file_path)
+        self.assertTrue(wav.mapped)
+        self.assertTrue(np.array_equal(wav.data, samples))
+        self.assertEqual(wav.metadata, metadata)
+        info = sf.info(file_path)
+        self.assertEqual((info.frames, info.channels), (999, 2))
+        del wav
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+
+from lib.localization.steering import far_field_steering, steering_cache, ula_positions
+from lib.localization.wideband import band_bins, covariances, focusing_matrices, strongest_peaks, wideband_spectrum
+
+class TestWideband(unittest.TestCase):
+    """
+    @author: Gerrald
+    @date: 18-10-2026
+    """
+    def setUp(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+
+        The STFT of two uncorrelated broadband sources at -20 and 35 degrees with noise, at a uniform linear array.
+        """
+        steering_cache.clear()
+        M, d, v = 6, 0.1, 343
+        freqs = np.arange(129) * 187.5
+        self.bins = band_bins(freqs, (500, 1700))
+        f = freqs[self.bins]
+        rng = np.random.default_rng(1)
+        As = far_field_steering(ula_positions(M, d), [-20, 35], v, f)
+        s = rng.normal(size=(2, len(f), 200)) + 1j*rng.normal(size=(2, len(f), 200))
+        noise = rng.normal(size=(M, len(f), 200)) + 1j*rng.normal(size=(M, len(f), 200))
+        self.S = np.einsum("mqf,qft->mft", As, s) + 0.3 * noise
+        self.grid = np.linspace(-90, 90, 721)
+        self.A = far_field_steering(ula_positions(M, d), self.grid, v, f)
+
+    def test_covariances(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        Rx = covariances(self.S)
+        k = 3
+        X = self.S[:,k,:]
+        self.assertTrue(np.allclose(Rx[k], X @ X.conj().T / X.shape[1]))
+
+    def test_methods_find_both_sources(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        for method in ("matched", "mvdr", "music"):
+            for combine in ("incoherent", "coherent"):
+                P = wideband_spectrum(self.S, self.A, method, combine, n_sources=2)
+                angles = np.sort(self.grid[strongest_peaks(P, 2)])
+                self.assertTrue(np.allclose(angles, [-20, 35], atol=1.5), (method, combine, angles))
+
+    def test_focusing_matrices(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        T = focusing_matrices(self.A, 2)
+        self.assertTrue(np.allclose(T @ np.conj(np.swapaxes(T, -1, -2)), np.eye(self.A.shape[0])))
+        self.assertTrue(np.allclose(T[2], np.eye(self.A.shape[0])))
+
+    def test_errors(self):
+        """
+        @author: Gerrald
+        @date: 18-10-2026
+        """
+        with self.assertRaises(ValueError):
+            wideband_spectrum(self.S, self.A, "music")
+        with self.assertRaises(ValueError):
+            wideband_spectrum(self.S, self.A, "mvdr", "sum")
+        with self.assertRaises(ValueError):
+            band_bins(np.arange(10), (100, 200))